@@ -1,7 +1,30 @@
-"""Database model for logging."""
+"""Database model for logging.
 
+Log records are queued in memory and written by a background thread in bulk
+inserts, so logging never waits on a database commit. The queue is bounded;
+records that don't fit are dropped and counted.
+"""
+
+import atexit
+import os
+import queue
+import threading
+import time
 from datetime import datetime
-from prometheus_swarm.database import get_db
+from prometheus_swarm.database import Log
+from prometheus_swarm.database.config import engine
+
+# Most records held in memory before new ones are dropped
+LOG_BUFFER_SIZE = int(os.getenv("LOG_BUFFER_SIZE", "10000"))
+# A batch is written once it has this many records or is this old
+LOG_FLUSH_BATCH_SIZE = int(os.getenv("LOG_FLUSH_BATCH_SIZE", "200"))
+LOG_FLUSH_INTERVAL_MS = int(os.getenv("LOG_FLUSH_INTERVAL_MS", "500"))
+
+_queue = queue.Queue(maxsize=LOG_BUFFER_SIZE)
+_stop = threading.Event()
+_lock = threading.Lock()
+_writer = None
+_stats = {"queued": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0}
 
 
 def init_logs_table():
@@ -10,6 +33,55 @@ def init_logs_table():
     pass
 
 
+def _write(batch):
+    try:
+        with engine.begin() as conn:
+            conn.execute(Log.__table__.insert(), batch)
+        with _lock:
+            _stats["written"] += len(batch)
+            _stats["batches"] += 1
+    except Exception as e:
+        with _lock:
+            _stats["failed"] += len(batch)
+        error = str(e).splitlines()[0]
+        print(
+            f"Failed to save {len(batch)} logs to database: {error}"
+        )  # Fallback logging
+    finally:
+        for _ in batch:
+            _queue.task_done()
+
+
+def _run():
+    interval = LOG_FLUSH_INTERVAL_MS / 1000
+    while True:
+        try:
+            batch = [_queue.get(timeout=interval)]
+        except queue.Empty:
+            if _stop.is_set():
+                return
+            continue
+
+        deadline = time.monotonic() + interval
+        while len(batch) < LOG_FLUSH_BATCH_SIZE:
+            # Once stopping, write what is queued without waiting for more
+            timeout = 0 if _stop.is_set() else deadline - time.monotonic()
+            try:
+                batch.append(_queue.get(timeout=max(timeout, 0)))
+            except queue.Empty:
+                break
+        _write(batch)
+
+
+def _start_writer():
+    global _writer
+    with _lock:
+        if _writer is None or not _writer.is_alive():
+            _stop.clear()
+            _writer = threading.Thread(target=_run, name="log-writer", daemon=True)
+            _writer.start()
+
+
 def save_log(
     level: str,
     message: str,
@@ -23,7 +95,7 @@ def save_log(
     additional_data: str = None,
 ) -> bool:
     """
-    Save a log entry to the database.
+    Queue a log entry to be saved to the database.
 
     Args:
         level: Log level (ERROR, WARNING, INFO, etc)
@@ -38,28 +110,63 @@ def save_log(
         additional_data: Any additional JSON-serializable data
 
     Returns:
-        bool: True if log was saved successfully
+        bool: True if the log was queued, False if the buffer was full
     """
+    if _writer is None or not _writer.is_alive():
+        _start_writer()
     try:
-        db = get_db()
-        from prometheus_swarm.database import Log
-
-        log = Log(
-            timestamp=datetime.utcnow(),
-            level=level,
-            message=message,
-            module=module,
-            function=function,
-            path=path,
-            line_no=line_no,
-            exception=exception,
-            stack_trace=stack_trace,
-            request_id=request_id,
-            additional_data=additional_data,
+        _queue.put_nowait(
+            {
+                "timestamp": datetime.utcnow(),
+                "level": level,
+                "message": message,
+                "module": module,
+                "function": function,
+                "path": path,
+                "line_no": line_no,
+                "exception": exception,
+                "stack_trace": stack_trace,
+                "request_id": request_id,
+                "additional_data": additional_data,
+            }
         )
-        db.add(log)
-        db.commit()
-        return True
-    except Exception as e:
-        print(f"Failed to save log to database: {e}")  # Fallback logging
+    except queue.Full:
+        with _lock:
+            _stats["dropped"] += 1
         return False
+    with _lock:
+        _stats["queued"] += 1
+    return True
+
+
+def flush_logs(timeout: float = 5.0) -> bool:
+    """Wait until every queued log has been written.
+
+    Returns:
+        bool: True if the queue was drained before the timeout
+    """
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks:
+        if time.monotonic() >= deadline or _writer is None or not _writer.is_alive():
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def shutdown_log_writer(timeout: float = 5.0):
+    """Write the queued logs and stop the writer thread."""
+    _stop.set()
+    if _writer is not None:
+        _writer.join(timeout)
+
+
+# Don't lose queued logs when the process exits
+atexit.register(shutdown_log_writer)
+
+
+def get_log_writer_stats() -> dict:
+    """Get counts of queued, written, dropped and failed log records."""
+    with _lock:
+        stats = dict(_stats)
+    stats["pending"] = _queue.qsize()
+    return stats
@@ -0,0 +1,106 @@
+"""Local checks for task dependency graphs produced by the LLM."""
+
+from typing import Dict, List
+
+from prometheus_swarm.utils.logging import log_key_value
+
+
+def normalize_dependencies(
+    dependency_map: Dict[str, List[str]], task_uuids: List[str]
+) -> Dict[str, List[str]]:
+    """Keep only known task UUIDs, drop self-dependencies and duplicates.
+
+    Args:
+        dependency_map: Task UUID -> dependency UUIDs, as returned by the LLM
+        task_uuids: UUIDs of the tasks in the issue, in order
+
+    Returns:
+        Dict with an entry for every task in task_uuids
+    """
+    known = set(task_uuids)
+    graph = {}
+    for uuid in task_uuids:
+        dependencies = []
+        for dependency in dependency_map.get(uuid) or []:
+            if dependency in known and dependency != uuid and dependency not in dependencies:
+                dependencies.append(dependency)
+        graph[uuid] = dependencies
+    return graph
+
+
+def break_cycles(graph: Dict[str, List[str]]) -> List[tuple]:
+    """Remove dependencies that close a cycle, in place.
+
+    Tasks are visited in order, and a dependency pointing back at a task that is
+    still being visited is dropped, so the first-listed tasks keep theirs.
+
+    Returns:
+        List of (task_uuid, dependency_uuid) edges that were removed
+    """
+    removed = []
+    state = {}  # uuid -> "visiting" | "done"
+
+    def visit(uuid):
+        state[uuid] = "visiting"
+        for dependency in list(graph[uuid]):
+            if state.get(dependency) == "visiting":
+                graph[uuid].remove(dependency)
+                removed.append((uuid, dependency))
+            elif dependency not in state:
+                visit(dependency)
+        state[uuid] = "done"
+
+    for uuid in graph:
+        if uuid not in state:
+            visit(uuid)
+    return removed
+
+
+def transitive_reduction(graph: Dict[str, List[str]]) -> List[tuple]:
+    """Remove dependencies already implied through another dependency, in place.
+
+    The graph must be acyclic.
+
+    Returns:
+        List of (task_uuid, dependency_uuid) edges that were removed
+    """
+    reachable = {}
+
+    def reach(uuid):
+        if uuid not in reachable:
+            result = set()
+            for dependency in graph[uuid]:
+                result.add(dependency)
+                result |= reach(dependency)
+            reachable[uuid] = result
+        return reachable[uuid]
+
+    removed = []
+    for uuid, dependencies in graph.items():
+        implied = set()
+        for dependency in dependencies:
+            implied |= reach(dependency)
+        for dependency in [d for d in dependencies if d in implied]:
+            dependencies.remove(dependency)
+            removed.append((uuid, dependency))
+    return removed
+
+
+def build_dependency_graph(
+    dependency_map: Dict[str, List[str]], task_uuids: List[str]
+) -> Dict[str, List[str]]:
+    """Turn raw LLM dependencies into a minimal acyclic graph.
+
+    Args:
+        dependency_map: Task UUID -> dependency UUIDs, as returned by the LLM
+        task_uuids: UUIDs of the tasks in the issue, in order
+
+    Returns:
+        Dict mapping every task UUID to the UUIDs it directly depends on
+    """
+    graph = normalize_dependencies(dependency_map, task_uuids)
+    cycles = break_cycles(graph)
+    redundant = transitive_reduction(graph)
+    log_key_value("Dependency cycles broken", len(cycles))
+    log_key_value("Redundant dependencies removed", len(redundant))
+    return graph
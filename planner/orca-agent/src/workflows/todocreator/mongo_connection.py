@@ -2,16 +2,49 @@ from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
 from dotenv import load_dotenv
 import os
+import threading
 
 load_dotenv()
 
+MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+
 
 class MongoConnection:
-    def __init__(self, mongo_uri: str = os.getenv("MONGO_URI")):
-        self.client = MongoClient(mongo_uri)
-    
+    """MongoDB connection that is only opened when first used."""
+
+    def __init__(self, mongo_uri: str = None):
+        self.mongo_uri = mongo_uri or os.getenv("MONGO_URI")
+        self._client = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> MongoClient:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client = MongoClient(
+                        self.mongo_uri,
+                        maxPoolSize=MAX_POOL_SIZE,
+                        minPoolSize=MIN_POOL_SIZE,
+                        serverSelectionTimeoutMS=SERVER_SELECTION_TIMEOUT_MS,
+                    )
+        return self._client
+
     def get_database(self, db_name: str):
         return self.client[db_name]
-    
+
     def close(self):
-        self.client.close()
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+                self._client = None
+
+
+_connection = MongoConnection()
+
+
+def get_connection() -> MongoConnection:
+    """Get the process-wide MongoDB connection."""
+    return _connection
@@ -66,4 +66,19 @@ class TaskDependencyPhase(WorkflowPhase):
             ],
             conversation_id=conversation_id,
             name="Task Dependency",
-        )
\ No newline at end of file
+        )
+
+class TaskDependencyGraphPhase(WorkflowPhase):
+    """Infer the dependencies of many tasks in a single conversation."""
+
+    def __init__(self, workflow: Workflow, conversation_id: str = None):
+        super().__init__(
+            workflow=workflow,
+            prompt_name="dependency_graph",
+            available_tools=[
+                "read_file",
+                "create_task_dependencies",
+            ],
+            conversation_id=conversation_id,
+            name="Task Dependency Graph",
+        )
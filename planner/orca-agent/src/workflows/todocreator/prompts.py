@@ -100,5 +100,14 @@ PROMPTS = {
         "Dependency Tasks: [List of UUIDs of dependency tasks choose from subtasks]\n"
         "---\n"
     ),
+    "dependency_graph": (
+        "Determine the dependencies between the following subtasks.\n"
+        "A task depends on another task if it cannot be implemented or tested until the other task is done.\n"
+        "Only list direct dependencies, and never make two tasks depend on each other.\n\n"
+        "Subtasks:\n{subtasks}\n\n"
+        "Target tasks (UUIDs):\n{target_task_uuids}\n\n"
+        "Call create_task_dependencies once, with one entry for every target task. "
+        "Use an empty list for tasks without dependencies, and only choose dependency UUIDs from the subtasks.\n"
+    ),
 
 }
@@ -0,0 +1,238 @@
+"""Token-budgeted view of a repository's files for prompts.
+
+Interpolating every path of a large repository costs tens of thousands of
+prompt tokens on every LLM turn. The repository context renders the files as an
+indented tree instead. Directories start collapsed to a file count and an
+extension summary, and are expanded in order of relevance to the task (paths
+named in the task text, and priority paths such as conflicted files) for as
+long as the rendered tree fits the token budget.
+
+The worker has the same module in src/utils/repo_context.py; the planner and
+the worker are deployed separately and share no code, so keep the two in sync.
+"""
+
+import heapq
+import os
+import re
+from collections import Counter
+from typing import Iterable, Iterator, List, Optional
+
+import tiktoken
+
+# Tokens the rendered tree may use
+REPO_CONTEXT_TOKEN_BUDGET = int(os.getenv("REPO_CONTEXT_TOKEN_BUDGET", "2000"))
+# Files listed in an expanded directory before the rest are summarized
+REPO_CONTEXT_MAX_DIR_FILES = int(os.getenv("REPO_CONTEXT_MAX_DIR_FILES", "30"))
+
+_INDENT = "  "
+# Splits paths and prose into words, including camelCase and snake_case parts
+_WORD = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+_STOPWORDS = set(
+    "add all and are file files for from into lib must new not should src test "
+    "tests that the this use when will with".split()
+)
+# Score of a priority path, above any number of matching words
+_PRIORITY_SCORE = 1000
+
+_encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Count prompt tokens, estimating from length if the encoding can't be loaded."""
+    global _encoding
+    if _encoding is None:
+        try:
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            # e.g. the encoding can't be downloaded, don't retry on every call
+            _encoding = False
+    if _encoding is False:
+        return max(1, -(-len(text) // 4))
+    return len(_encoding.encode(text))
+
+
+def _words(text: str) -> set:
+    return {
+        word
+        for word in (w.lower() for w in _WORD.findall(text))
+        if len(word) >= 3 and word not in _STOPWORDS
+    }
+
+
+def _stem(word: str) -> str:
+    return word[:-1] if word.endswith("s") and len(word) > 3 else word
+
+
+def _relevance(name: str, terms: set) -> int:
+    return len({_stem(word) for word in _words(name)} & terms)
+
+
+def _extension(name: str) -> str:
+    return os.path.splitext(name)[1] or "no extension"
+
+
+def _new_node(name: str, path: str) -> dict:
+    return {
+        "name": name,
+        "path": path,
+        "dirs": {},
+        "files": {},  # name -> relevance score
+        "total": 0,
+        "extensions": Counter(),
+        "score": 0,
+    }
+
+
+def _build_tree(files: Iterable[str]) -> dict:
+    root = _new_node("", "")
+    for path in files:
+        parts = path.strip("/").split("/")
+        extension = _extension(parts[-1])
+        node = root
+        for part in parts[:-1]:
+            node["total"] += 1
+            node["extensions"][extension] += 1
+            child_path = f"{node['path']}/{part}" if node["path"] else part
+            node = node["dirs"].setdefault(part, _new_node(part, child_path))
+        node["total"] += 1
+        node["extensions"][extension] += 1
+        node["files"][parts[-1]] = 0
+    return root
+
+
+def _score_tree(node: dict, terms: set, priority: set) -> int:
+    """Score every file and directory, returning the node's score."""
+    best = 0
+    for name in node["files"]:
+        path = f"{node['path']}/{name}" if node["path"] else name
+        score = _relevance(name, terms)
+        if path in priority:
+            score += _PRIORITY_SCORE
+        node["files"][name] = score
+        best = max(best, score)
+    for child in node["dirs"].values():
+        best = max(best, _score_tree(child, terms, priority))
+    node["score"] = best + _relevance(node["name"], terms)
+    if node["path"] in priority:
+        node["score"] += _PRIORITY_SCORE
+    return node["score"]
+
+
+def _summary(total: int, extensions: Counter) -> str:
+    common = extensions.most_common(3)
+    summary = ", ".join(f"{count} {extension}" for extension, count in common)
+    if len(extensions) > len(common):
+        summary += ", ..."
+    return f"{total} file{'s' if total != 1 else ''}: {summary}"
+
+
+def _collapsed_line(node: dict, depth: int) -> str:
+    summary = _summary(node["total"], node["extensions"])
+    return f"{_INDENT * depth}{node['name']}/ ({summary})"
+
+
+def _file_lines(node: dict, depth: int, max_files: Optional[int]) -> List[str]:
+    files = node["files"]
+    indent = _INDENT * depth
+    if max_files is None or len(files) <= max_files:
+        return [indent + name for name in sorted(files)]
+    # Keep the most relevant files and summarize the rest
+    shown = sorted(files, key=lambda name: (-files[name], name))[:max_files]
+    hidden = set(files) - set(shown)
+    rest = Counter(_extension(name) for name in hidden)
+    more = _summary(len(hidden), rest)
+    return [indent + name for name in sorted(shown)] + [f"{indent}... ({more})"]
+
+
+def _children_lines(
+    node: dict, depth: int, expanded: Optional[set], max_files: Optional[int]
+) -> Iterator[str]:
+    """Lines of a node's contents. expanded=None expands every directory."""
+    for name in sorted(node["dirs"]):
+        child = node["dirs"][name]
+        if expanded is None or child["path"] in expanded:
+            yield f"{_INDENT * depth}{name}/"
+            yield from _children_lines(child, depth + 1, expanded, max_files)
+        else:
+            yield _collapsed_line(child, depth)
+    yield from _file_lines(node, depth, max_files)
+
+
+def _expansion_cost(node: dict, depth: int) -> int:
+    """Tokens added by expanding a collapsed directory, without its subdirectories."""
+    lines = [f"{_INDENT * depth}{node['name']}/"]
+    lines += [_collapsed_line(child, depth + 1) for child in node["dirs"].values()]
+    lines += _file_lines(node, depth + 1, REPO_CONTEXT_MAX_DIR_FILES)
+    added = sum(count_tokens(line + "\n") for line in lines)
+    return added - count_tokens(_collapsed_line(node, depth) + "\n")
+
+
+def _render_full(root: dict, header: str, token_budget: int) -> Optional[str]:
+    """Render every file, or return None if that doesn't fit the budget."""
+    lines = [header]
+    used = count_tokens(header + "\n")
+    for line in _children_lines(root, 0, None, None):
+        used += count_tokens(line + "\n")
+        if used > token_budget:
+            return None
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def render_repo_context(
+    files: List[str],
+    relevant_text: str = "",
+    priority_paths: Iterable[str] = (),
+    token_budget: int = REPO_CONTEXT_TOKEN_BUDGET,
+) -> str:
+    """Render a repository's files as a compact tree that fits a token budget.
+
+    Args:
+        files: File paths relative to the repository root
+        relevant_text: Task text whose words rank matching paths first
+        priority_paths: Files or directories to expand before any other
+        token_budget: Tokens the rendered tree may use
+
+    Returns:
+        str: The rendered tree
+    """
+    if not files:
+        return "The repository has no files."
+
+    root = _build_tree(files)
+    terms = {_stem(word) for word in _words(relevant_text)}
+    priority = {path.strip("/") for path in priority_paths if path}
+    _score_tree(root, terms, priority)
+
+    full = _render_full(root, f"{root['total']} files:", token_budget)
+    if full is not None:
+        return full
+
+    header = (
+        f"{root['total']} files. Collapsed directories show their file counts "
+        "by extension; use list_files to see their contents."
+    )
+    used = count_tokens(header + "\n") + sum(
+        count_tokens(line + "\n")
+        for line in _children_lines(root, 0, set(), REPO_CONTEXT_MAX_DIR_FILES)
+    )
+
+    # Expand the most relevant directories first, shallower ones on ties
+    expanded = set()
+    queue = [
+        (-child["score"], 0, child["path"], child) for child in root["dirs"].values()
+    ]
+    heapq.heapify(queue)
+    while queue:
+        _, depth, path, node = heapq.heappop(queue)
+        cost = _expansion_cost(node, depth)
+        if used + cost > token_budget:
+            continue
+        used += cost
+        expanded.add(path)
+        for child in node["dirs"].values():
+            heapq.heappush(queue, (-child["score"], depth + 1, child["path"], child))
+
+    lines = [header]
+    lines += _children_lines(root, 0, expanded, REPO_CONTEXT_MAX_DIR_FILES)
+    return "\n".join(lines)
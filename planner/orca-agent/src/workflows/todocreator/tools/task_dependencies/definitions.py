@@ -0,0 +1,38 @@
+from src.workflows.todocreator.tools.task_dependencies.implementations import (
+    create_task_dependencies,
+)
+
+DEFINITIONS = {
+    "create_task_dependencies": {
+        "name": "create_task_dependencies",
+        "description": "Record the dependencies of every target task in one call.",
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "dependencies": {
+                    "type": "array",
+                    "description": "One entry per target task, including tasks without dependencies",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "task_uuid": {
+                                "type": "string",
+                                "description": "UUID of the task",
+                            },
+                            "dependency_tasks": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "UUIDs of the tasks it depends on",
+                            },
+                        },
+                        "required": ["task_uuid", "dependency_tasks"],
+                    },
+                },
+            },
+            "required": ["dependencies"],
+            "additionalProperties": False,
+        },
+        "final_tool": True,
+        "function": create_task_dependencies,
+    },
+}
@@ -0,0 +1,34 @@
+"""Task dependency tool implementations."""
+
+from typing import Dict, List
+
+
+def create_task_dependencies(dependencies: List[Dict[str, object]], **kwargs) -> dict:
+    """Record the dependencies of several tasks at once.
+
+    Args:
+        dependencies: List of {"task_uuid": str, "dependency_tasks": List[str]}
+
+    Returns:
+        dict: Result of the operation containing:
+            - success: Whether the operation succeeded
+            - message: Success/error message
+            - data: Dictionary mapping each task UUID to its dependency UUIDs
+    """
+    try:
+        dependency_map = {}
+        for entry in dependencies:
+            dependency_map[entry["task_uuid"]] = list(
+                entry.get("dependency_tasks") or []
+            )
+        return {
+            "success": True,
+            "message": f"Successfully recorded dependencies for {len(dependency_map)} tasks",
+            "data": dependency_map,
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Failed to record task dependencies: {str(e)}",
+            "data": None,
+        }
@@ -1,14 +1,50 @@
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Iterator, List, Optional
+import os
+import threading
 import uuid
-from pymongo.errors import ConnectionFailure, PyMongoError
-from .mongo_connection import MongoConnection
+from pymongo import ASCENDING, ReplaceOne
+from pymongo.errors import BulkWriteError, ConnectionFailure, PyMongoError
+from .mongo_connection import get_connection
 from enum import Enum
 
-mongo_conn = MongoConnection()
-db = mongo_conn.get_database("builder247")
-todos_collection = db["todos"]
-issues_collection = db["issues"]
+DATABASE_NAME = "builder247"
+CURSOR_BATCH_SIZE = int(os.getenv("MONGO_CURSOR_BATCH_SIZE", "500"))
+
+_indexes_lock = threading.Lock()
+_indexes_created = False
+
+
+def _ensure_indexes(db):
+    """Create the todo and issue indexes once per process."""
+    global _indexes_created
+    if _indexes_created:
+        return
+    with _indexes_lock:
+        if _indexes_created:
+            return
+        for collection in (db["todos"], db["issues"]):
+            collection.create_index([("uuid", ASCENDING)])
+            collection.create_index(
+                [("repoOwner", ASCENDING), ("repoName", ASCENDING), ("status", ASCENDING)]
+            )
+        db["todos"].create_index([("issueUuid", ASCENDING)])
+        _indexes_created = True
+
+
+def get_database():
+    """Get the planner database, connecting and creating indexes on first use."""
+    db = get_connection().get_database(DATABASE_NAME)
+    _ensure_indexes(db)
+    return db
+
+
+def get_todos_collection():
+    return get_database()["todos"]
+
+
+def get_issues_collection():
+    return get_database()["issues"]
 
 
 class TodoStatus(str, Enum):
@@ -105,10 +141,46 @@ class IssueModel(BaseModel):
         return self.model_dump()
 
 
+def _insert_many(collection, documents: List[dict]) -> int:
+    """Insert documents unordered, so one bad document doesn't stop the rest.
+
+    Returns:
+        int: Number of documents inserted
+    """
+    if not documents:
+        return 0
+    try:
+        result = collection.insert_many(documents, ordered=False)
+        return len(result.inserted_ids)
+    except BulkWriteError as e:
+        print(f"MongoDB bulk insert errors: {len(e.details.get('writeErrors', []))}")
+        return e.details.get("nInserted", 0)
+
+
+def _upsert_many(collection, documents: List[dict]) -> int:
+    """Insert or replace documents by uuid in one unordered bulk write.
+
+    Returns:
+        int: Number of documents inserted or modified
+    """
+    if not documents:
+        return 0
+    requests = [
+        ReplaceOne({"uuid": document["uuid"]}, document, upsert=True)
+        for document in documents
+    ]
+    try:
+        result = collection.bulk_write(requests, ordered=False)
+        return result.upserted_count + result.modified_count
+    except BulkWriteError as e:
+        print(f"MongoDB bulk write errors: {len(e.details.get('writeErrors', []))}")
+        return e.details.get("nUpserted", 0) + e.details.get("nModified", 0)
+
+
 def insert_task_to_mongodb(task: TaskModel) -> bool:
     try:
         # Insert the task
-        result = todos_collection.insert_one(task.to_dict())
+        result = get_todos_collection().insert_one(task.to_dict())
 
         # Check if the insertion was successful
         return result.acknowledged
@@ -124,12 +196,74 @@ def insert_task_to_mongodb(task: TaskModel) -> bool:
         return False
 
 
-def get_all_tasks_title_uuid_from_mongodb() -> List[dict]:
+def insert_tasks_to_mongodb(tasks: List[TaskModel], upsert: bool = False) -> int:
+    """Insert many tasks in one round trip.
+
+    Args:
+        tasks: Tasks to insert
+        upsert: Replace existing tasks with the same uuid instead of adding
+            duplicates
+
+    Returns:
+        int: Number of tasks written, 0 on connection errors
+    """
     try:
-        # Get all tasks from MongoDB
-        tasks = todos_collection.find({}, {"_id": 0, "title": 1, "uuid": 1})
+        documents = [task.to_dict() for task in tasks]
+        if upsert:
+            return _upsert_many(get_todos_collection(), documents)
+        return _insert_many(get_todos_collection(), documents)
+    except ConnectionFailure:
+        print("MongoDB connection failed")
+        return 0
+    except PyMongoError as e:
+        print(f"MongoDB error: {e}")
+        return 0
+
+
+def iter_tasks_from_mongodb(
+    repo_owner: str = None,
+    repo_name: str = None,
+    status: str = None,
+    issue_uuid: str = None,
+    projection: dict = None,
+    batch_size: int = CURSOR_BATCH_SIZE,
+) -> Iterator[dict]:
+    """Stream tasks from MongoDB without loading them all into memory.
+
+    Args:
+        repo_owner: Only tasks for this repository owner
+        repo_name: Only tasks for this repository name
+        status: Only tasks with this status
+        issue_uuid: Only tasks of this issue
+        projection: Fields to return. Defaults to the whole document without _id.
+        batch_size: Documents fetched per round trip
+
+    Yields:
+        dict: One task document at a time
+    """
+    query = {}
+    if repo_owner is not None:
+        query["repoOwner"] = repo_owner
+    if repo_name is not None:
+        query["repoName"] = repo_name
+    if status is not None:
+        query["status"] = status
+    if issue_uuid is not None:
+        query["issueUuid"] = issue_uuid
 
-        # Convert cursor to list of dictionaries with only 'uuid' and 'title'
+    cursor = get_todos_collection().find(
+        query, projection or {"_id": 0}, batch_size=batch_size
+    )
+    try:
+        yield from cursor
+    finally:
+        cursor.close()
+
+
+def get_all_tasks_title_uuid_from_mongodb() -> List[dict]:
+    try:
+        # Stream only 'uuid' and 'title' of every task
+        tasks = iter_tasks_from_mongodb(projection={"_id": 0, "title": 1, "uuid": 1})
         return [{"uuid": task["uuid"], "title": task["title"]} for task in tasks]
     except Exception as e:
         print(f"An error occurred: {e}")
@@ -139,7 +273,7 @@ def get_all_tasks_title_uuid_from_mongodb() -> List[dict]:
 def insert_issue_to_mongodb(issue: IssueModel) -> bool:
     try:
         # Insert the issue
-        result = issues_collection.insert_one(issue.to_dict())
+        result = get_issues_collection().insert_one(issue.to_dict())
 
         # Check if the insertion was successful
         return result.acknowledged
@@ -151,6 +285,30 @@ def insert_issue_to_mongodb(issue: IssueModel) -> bool:
         return False
 
 
+def insert_issues_to_mongodb(issues: List[IssueModel], upsert: bool = False) -> int:
+    """Insert many issues in one round trip.
+
+    Args:
+        issues: Issues to insert
+        upsert: Replace existing issues with the same uuid instead of adding
+            duplicates
+
+    Returns:
+        int: Number of issues written, 0 on connection errors
+    """
+    try:
+        documents = [issue.to_dict() for issue in issues]
+        if upsert:
+            return _upsert_many(get_issues_collection(), documents)
+        return _insert_many(get_issues_collection(), documents)
+    except ConnectionFailure:
+        print("MongoDB connection failed")
+        return 0
+    except PyMongoError as e:
+        print(f"MongoDB error: {e}")
+        return 0
+
+
 if __name__ == "__main__":
     task = TaskModel(
         title="Test Task",
@@ -1,11 +1,16 @@
 """Task decomposition workflow implementation."""
 
+import copy
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from github import Github
 from prometheus_swarm.workflows.base import Workflow
 from prometheus_swarm.tools.planner_operations.implementations import generate_tasks
 from prometheus_swarm.utils.logging import log_section, log_key_value, log_error
 from src.workflows.todocreator import phases
+from src.workflows.todocreator.dependencies import build_dependency_graph
+from src.workflows.todocreator.repo_context import count_tokens, render_repo_context
 from prometheus_swarm.workflows.utils import (
     check_required_env_vars,
     cleanup_repository,
@@ -16,6 +21,35 @@ from prometheus_swarm.workflows.utils import (
 from prometheus_swarm.workflows.utils import cleanup_repository
 from src.workflows.todocreator.utils import TaskModel, insert_task_to_mongodb, IssueModel, insert_issue_to_mongodb
 
+# Issues decomposed at the same time, each in its own LLM conversations
+MAX_ISSUE_WORKERS = int(os.getenv("PLANNER_ISSUE_WORKERS", "4"))
+# LLM requests in flight at once, across every planner workflow in the process
+MAX_CONCURRENT_LLM_CALLS = int(os.getenv("PLANNER_MAX_CONCURRENT_LLM_CALLS", "4"))
+# Tasks whose dependencies are inferred in one LLM call
+DEPENDENCY_CHUNK_SIZE = int(os.getenv("PLANNER_DEPENDENCY_CHUNK_SIZE", "25"))
+
+_llm_slots = threading.BoundedSemaphore(MAX_CONCURRENT_LLM_CALLS)
+
+
+def _limit_llm_calls(client):
+    """Make every send_message call of a client wait for one of the global LLM slots.
+
+    The phases send their prompts and tool results through client.send_message,
+    so this bounds the requests in flight however many issue workers run.
+    """
+    if getattr(client, "llm_calls_limited", False):
+        return client
+    send_message = client.send_message
+
+    def limited_send_message(*args, **kwargs):
+        with _llm_slots:
+            return send_message(*args, **kwargs)
+
+    client.send_message = limited_send_message
+    client.llm_calls_limited = True
+    return client
+
+
 class Task:
     def __init__(self, title: str, description: str, acceptance_criteria: list[str]):
         self.title = title
@@ -62,11 +96,22 @@ class TodoCreatorWorkflow(Workflow):
             repo_name=repo_name,
             
         )
+        self.client = _limit_llm_calls(self.client)
         # self.feature_spec = feature_spec
         self.issue_spec = issue_spec
+        self.original_dir = None
+        self.repo_files = []
 
     def setup(self):
-        """Set up repository and workspace."""
+        """Set up repository and workspace.
+
+        The workspace is created once per run and shared by the issue and task
+        phases; calling setup again while it exists is a no-op.
+        """
+        if self.context.get("repo_path") and os.path.exists(self.context["repo_path"]):
+            log_key_value("Reusing workspace", self.context["repo_path"])
+            return
+
         check_required_env_vars(["GITHUB_TOKEN", "GITHUB_USERNAME"])
         validate_github_auth(os.getenv("GITHUB_TOKEN"), os.getenv("GITHUB_USERNAME"))
 
@@ -99,7 +144,8 @@ class TodoCreatorWorkflow(Workflow):
   
 
         # Get current files for context
-        self.context["current_files"] = get_current_files()
+        self.repo_files = get_current_files()
+        self.context["current_files"] = render_repo_context(self.repo_files, self.issue_spec or "")
 
         # Add feature spec to context
         # self.context["feature_spec"] = self.feature_spec
@@ -107,17 +153,25 @@ class TodoCreatorWorkflow(Workflow):
 
     def cleanup(self):
         """Cleanup workspace."""
+        if self.original_dir is None:
+            return
         # Make sure we're not in the repo directory before cleaning up
         cleanup_repository(self.original_dir, self.context.get("repo_path", ""))
+        self.original_dir = None
+        self.context.pop("repo_path", None)
+
     def run(self):
-        generate_issues_result = self.generate_issues()
-        tasks = []
-        for issue in generate_issues_result["data"]["issues"]:
-            self.context["feature_spec"] = issue
-            task_result = self.generate_tasks(issue["uuid"])
-            if task_result:
-                tasks.append(task_result["data"]["tasks"])
-        
+        # Clone once and share the checkout across all issues and tasks
+        try:
+            self.setup()
+            generate_issues_result = self.generate_issues()
+            tasks = []
+            for task_result in self.decompose_issues(generate_issues_result["data"]["issues"]):
+                if task_result and task_result.get("success"):
+                    tasks.append(task_result["data"]["tasks"])
+        finally:
+            self.cleanup()
+
         return {
             "success": True,
             "message": "Issue generation workflow completed",
@@ -126,6 +180,101 @@ class TodoCreatorWorkflow(Workflow):
                 "tasks": [[task.to_dict() for task in task_list] for task_list in tasks]
             }
         }
+    def decompose_issues(self, issues):
+        """Decompose issues into tasks concurrently.
+
+        Issues are independent until their tasks are linked, so each one runs
+        in a copy of the workflow with its own context and conversations, all
+        sharing the same checkout. Results are returned in issue order.
+
+        The copies share one client. That is safe: sending a message doesn't
+        change the client, conversations are stored per conversation ID with a
+        database session per call, and the SDK client underneath is thread-safe.
+        The client's requests are limited by MAX_CONCURRENT_LLM_CALLS.
+        """
+        workers = max(1, min(MAX_ISSUE_WORKERS, len(issues)))
+        log_key_value("Issue workers", workers)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self._decompose_issue, issues))
+
+    def _decompose_issue(self, issue):
+        issue_workflow = copy.copy(self)
+        issue_workflow.context = dict(self.context)
+        issue_workflow.context["feature_spec"] = issue
+        # Rank the paths related to this issue first
+        issue_workflow.context["current_files"] = render_repo_context(
+            self.repo_files, f"{issue.get('title', '')}\n{issue.get('description', '')}"
+        )
+        return issue_workflow.generate_tasks(issue["uuid"])
+
+    def link_dependencies(self, tasks_data):
+        """Set each task's dependency_tasks from one batched LLM call per chunk.
+
+        The whole dependency graph is requested at once instead of one
+        conversation per task, then cycles and redundant edges are removed
+        locally. Falls back to the per-task phase if the batched call fails.
+        """
+        task_uuids = [task["uuid"] for task in tasks_data]
+        dependency_map = {}
+        batched_calls = 0
+        batched_tokens = 0
+        for start in range(0, len(tasks_data), DEPENDENCY_CHUNK_SIZE):
+            chunk = task_uuids[start : start + DEPENDENCY_CHUNK_SIZE]
+            self.context["target_task_uuids"] = "\n".join(chunk)
+            dependency_phase = phases.TaskDependencyGraphPhase(workflow=self)
+            batched_calls += 1
+            batched_tokens += count_tokens(dependency_phase.prompt)
+            dependency_result = dependency_phase.execute()
+            if dependency_result is None or not dependency_result.get("success"):
+                log_error(
+                    Exception(dependency_result.get("error", "No result") if dependency_result else "No results returned from phase"),
+                    "Batched task dependency failed, falling back to one call per task",
+                )
+                self.link_dependencies_per_task(tasks_data)
+                return
+            dependency_map.update(dependency_result["data"] or {})
+
+        graph = build_dependency_graph(dependency_map, task_uuids)
+        for task in tasks_data:
+            task["dependency_tasks"] = graph[task["uuid"]]
+
+        # What the per-task loop would have sent, one conversation per task
+        per_task_tokens = 0
+        for task in tasks_data:
+            self.context["target_task"] = task
+            per_task_tokens += count_tokens(self.prompts["dependency_tasks"].format(**self.context))
+        log_key_value("Dependency LLM calls", f"{batched_calls} (per task: {len(tasks_data)})")
+        log_key_value("Dependency LLM calls saved", len(tasks_data) - batched_calls)
+        log_key_value("Dependency prompt tokens saved", per_task_tokens - batched_tokens)
+
+    def link_dependencies_per_task(self, tasks_data):
+        """Set each task's dependency_tasks with one LLM conversation per task."""
+        for task in tasks_data:
+            self.context["target_task"] = task
+            dependency_phase = phases.TaskDependencyPhase(workflow=self)
+            dependency_result = dependency_phase.execute()
+            if dependency_result is None or not dependency_result.get("success"):
+                log_error(
+                    Exception(dependency_result.get("error", "No result") if dependency_result else "No results returned from phase"),
+                    "Task dependency failed, continuing with empty dependencies",
+                )
+                task["dependency_tasks"] = []
+                continue
+            # save the dependency tasks in the context, prepare for the MongoDB insertion phase
+            try:
+                task["dependency_tasks"] = dependency_result["data"][task["uuid"]]
+            except Exception as e:
+                log_error(e, "Task dependency failed for task: " + task["title"])
+                task["dependency_tasks"] = []
+
+        # The per-task answers are not checked against each other, so clean them up too
+        graph = build_dependency_graph(
+            {task["uuid"]: task["dependency_tasks"] for task in tasks_data},
+            [task["uuid"] for task in tasks_data],
+        )
+        for task in tasks_data:
+            task["dependency_tasks"] = graph[task["uuid"]]
+
     def generate_issues(self):
         """Execute the issue generation workflow."""
 
@@ -253,24 +402,7 @@ class TodoCreatorWorkflow(Workflow):
             # save the regenerated tasks in the context, prepare for the dependency phase
             self.context["subtasks"] = tasks_data
             # ==================== Dependency Phase ====================
-            # # TODO: Refine the Dependency Phase
-            for task in tasks_data:
-                self.context["target_task"] = task
-                dependency_phase = phases.TaskDependencyPhase(workflow=self)
-                dependency_result = dependency_phase.execute()
-                if dependency_result is None or not dependency_result.get("success"):
-                    log_error(
-                        Exception(dependency_result.get("error", "No result") if dependency_result else "No results returned from phase"),
-                        "Task dependency failed, continuing with empty dependencies",
-                    )
-                    task["dependency_tasks"] = []
-                    continue
-                # save the dependency tasks in the context, prepare for the MongoDB insertion phase
-                try: 
-                    task["dependency_tasks"] = dependency_result["data"][task["uuid"]]
-                except Exception as e:
-                    log_error(e, "Task dependency failed for task: " + task["title"])
-                    task["dependency_tasks"] = []
+            self.link_dependencies(tasks_data)
 
             # ==================== MongoDB Insertion Phase ====================
             # Insert into MongoDB
@@ -309,5 +441,3 @@ class TodoCreatorWorkflow(Workflow):
                 "message": f"Task decomposition workflow failed: {str(e)}",
                 "data": None,
             }
-        finally:
-            self.cleanup()
@@ -0,0 +1,43 @@
+"""LLM client setup for the agent."""
+
+from prometheus_swarm.clients import Client, setup_client as setup_base_client
+from src.tools.execute_command.definitions import (
+    DEFINITIONS as EXECUTE_COMMAND_DEFINITIONS,
+)
+from src.tools.file_operations.definitions import (
+    DEFINITIONS as FILE_OPERATIONS_DEFINITIONS,
+)
+from src.tools.git_operations.definitions import (
+    DEFINITIONS as GIT_OPERATIONS_DEFINITIONS,
+)
+from src.utils.rate_limit import governed, observe_responses
+
+# Local tools resolve paths against the workflow's repo_path instead of the
+# process working directory, so they replace the framework tools of the same name
+WORKSPACE_TOOL_DEFINITIONS = {
+    **EXECUTE_COMMAND_DEFINITIONS,
+    **FILE_OPERATIONS_DEFINITIONS,
+    **GIT_OPERATIONS_DEFINITIONS,
+}
+
+
+def setup_client(client: str, model: str = None) -> Client:
+    """Configure and return an LLM client with the framework and workspace tools.
+
+    LLM calls and tool executions are rate limited host-wide.
+
+    Args:
+        client: The client type to use ("openai", "anthropic", "xai", etc.)
+        model: Optional model to use (overrides client's default model)
+
+    Returns:
+        Client: Configured client instance with tools loaded
+    """
+    client = setup_base_client(client, model)
+    client.tools.update(WORKSPACE_TOOL_DEFINITIONS)
+    # Framework phases call these directly, so rate limit them on the client
+    client.send_message = governed("llm")(client.send_message)
+    client.execute_tool = governed("tools")(client.execute_tool)
+    # The SDK clients (Anthropic, OpenAI) send their requests through httpx
+    observe_responses(getattr(getattr(client, "client", None), "_client", None), "llm")
+    return client
@@ -1,11 +1,19 @@
 """Database package."""
 
-from .database import get_db, get_session, initialize_database
+from .database import (
+    get_db,
+    get_session,
+    initialize_database,
+    run_maintenance,
+    start_maintenance,
+)
 from .models import Submission
 
 __all__ = [
     "get_db",
     "get_session",
     "initialize_database",
+    "run_maintenance",
+    "start_maintenance",
     "Submission",
 ]
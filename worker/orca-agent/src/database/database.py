@@ -1,7 +1,10 @@
 """Database service module."""
 
+import os
+import threading
+from datetime import datetime, timedelta
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy import inspect
+from sqlalchemy import event, func, inspect, text
 from sqlmodel import SQLModel
 from contextlib import contextmanager
 from typing import Optional, Dict, Any
@@ -9,10 +12,41 @@ from .models import Submission
 
 # Import engine from agent framework's shared config
 from prometheus_swarm.database.config import engine
+from prometheus_swarm.utils.logging import logger
 
 # Create session factory using shared engine
 Session = sessionmaker(bind=engine)
 
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+# Finished submissions older than this many rounds behind a task's latest round
+# are pruned by run_maintenance, 0 keeps everything
+SUBMISSION_RETENTION_ROUNDS = int(os.getenv("SUBMISSION_RETENTION_ROUNDS", "100"))
+LOG_RETENTION_DAYS = int(os.getenv("LOG_RETENTION_DAYS", "14"))
+# 0 disables the background maintenance thread
+MAINTENANCE_INTERVAL_HOURS = float(os.getenv("DB_MAINTENANCE_INTERVAL_HOURS", "24"))
+
+_maintenance_thread = None
+_maintenance_stop = threading.Event()
+
+
+@event.listens_for(engine, "connect")
+def _configure_sqlite(dbapi_connection, connection_record):
+    """Apply the storage profile to every new SQLite connection.
+
+    WAL lets readers run alongside the writer, and with synchronous=NORMAL a
+    commit no longer waits for an fsync, only checkpoints do.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
 
 def get_db():
     """Get database session.
@@ -35,21 +69,63 @@ def get_db():
 
 
 def initialize_database():
-    """Initialize database tables if they don't exist."""
+    """Create missing tables and run pending schema migrations.
+
+    The schema version is kept in SQLite's user_version, so a database that is
+    already current is not inspected again on every start.
+    """
+    with engine.connect() as conn:
+        version = conn.exec_driver_sql("PRAGMA user_version").scalar()
+    if version >= len(MIGRATIONS):
+        return
+
+    # Only creates tables that don't exist
+    SQLModel.metadata.create_all(engine)
+
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        migration()
+        with engine.begin() as conn:
+            conn.exec_driver_sql(f"PRAGMA user_version = {number}")
+
+
+def _add_missing_columns():
+    """Add model columns missing from existing tables.
+
+    Only nullable columns can be added this way, which covers every column added
+    to the models so far.
+    """
     inspector = inspect(engine)
-    existing_tables = inspector.get_table_names()
+    for table_name, table in SQLModel.metadata.tables.items():
+        if not inspector.has_table(table_name):
+            continue
+        existing_columns = {c["name"] for c in inspector.get_columns(table_name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            with engine.begin() as conn:
+                conn.execute(
+                    text(
+                        f'ALTER TABLE "{table_name}" '
+                        f'ADD COLUMN "{column.name}" {column_type}'
+                    )
+                )
+
 
-    # Get all model classes from SQLModel metadata
-    model_tables = SQLModel.metadata.tables
+def _create_missing_indexes():
+    for table in SQLModel.metadata.tables.values():
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
 
-    # Only create tables that don't exist
-    tables_to_create = []
-    for table_name, table in model_tables.items():
-        if table_name not in existing_tables:
-            tables_to_create.append(table)
 
-    if tables_to_create:
-        SQLModel.metadata.create_all(engine, tables=tables_to_create)
+# Schema migrations, in order. Every schema change to an existing table needs an
+# entry here, since databases already at the latest version are not inspected.
+MIGRATIONS = [
+    # Reconciler credential columns and the status index
+    _add_missing_columns,
+    # (task_id, round_number, status) index
+    _create_missing_indexes,
+]
 
 
 def get_submission(
@@ -136,3 +212,96 @@ def get_session():
                 session.close()
         except ImportError:
             session.close()
+
+
+def prune_old_submissions(session, keep_rounds: int = SUBMISSION_RETENTION_ROUNDS):
+    """Delete finished submissions more than keep_rounds behind their task's latest round.
+
+    Submissions still waiting to be recorded are kept for the reconciler.
+
+    Returns:
+        int: Number of submissions deleted
+    """
+    if keep_rounds <= 0:
+        return 0
+    deleted = 0
+    latest_rounds = session.query(
+        Submission.task_id, func.max(Submission.round_number)
+    ).group_by(Submission.task_id)
+    for task_id, latest_round in latest_rounds.all():
+        deleted += (
+            session.query(Submission)
+            .filter(
+                Submission.task_id == task_id,
+                Submission.round_number < latest_round - keep_rounds,
+                Submission.status.in_(("completed", "failed")),
+            )
+            .delete(synchronize_session=False)
+        )
+    session.commit()
+    return deleted
+
+
+def prune_old_logs(session, retention_days: int = LOG_RETENTION_DAYS):
+    """Delete database log records older than retention_days.
+
+    Returns:
+        int: Number of log records deleted
+    """
+    table = SQLModel.metadata.tables.get("log")
+    if retention_days <= 0 or table is None:
+        return 0
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    result = session.execute(table.delete().where(table.c.timestamp < cutoff))
+    session.commit()
+    return result.rowcount
+
+
+def run_maintenance(vacuum: bool = True) -> Dict[str, int]:
+    """Prune old submissions and logs, then reclaim the freed space.
+
+    Returns:
+        dict: Number of submissions and logs deleted
+    """
+    session = Session()
+    try:
+        result = {
+            "submissions": prune_old_submissions(session),
+            "logs": prune_old_logs(session),
+        }
+    finally:
+        session.close()
+    # VACUUM can't run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if vacuum and any(result.values()):
+            conn.exec_driver_sql("VACUUM")
+        conn.exec_driver_sql("PRAGMA optimize")
+    return result
+
+
+def _maintenance_loop():
+    while True:
+        try:
+            result = run_maintenance()
+            logger.info(
+                f"Database maintenance pruned {result['submissions']} submissions "
+                f"and {result['logs']} logs"
+            )
+        except Exception as e:
+            logger.warning(f"Database maintenance failed: {e}")
+        _maintenance_stop.wait(MAINTENANCE_INTERVAL_HOURS * 3600)
+        if _maintenance_stop.is_set():
+            return
+
+
+def start_maintenance():
+    """Run run_maintenance now and then every MAINTENANCE_INTERVAL_HOURS, in the background."""
+    global _maintenance_thread
+    if MAINTENANCE_INTERVAL_HOURS <= 0:
+        return
+    if _maintenance_thread is None or not _maintenance_thread.is_alive():
+        _maintenance_stop.clear()
+        _maintenance_thread = threading.Thread(
+            target=_maintenance_loop, name="db-maintenance", daemon=True
+        )
+        _maintenance_thread.start()
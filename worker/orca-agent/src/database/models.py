@@ -1,5 +1,6 @@
 """Database models."""
 
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 from typing import Optional
 
@@ -7,12 +8,20 @@ from typing import Optional
 class Submission(SQLModel, table=True):
     """Task submission model."""
 
+    __table_args__ = (
+        Index("ix_submission_task_round_status", "task_id", "round_number", "status"),
+    )
+
     task_id: str = Field(primary_key=True)
     round_number: int = Field(primary_key=True)
-    status: str = "pending"
+    status: str = Field(default="pending", index=True)
     pr_url: Optional[str] = None
     username: Optional[str] = None
     repo_owner: str
     repo_name: str
     uuid: Optional[str] = None  # UUID of the issue/todo
     node_type: str = "worker"  # Either "worker" or "leader"
+    # Credentials of the PR recording request, kept so it can be retried later
+    staking_key: Optional[str] = None
+    pub_key: Optional[str] = None
+    pr_signature: Optional[str] = None
@@ -1,14 +1,15 @@
 """Flask application initialization."""
 
 from flask import Flask, request
-from .routes import task, submission, audit, healthz
+from .routes import task, submission, audit, healthz, job, metrics
 from prometheus_swarm.utils.logging import (
     configure_logging,
     log_section,
     log_key_value,
     log_value,
 )
-from src.database import initialize_database
+from src.database import initialize_database, start_maintenance
+from src.server.services.reconciler_service import start_reconciler
 from colorama import Fore, Style
 import uuid
 import os
@@ -55,6 +56,8 @@ def create_app():
     app.register_blueprint(task.bp)
     app.register_blueprint(submission.bp)
     app.register_blueprint(audit.bp)
+    app.register_blueprint(job.bp)
+    app.register_blueprint(metrics.bp)
 
     # Configure logging within app context
     with app.app_context():
@@ -71,4 +74,9 @@ def create_app():
         log_key_value("Host", "0.0.0.0:8080")
         log_key_value("Database", os.getenv("DATABASE_PATH", "Not configured"))
 
+    # Retry PRs that failed to record with the middle server in the background
+    start_reconciler(app)
+    # Prune old rounds and logs in the background
+    start_maintenance()
+
     return app
@@ -0,0 +1,26 @@
+from flask import Blueprint, jsonify
+from src.server.services import job_service
+
+bp = Blueprint("job", __name__)
+
+
+@bp.get("/jobs/<job_id>")
+def fetch_job(job_id):
+    """Fetch the status of a queued worker or leader task."""
+    job = job_service.get_job(job_id)
+    if not job:
+        return jsonify({"success": False, "message": f"Job {job_id} not found"}), 404
+
+    return jsonify(
+        {
+            "success": True,
+            "jobId": job["job_id"],
+            "taskId": job["task_id"],
+            "roundNumber": job["round_number"],
+            "nodeType": job["node_type"],
+            "status": job["status"],
+            "prUrl": job["pr_url"],
+            "error": job["error"],
+            "errorStatus": job["error_status"],
+        }
+    )
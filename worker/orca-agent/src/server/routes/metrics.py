@@ -0,0 +1,31 @@
+from flask import Blueprint, jsonify
+from src.utils.rate_limit import get_rate_limit_stats
+from src.utils.middle_server import get_middle_server_stats
+from src.utils.repo_cache import get_cache_stats
+from src.utils.github_client import get_github_stats
+from src.utils.signatures import get_signature_cache_stats
+from src.server.services.reconciler_service import get_reconciler_stats
+from src.server.models.Log import get_log_writer_stats
+from src.workflows.task.retrieval import get_retrieval_stats
+from src.tools.file_operations.symbol_index import get_symbol_index_stats
+
+bp = Blueprint("metrics", __name__)
+
+
+@bp.get("/metrics")
+def metrics():
+    """Report rate limits, service health, caches, background workers and retrieval savings."""
+    return jsonify(
+        {
+            "success": True,
+            "rateLimits": get_rate_limit_stats(),
+            "middleServer": get_middle_server_stats(),
+            "repoCache": get_cache_stats(),
+            "github": get_github_stats(),
+            "signatureCache": get_signature_cache_stats(),
+            "reconciler": get_reconciler_stats(),
+            "logWriter": get_log_writer_stats(),
+            "retrieval": get_retrieval_stats(),
+            "symbolIndex": get_symbol_index_stats(),
+        }
+    )
@@ -1,19 +1,25 @@
 """Audit service module."""
 
-from prometheus_swarm.clients import setup_client
+from src.clients import setup_client
 from src.workflows.audit.workflow import AuditWorkflow
 from src.workflows.audit.prompts import PROMPTS as AUDIT_PROMPTS
 from prometheus_swarm.utils.logging import log_error
 import re
-import requests
-from github import Github
 import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from git import Repo
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List
 from prometheus_swarm.tools.github_operations.parser import extract_section
-from src.workflows.utils import verify_pr_signatures
+from src.workflows.utils import verify_pr_signatures, verify_many_pr_signatures
+from src.utils.repo_cache import clone_options
+from src.utils.github_client import get_repo, get_pull
+from src.utils import middle_server
 import json
 
+# Worker PRs referenced by a leader's merge commits are fetched in parallel
+AUDIT_FETCH_WORKERS = int(os.getenv("AUDIT_FETCH_WORKERS", "8"))
+
 
 def verify_pr_ownership(
     pr_url: str,
@@ -43,11 +49,7 @@ def verify_pr_ownership(
         bool: True if PR ownership and signature are valid
     """
 
-    response = requests.get(
-        os.environ["MIDDLE_SERVER_URL"]
-        + f"/api/builder/get-source-repo/{node_type}/{uuid}",
-        headers={"Content-Type": "application/json"},
-    )
+    response = middle_server.get(f"/api/builder/get-source-repo/{node_type}/{uuid}")
 
     response_data = response.json()
     if not response_data.get("success"):
@@ -99,8 +101,6 @@ def verify_pr_ownership(
         print(f"Node action: {node_actions.get(node_type)}")
         print(f"Node endpoint: {node_endpoints.get(node_type)}")
 
-        gh = Github(os.environ.get("GITHUB_TOKEN"))
-
         # Parse PR URL
         match = re.match(r"https://github\.com/([^/]+)/([^/]+)/pull/(\d+)", pr_url)
         if not match:
@@ -131,8 +131,7 @@ def verify_pr_ownership(
             }
 
         # Get PR and verify author
-        repo = gh.get_repo(f"{owner}/{repo_name}")
-        pr = repo.get_pull(int(pr_number))
+        pr = get_pull(f"{owner}/{repo_name}", int(pr_number))
 
         if pr.user.login != expected_username:
             log_error(
@@ -177,17 +176,10 @@ def verify_pr_ownership(
         }
         print(f"Middleware payload: {json.dumps(middleware_payload, indent=2)}")
 
-        middleware_url = (
-            os.environ["MIDDLE_SERVER_URL"]
-            + f"/api/builder/{node_endpoints[node_type]}"
-        )
-        print(f"Middleware URL: {middleware_url}")
+        middleware_path = f"/api/builder/{node_endpoints[node_type]}"
+        print(f"Middleware URL: {os.environ['MIDDLE_SERVER_URL']}{middleware_path}")
 
-        response = requests.post(
-            middleware_url,
-            json=middleware_payload,
-            headers={"Content-Type": "application/json"},
-        )
+        response = middle_server.post(middleware_path, json=middleware_payload)
 
         response_data = response.json()
         print(f"Middleware response: {json.dumps(response_data, indent=2)}")
@@ -254,8 +246,6 @@ def validate_pr_list(
         print("\nStarting leader audit...", flush=True)
         print(f"PR URL: {pr_url}", flush=True)
 
-        gh = Github(os.environ["GITHUB_TOKEN"])
-
         # Parse PR URL and get PR object
         match = re.match(r"https://github\.com/([^/]+)/([^/]+)/pull/(\d+)", pr_url)
         if not match:
@@ -268,8 +258,8 @@ def validate_pr_list(
         )
 
         # Get source repo and PR
-        source_repo = gh.get_repo(f"{repo_owner}/{repo_name}")
-        pr = source_repo.get_pull(int(pr_number))
+        source_repo = get_repo(f"{repo_owner}/{repo_name}")
+        pr = get_pull(f"{repo_owner}/{repo_name}", int(pr_number))
         print(f"PR base repo: {pr.base.repo.full_name}", flush=True)
         print(f"PR head repo: {pr.head.repo.full_name}", flush=True)
 
@@ -298,36 +288,21 @@ def validate_pr_list(
                 f"PR owner mismatch - expected: {leader_username}, got: {pr.head.repo.owner.login}",
             )
 
-        # Clone the repository and analyze merge commits
-        clone_path = f"/tmp/audit-{repo_owner}-{repo_name}-{pr.head.ref}"
-        print(f"\nClone path: {clone_path}", flush=True)
-        if os.path.exists(clone_path):
-            print("Removing existing clone path", flush=True)
-            os.system(f"rm -rf {clone_path}")
-
-        # Clone using the token for auth
-        clone_url = f"https://{os.environ['GITHUB_TOKEN']}@github.com/{pr.head.repo.full_name}.git"
-        print(f"\nCloning repository from {pr.head.repo.full_name}...", flush=True)
-        print(
-            f"Clone URL: {clone_url.replace(os.environ['GITHUB_TOKEN'], 'TOKEN')}",
-            flush=True,
-        )
-        repo = Repo.clone_from(clone_url, clone_path)
-
-        # Checkout the -merged branch
         source_branch = issue_uuid
         merged_branch = f"{source_branch}-merged"
         print(f"Source branch: {source_branch}", flush=True)
         print(f"Merged branch: {merged_branch}", flush=True)
-        print(f"Checking out merged branch: {merged_branch}", flush=True)
-        repo.git.checkout(merged_branch)
 
-        # Get all commits in the PR
-        commits = list(repo.iter_commits(f"{pr.base.ref}..{merged_branch}"))
-        print(f"\nFound {len(commits)} commits in PR", flush=True)
-
-        # Get merge commits
-        merge_commits = [c for c in commits if len(c.parents) == 2]
+        # Get merge commits from the compare API, falling back to a clone
+        try:
+            merge_commits = _get_merge_commits_from_api(
+                pr.head.repo.full_name, pr.base.ref, merged_branch
+            )
+        except Exception as e:
+            print(f"Compare API failed, cloning instead: {str(e)}", flush=True)
+            merge_commits = _get_merge_commits_from_clone(
+                pr, repo_owner, repo_name, merged_branch
+            )
         print(f"Found {len(merge_commits)} merge commits", flush=True)
 
         # 7. Verify merge commits against PR list
@@ -338,6 +313,25 @@ def validate_pr_list(
             flush=True,
         )
 
+        # Extract branch name and PR URL from each merge commit message
+        merged_pr_urls = []
+        for sha, message in merge_commits:
+            print(f"\nChecking commit: {sha[:8]}", flush=True)
+            print(f"Commit message: {message}", flush=True)
+            commit_match = re.search(
+                r"Merged branch (pr-\d+[^\"]+) for PR (https://github\.com/[^/]+/[^/]+/pull/\d+)",
+                message,
+            )
+            if not commit_match:
+                print(f"Warning: No match found in commit message: {message}")
+                continue
+            merge_pr_url = commit_match.group(2)
+            print(f"Found PR URL in commit: {merge_pr_url}", flush=True)
+            merged_pr_urls.append(merge_pr_url)
+
+        # Fetch all referenced worker PRs at once
+        worker_prs = _fetch_worker_prs(merged_pr_urls)
+
         # Track processed merge commits to ensure all are valid
         valid_commits = 0
 
@@ -345,88 +339,53 @@ def validate_pr_list(
         used_pr_urls = set()
 
         # Verify each merge commit corresponds to a PR from the PR list
-        for commit in merge_commits:
-            print(f"\nChecking commit: {commit.hexsha[:8]}", flush=True)
-            print(f"Commit message: {commit.message}", flush=True)
-
-            # Extract branch name and PR URL from merge commit message
+        for merge_pr_url in merged_pr_urls:
             try:
-                commit_match = re.search(
-                    r"Merged branch (pr-\d+[^\"]+) for PR (https://github\.com/[^/]+/[^/]+/pull/\d+)",
-                    commit.message,
-                )
-                if not commit_match:
+                worker_pr = worker_prs[merge_pr_url]
+                if isinstance(worker_pr, Exception):
+                    raise worker_pr
+
+                # Extract staking key from PR body
+                staking_section = extract_section(worker_pr.body, "STAKING_KEY")
+                if not staking_section:
                     print(
-                        f"Warning: No match found in commit message: {commit.message}"
+                        f"Warning: No staking key section found in PR #{worker_pr.number}"
                     )
                     continue
 
-                copied_branch = commit_match.group(1)
-                merge_pr_url = commit_match.group(2)
-                print(f"Found PR URL in commit: {merge_pr_url}", flush=True)
+                worker_staking_key = staking_section.split(":")[0].strip()
+                print(f"Found staking key in PR: {worker_staking_key}")
+
+                # Check if this staking key is in our PR list
+                if worker_staking_key not in pr_list:
+                    print(
+                        f"Warning: Staking key {worker_staking_key} not found in PR list"
+                    )
+                    continue
 
-                # Extract PR number from URL
-                try:
-                    pr_match = re.match(
-                        r"https://github\.com/([^/]+)/([^/]+)/pull/(\d+)", merge_pr_url
+                # Verify the PR URL matches what's in our PR list
+                expected_pr_urls = pr_list[worker_staking_key]
+                if merge_pr_url.strip() not in [
+                    url.strip() for url in expected_pr_urls
+                ]:
+                    print(
+                        f"Warning: PR URL not found in list for staking key {worker_staking_key}"
                     )
-                    if not pr_match:
-                        print(
-                            f"Warning: Invalid PR URL format in commit: {merge_pr_url}"
-                        )
-                        continue
-
-                    pr_owner, pr_repo_name, pr_number = pr_match.groups()
-
-                    # Fetch the PR to extract the staking key from its description
-                    pr_repo = gh.get_repo(f"{pr_owner}/{pr_repo_name}")
-                    worker_pr = pr_repo.get_pull(int(pr_number))
-
-                    # Extract staking key from PR body
-                    staking_section = extract_section(worker_pr.body, "STAKING_KEY")
-                    if not staking_section:
-                        print(
-                            f"Warning: No staking key section found in PR #{pr_number}"
-                        )
-                        continue
-
-                    worker_staking_key = staking_section.split(":")[0].strip()
-                    print(f"Found staking key in PR: {worker_staking_key}")
-
-                    # Check if this staking key is in our PR list
-                    if worker_staking_key not in pr_list:
-                        print(
-                            f"Warning: Staking key {worker_staking_key} not found in PR list"
-                        )
-                        continue
-
-                    # Verify the PR URL matches what's in our PR list
-                    expected_pr_urls = pr_list[worker_staking_key]
-                    if merge_pr_url.strip() not in [
-                        url.strip() for url in expected_pr_urls
-                    ]:
-                        print(
-                            f"Warning: PR URL not found in list for staking key {worker_staking_key}"
-                        )
-                        print(f"  Expected one of: {expected_pr_urls}")
-                        print(f"  Found: {merge_pr_url}")
-                        continue
-
-                    # Check for duplicate PR URLs
-                    if merge_pr_url in used_pr_urls:
-                        print(f"Warning: Duplicate PR URL: {merge_pr_url}")
-                        continue
-
-                    used_pr_urls.add(merge_pr_url)
-                    valid_commits += 1
-                    print(f"✓ Valid PR from staking key {worker_staking_key}")
-
-                except Exception as e:
-                    print(f"Warning: Error processing PR {merge_pr_url}: {str(e)}")
+                    print(f"  Expected one of: {expected_pr_urls}")
+                    print(f"  Found: {merge_pr_url}")
                     continue
 
+                # Check for duplicate PR URLs
+                if merge_pr_url in used_pr_urls:
+                    print(f"Warning: Duplicate PR URL: {merge_pr_url}")
+                    continue
+
+                used_pr_urls.add(merge_pr_url)
+                valid_commits += 1
+                print(f"✓ Valid PR from staking key {worker_staking_key}")
+
             except Exception as e:
-                print(f"Warning: Error parsing commit message: {str(e)}")
+                print(f"Warning: Error processing PR {merge_pr_url}: {str(e)}")
                 continue
 
         print(
@@ -461,7 +420,83 @@ def validate_pr_list(
     except Exception as e:
         return False, f"Leader audit failed: {str(e)}"
 
+
+def _get_merge_commits_from_api(
+    repo_full_name: str, base_ref: str, merged_branch: str
+) -> List[Tuple[str, str]]:
+    """List (sha, message) of the merge commits on a branch via the compare API."""
+    comparison = get_repo(repo_full_name).compare(base_ref, merged_branch)
+    print(f"\nFound {comparison.total_commits} commits in PR (compare API)", flush=True)
+    return [
+        (commit.sha, commit.commit.message)
+        for commit in comparison.commits
+        if len(commit.parents) == 2
+    ]
+
+
+def _get_merge_commits_from_clone(
+    pr, repo_owner: str, repo_name: str, merged_branch: str
+) -> List[Tuple[str, str]]:
+    """List (sha, message) of the merge commits on a branch from a blobless clone."""
+    clone_path = f"/tmp/audit-{repo_owner}-{repo_name}-{pr.head.ref}"
+    print(f"\nClone path: {clone_path}", flush=True)
+    if os.path.exists(clone_path):
+        print("Removing existing clone path", flush=True)
+        shutil.rmtree(clone_path, ignore_errors=True)
+
+    try:
+        # Clone using the token for auth
+        clone_url = f"https://{os.environ['GITHUB_TOKEN']}@github.com/{pr.head.repo.full_name}.git"
+        print(f"\nCloning repository from {pr.head.repo.full_name}...", flush=True)
+        # Only the commit graph is audited, so skip file contents and the checkout
+        repo = Repo.clone_from(
+            clone_url, clone_path, no_checkout=True, **clone_options("blobless")
+        )
+
+        # Get all commits in the PR
+        commits = list(
+            repo.iter_commits(f"origin/{pr.base.ref}..origin/{merged_branch}")
+        )
+        print(f"\nFound {len(commits)} commits in PR", flush=True)
+        return [(c.hexsha, c.message) for c in commits if len(c.parents) == 2]
     finally:
-        # Cleanup
-        if "clone_path" in locals() and os.path.exists(clone_path):
-            os.system(f"rm -rf {clone_path}")
+        shutil.rmtree(clone_path, ignore_errors=True)
+
+
+def _fetch_worker_prs(pr_urls: List[str]) -> Dict[str, object]:
+    """Fetch worker PRs concurrently, then verify their signatures in one batch.
+
+    Returns:
+        Dict mapping each distinct PR URL to its PullRequest, or to the
+        exception raised while fetching it or verifying its signature
+    """
+
+    def fetch(pr_url):
+        match = re.match(r"https://github\.com/([^/]+)/([^/]+)/pull/(\d+)", pr_url)
+        if not match:
+            raise ValueError(f"Invalid PR URL format in commit: {pr_url}")
+        owner, repo, number = match.groups()
+        return get_pull(f"{owner}/{repo}", int(number))
+
+    unique_urls = list(dict.fromkeys(pr_urls))
+    if not unique_urls:
+        return {}
+
+    results = {}
+    workers = min(AUDIT_FETCH_WORKERS, len(unique_urls))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {url: executor.submit(fetch, url) for url in unique_urls}
+    for url, future in futures.items():
+        try:
+            results[url] = future.result()
+        except Exception as e:
+            results[url] = e
+
+    fetched = [url for url in unique_urls if not isinstance(results[url], Exception)]
+    signatures_valid = verify_many_pr_signatures(
+        [{"pr_body": results[url].body, "expected_action": "task"} for url in fetched]
+    )
+    for url, is_valid in zip(fetched, signatures_valid):
+        if not is_valid:
+            results[url] = ValueError(f"Invalid signature in PR #{results[url].number}")
+    return results
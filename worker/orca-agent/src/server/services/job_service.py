@@ -0,0 +1,259 @@
+"""Background job service for long-running worker and leader tasks.
+
+Task workflows take minutes to run, so the task routes enqueue them here and
+return a job id immediately. Jobs run on a bounded thread pool; their live
+state is kept in memory and their outcome is persisted through the
+``Submission`` table, which also backs status lookups after a restart.
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from flask import g
+from src.database import get_db, Submission
+from src.server.services import task_service
+from prometheus_swarm.utils.logging import logger, log_error
+
+# Each workflow works in its own clone, so several can run side by side
+MAX_WORKERS = int(os.getenv("JOB_MAX_WORKERS", "2"))
+MAX_PENDING_JOBS = int(os.getenv("JOB_MAX_PENDING", "10"))
+# How long finished jobs stay in memory before lookups fall back to the database
+JOB_RETENTION_SECONDS = int(os.getenv("JOB_RETENTION_SECONDS", "3600"))
+
+ACTIVE_STATUSES = ("queued", "running")
+
+_executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="task-job")
+_jobs: Dict[str, dict] = {}
+_jobs_lock = threading.Lock()
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another job."""
+
+
+def make_job_id(task_id: str, round_number: int) -> str:
+    """Build the job id for a task round."""
+    return f"{task_id}-{round_number}"
+
+
+def parse_job_id(job_id: str) -> Optional[tuple]:
+    """Split a job id into (task_id, round_number), or None if malformed."""
+    task_id, _, round_number = job_id.rpartition("-")
+    if not task_id or not round_number.isdigit():
+        return None
+    return task_id, int(round_number)
+
+
+def _prune_finished_jobs():
+    """Drop finished jobs older than the retention window. Caller holds the lock."""
+    cutoff = time.time() - JOB_RETENTION_SECONDS
+    expired = [
+        job_id
+        for job_id, job in _jobs.items()
+        if job["status"] not in ACTIVE_STATUSES and job["finished_at"] < cutoff
+    ]
+    for job_id in expired:
+        del _jobs[job_id]
+
+
+def submit_task_job(app, node_type: str, round_number: int, request_data: dict) -> dict:
+    """Enqueue a worker or leader task, collapsing duplicates onto the in-flight job.
+
+    Args:
+        app: Flask application the job runs under
+        node_type: Either "worker" or "leader"
+        round_number: Round number of the task
+        request_data: Validated request body of the task route
+
+    Returns:
+        dict: Snapshot of the job, with "created" set if a new job was enqueued
+
+    Raises:
+        QueueFullError: If MAX_PENDING_JOBS jobs are already queued or running
+    """
+    task_id = request_data["taskId"]
+    job_id = make_job_id(task_id, round_number)
+
+    with _jobs_lock:
+        _prune_finished_jobs()
+
+        existing = _jobs.get(job_id)
+        if existing and existing["status"] in ACTIVE_STATUSES:
+            logger.info(f"Job {job_id} already {existing['status']}, reusing it")
+            return {**existing, "created": False}
+
+        pending = sum(1 for job in _jobs.values() if job["status"] in ACTIVE_STATUSES)
+        if pending >= MAX_PENDING_JOBS:
+            raise QueueFullError(f"Job queue is full ({pending} pending jobs)")
+
+        job = {
+            "job_id": job_id,
+            "task_id": task_id,
+            "round_number": round_number,
+            "node_type": node_type,
+            "status": "queued",
+            "pr_url": None,
+            "error": None,
+            "error_status": None,
+            "created_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+        }
+        _jobs[job_id] = job
+        snapshot = {**job, "created": True}
+
+    _executor.submit(_run_job, app, job_id, node_type, round_number, request_data)
+    logger.info(f"Queued {node_type} job {job_id}")
+    return snapshot
+
+
+def _update_job(job_id: str, **fields):
+    with _jobs_lock:
+        _jobs[job_id].update(fields)
+
+
+def _run_job(app, job_id: str, node_type: str, round_number: int, request_data: dict):
+    """Run a queued task inside its own application context."""
+    with app.app_context():
+        _update_job(job_id, status="running", started_at=time.time())
+        try:
+            result = run_task(node_type, round_number, request_data)
+            if result.get("success", False):
+                _update_job(
+                    job_id,
+                    status="completed",
+                    pr_url=result["data"]["pr_url"],
+                    finished_at=time.time(),
+                )
+                logger.info(f"Job {job_id} completed: {result['data']['message']}")
+            else:
+                _update_job(
+                    job_id,
+                    status="failed",
+                    error=result.get("error", "Unknown error"),
+                    error_status=result.get("status", 500),
+                    finished_at=time.time(),
+                )
+                logger.error(f"Job {job_id} failed: {result.get('error')}")
+        except Exception as e:
+            log_error(e, f"Job {job_id} crashed")
+            _update_job(
+                job_id,
+                status="failed",
+                error=str(e),
+                error_status=500,
+                finished_at=time.time(),
+            )
+        finally:
+            db = g.pop("db", None)
+            if db is not None:
+                db.close()
+
+
+def run_task(node_type: str, round_number: int, request_data: dict) -> dict:
+    """Run the task workflow and record the resulting PR.
+
+    Args:
+        node_type: Either "worker" or "leader"
+        round_number: Round number of the task
+        request_data: Validated request body of the task route
+
+    Returns:
+        dict: Result with pr_url and message on success, or error and status
+    """
+    task_functions = {
+        "worker": task_service.complete_todo,
+        "leader": task_service.consolidate_prs,
+    }
+    # Shared by both steps, so the round's Submission and task details load once
+    context = task_service.TaskContext(request_data["taskId"], round_number)
+    response = task_functions[node_type](
+        task_id=request_data["taskId"],
+        round_number=round_number,
+        staking_signature=request_data["stakingSignature"],
+        staking_key=request_data["stakingKey"],
+        public_signature=request_data["publicSignature"],
+        pub_key=request_data["pubKey"],
+        context=context,
+    )
+    if not response.get("success", False):
+        return response
+
+    logger.info(response["data"]["message"])
+
+    # Record PR for both worker and leader tasks, but only workers record remotely
+    return task_service.record_pr(
+        round_number=round_number,
+        staking_signature=request_data["addPRSignature"],
+        staking_key=request_data["stakingKey"],
+        pub_key=request_data["pubKey"],
+        pr_url=response["data"]["pr_url"],
+        task_id=request_data["taskId"],
+        node_type=node_type,
+        context=context,
+    )
+
+
+def is_job_active(task_id: str, round_number: int) -> bool:
+    """Check whether a job for the task round is queued or running."""
+    with _jobs_lock:
+        job = _jobs.get(make_job_id(task_id, round_number))
+        return bool(job) and job["status"] in ACTIVE_STATUSES
+
+
+def mark_job_recorded(task_id: str, round_number: int, pr_url: str):
+    """Report a job that failed to record its PR as completed, once it is recorded."""
+    with _jobs_lock:
+        job = _jobs.get(make_job_id(task_id, round_number))
+        if job and job["status"] == "failed":
+            job.update(status="completed", pr_url=pr_url, error=None, error_status=None)
+
+
+def get_job(job_id: str) -> Optional[dict]:
+    """Get the status of a job.
+
+    Jobs still in memory report their live state. Older jobs, or jobs from
+    before a restart, are resolved from the Submission table; a submission that
+    never reached "completed" is reported as failed since nothing is running it.
+
+    Args:
+        job_id: Job id returned when the task was enqueued
+
+    Returns:
+        Optional[dict]: Job snapshot, or None if the job is unknown
+    """
+    with _jobs_lock:
+        job = _jobs.get(job_id)
+        if job:
+            return dict(job)
+
+    parsed = parse_job_id(job_id)
+    if not parsed:
+        return None
+    task_id, round_number = parsed
+
+    db = get_db()
+    submission = (
+        db.query(Submission)
+        .filter(Submission.task_id == task_id, Submission.round_number == round_number)
+        .first()
+    )
+    if not submission:
+        return None
+
+    completed = submission.status == "completed"
+    return {
+        "job_id": job_id,
+        "task_id": task_id,
+        "round_number": round_number,
+        "node_type": submission.node_type,
+        "status": "completed" if completed else "failed",
+        "pr_url": submission.pr_url,
+        "error": None if completed else f"Submission ended as {submission.status}",
+        "error_status": None,
+        "created_at": None,
+        "started_at": None,
+        "finished_at": None,
+    }
@@ -0,0 +1,208 @@
+"""Background reconciler for PRs that were never recorded with the middle server.
+
+When recording a PR fails, its submission is left as ``pending_record`` with the
+credentials of the recording request. The reconciler periodically retries those
+submissions in small batches, backing off per submission, so a transient middle
+server outage is repaired without waiting for the next task request.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Dict, Tuple
+from flask import g
+from src.database import get_db, Submission
+from src.server.services import job_service, task_service
+from src.utils.middle_server import get_middle_server_stats
+from prometheus_swarm.utils.logging import logger, log_error
+
+ENABLED = os.getenv("RECONCILER_ENABLED", "true").lower() == "true"
+INTERVAL_SECONDS = float(os.getenv("RECONCILER_INTERVAL_SECONDS", "60"))
+BATCH_SIZE = int(os.getenv("RECONCILER_BATCH_SIZE", "10"))
+MAX_ATTEMPTS = int(os.getenv("RECONCILER_MAX_ATTEMPTS", "8"))
+# Backoff after each failed attempt doubles from the base up to the max
+BACKOFF_BASE_SECONDS = float(os.getenv("RECONCILER_BACKOFF_BASE_SECONDS", "30"))
+BACKOFF_MAX_SECONDS = float(os.getenv("RECONCILER_BACKOFF_MAX_SECONDS", "1800"))
+
+RECONCILABLE_STATUSES = ("pending_record", "failed")
+
+_lock = threading.Lock()
+_thread = None
+_stop = threading.Event()
+# (task_id, round_number) -> {"attempts": int, "next_attempt_at": float}
+_retries: Dict[Tuple[str, int], dict] = {}
+_progress = {
+    "runs": 0,
+    "last_run_at": None,
+    "pending": 0,
+    "recorded": 0,
+    "failed_attempts": 0,
+    "gave_up": 0,
+}
+
+
+def _backoff(attempts: int) -> float:
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** (attempts - 1))
+    return delay + random.uniform(0, delay * 0.1)
+
+
+def _is_due(key: Tuple[str, int]) -> bool:
+    with _lock:
+        retry = _retries.get(key)
+    if retry is None:
+        return True
+    return retry["attempts"] < MAX_ATTEMPTS and retry["next_attempt_at"] <= time.time()
+
+
+def _record(submission: Submission) -> bool:
+    """Retry recording one submission's PR. Returns True if it is now recorded."""
+    task_id, round_number = submission.task_id, submission.round_number
+    context = task_service.TaskContext(task_id, round_number)
+    context.set_submission(submission)
+
+    result = task_service._store_pr_remotely(
+        submission.staking_key,
+        submission.pr_signature,
+        submission.pub_key,
+        submission.pr_url,
+        submission.node_type,
+        submission.uuid,
+        task_id,
+        round_number,
+        context=context,
+    )
+    if not result["success"] and "already" not in str(result.get("error", "")).lower():
+        logger.warning(
+            f"Reconciler failed to record PR for task {task_id}, round {round_number}: "
+            f"{result.get('error')}"
+        )
+        return False
+
+    local_result = task_service._store_pr_locally(
+        round_number,
+        submission.pr_url,
+        task_id,
+        submission.uuid,
+        submission.node_type,
+        context=context,
+    )
+    if not local_result["success"]:
+        return False
+
+    job_service.mark_job_recorded(task_id, round_number, submission.pr_url)
+    logger.info(
+        f"Reconciler recorded PR {submission.pr_url} for task {task_id}, "
+        f"round {round_number}"
+    )
+    return True
+
+
+def reconcile_once() -> dict:
+    """Retry a batch of unrecorded submissions that are due.
+
+    Must run inside an application context.
+
+    Returns:
+        dict: Progress counters after the run
+    """
+    db = get_db()
+    submissions = (
+        db.query(Submission)
+        .filter(
+            Submission.status.in_(RECONCILABLE_STATUSES),
+            Submission.pr_url.isnot(None),
+            Submission.pr_signature.isnot(None),
+        )
+        .order_by(Submission.round_number)
+        .all()
+    )
+
+    with _lock:
+        _progress["pending"] = len(submissions)
+    due = [
+        s
+        for s in submissions
+        if _is_due((s.task_id, s.round_number))
+        # A running job records its own PR
+        and not job_service.is_job_active(s.task_id, s.round_number)
+    ]
+
+    for submission in due[:BATCH_SIZE]:
+        # Don't keep hammering the middle server once it is known to be down
+        if get_middle_server_stats()["breaker_state"] == "open":
+            break
+        key = (submission.task_id, submission.round_number)
+        try:
+            recorded = _record(submission)
+        except Exception as e:
+            log_error(e, f"Reconciler crashed recording task {key[0]}, round {key[1]}")
+            db.rollback()
+            recorded = False
+
+        with _lock:
+            if recorded:
+                _retries.pop(key, None)
+                _progress["recorded"] += 1
+                _progress["pending"] -= 1
+                continue
+            retry = _retries.setdefault(key, {"attempts": 0, "next_attempt_at": 0})
+            retry["attempts"] += 1
+            retry["next_attempt_at"] = time.time() + _backoff(retry["attempts"])
+            _progress["failed_attempts"] += 1
+            if retry["attempts"] >= MAX_ATTEMPTS:
+                _progress["gave_up"] += 1
+                logger.error(
+                    f"Reconciler giving up on task {key[0]}, round {key[1]} "
+                    f"after {MAX_ATTEMPTS} attempts"
+                )
+
+    with _lock:
+        _progress["runs"] += 1
+        _progress["last_run_at"] = time.time()
+    return get_reconciler_stats()
+
+
+def _run(app):
+    while not _stop.wait(INTERVAL_SECONDS):
+        with app.app_context():
+            try:
+                reconcile_once()
+            except Exception as e:
+                log_error(e, "Reconciler run failed")
+            finally:
+                db = g.pop("db", None)
+                if db is not None:
+                    db.close()
+
+
+def start_reconciler(app):
+    """Start the reconciler thread, unless it is disabled or already running."""
+    global _thread
+    if not ENABLED:
+        return
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _stop.clear()
+        _thread = threading.Thread(
+            target=_run, args=(app,), name="pr-reconciler", daemon=True
+        )
+        _thread.start()
+    logger.info(f"Started PR reconciler, running every {INTERVAL_SECONDS}s")
+
+
+def stop_reconciler():
+    """Stop the reconciler thread after its current run."""
+    _stop.set()
+
+
+def get_reconciler_stats() -> dict:
+    """Get the reconciler's progress counters."""
+    with _lock:
+        stats = dict(_progress)
+        stats["backing_off"] = sum(
+            1 for retry in _retries.values() if retry["attempts"] < MAX_ATTEMPTS
+        )
+    stats["running"] = _thread is not None and _thread.is_alive()
+    return stats
@@ -2,9 +2,10 @@
 
 import requests
 import os
-from github import Github
+from src.utils.github_client import get_repo, get_user
+from src.utils import middle_server
 from src.database import get_db, Submission
-from prometheus_swarm.clients import setup_client
+from src.clients import setup_client
 from prometheus_swarm.utils.logging import logger, log_error
 from src.workflows.task.workflow import TaskWorkflow
 from src.workflows.mergeconflict.workflow import MergeConflictWorkflow
@@ -12,10 +13,62 @@ from src.workflows.mergeconflict.prompts import PROMPTS as CONFLICT_PROMPTS
 from src.workflows.task.prompts import PROMPTS as TASK_PROMPTS
 
 from dotenv import load_dotenv
+import threading
 import time
 
 load_dotenv()
 
+# Seconds a successful task lookup is reused for an identical repeat request
+TASK_DETAILS_CACHE_TTL = float(os.getenv("TASK_DETAILS_CACHE_TTL", "30"))
+
+_task_details_cache = {}
+_task_details_lock = threading.Lock()
+
+
+class TaskContext:
+    """State of one task round, shared by the service calls of a single job.
+
+    The job's calls all need the round's Submission row and its task details
+    from the middle server. The context loads each once, on first use, and
+    hands the same objects to every later call.
+    """
+
+    def __init__(self, task_id, round_number):
+        self.task_id = task_id
+        self.round_number = round_number
+        self.db = get_db()
+        self._submission = None
+        self._submission_loaded = False
+        self._task_details = {}
+
+    def get_submission(self):
+        """Get the round's Submission, or None if there is none."""
+        if not self._submission_loaded:
+            self._submission = (
+                self.db.query(Submission)
+                .filter(
+                    Submission.task_id == self.task_id,
+                    Submission.round_number == self.round_number,
+                )
+                .first()
+            )
+            self._submission_loaded = True
+        return self._submission
+
+    def set_submission(self, submission):
+        """Record a Submission created or deleted by the caller."""
+        self._submission = submission
+        self._submission_loaded = True
+
+    def get_task_details(self, signature, staking_key, pub_key, task_type):
+        """Get the round's task details, fetching them once per task type."""
+        if task_type in self._task_details:
+            return self._task_details[task_type]
+        result = get_task_details(signature, staking_key, pub_key, task_type)
+        if result.get("success", False):
+            self._task_details[task_type] = result
+        return result
+
 
 def complete_todo(
     task_id,
@@ -24,12 +77,15 @@ def complete_todo(
     staking_signature,
     pub_key,
     public_signature,
+    context=None,
     **kwargs,
 ):
     """Handle task creation request."""
     try:
+        context = context or TaskContext(task_id, round_number)
+
         # Proceed with todo request
-        todo_result = get_task_details(
+        todo_result = context.get_task_details(
             staking_signature, staking_key, pub_key, "worker"
         )
         if not todo_result.get("success", False):
@@ -64,11 +120,10 @@ def complete_todo(
             }
 
         # Check if base branch exists in target repo
-        github = Github(os.environ["GITHUB_TOKEN"])
         try:
             repo_url = f"{repo_owner}/{repo_name}"
             logger.info(f"Attempting to find repository: {repo_url}")
-            target_repo = github.get_repo(repo_url)
+            target_repo = get_repo(repo_url)
             logger.info(f"Found target repo: {target_repo.html_url}")
         except Exception as e:
             logger.error(f"Failed to find repository {repo_url}: {str(e)}")
@@ -111,6 +166,7 @@ def complete_todo(
                 repo_owner=repo_owner,
                 repo_name=repo_name,
                 base_branch=base_branch,
+                context=context,
             )
 
             if not result.get("success", False):
@@ -134,8 +190,29 @@ def complete_todo(
 
 
 def get_task_details(signature, staking_key, pub_key, task_type):
-    """Get task details from middle server."""
+    """Get task details from middle server.
 
+    Successful lookups are reused for TASK_DETAILS_CACHE_TTL seconds when the
+    same signed request is repeated, e.g. when a failed job is resubmitted.
+    """
+    cache_key = (task_type, staking_key, pub_key, signature)
+    with _task_details_lock:
+        cached = _task_details_cache.get(cache_key)
+        if cached and cached[0] > time.time():
+            logger.info(f"Using cached {task_type} task details")
+            return cached[1]
+
+    result = _fetch_task_details(signature, staking_key, pub_key, task_type)
+    if result.get("success", False) and TASK_DETAILS_CACHE_TTL > 0:
+        now = time.time()
+        with _task_details_lock:
+            for key in [k for k, v in _task_details_cache.items() if v[0] <= now]:
+                del _task_details_cache[key]
+            _task_details_cache[cache_key] = (now + TASK_DETAILS_CACHE_TTL, result)
+    return result
+
+
+def _fetch_task_details(signature, staking_key, pub_key, task_type):
     tasks_urls = {
         "worker": "/api/builder/fetch-to-do",
         "leader": "/api/builder/fetch-issue",
@@ -143,14 +220,13 @@ def get_task_details(signature, staking_key, pub_key, task_type):
     try:
         logger.info(f"Fetching {task_type} task")
 
-        response = requests.post(
-            os.environ["MIDDLE_SERVER_URL"] + tasks_urls[task_type],
+        response = middle_server.post(
+            tasks_urls[task_type],
             json={
                 "signature": signature,
                 "stakingKey": staking_key,
                 "pubKey": pub_key,
             },
-            headers={"Content-Type": "application/json"},
         )
         response.raise_for_status()
         result = response.json()
@@ -198,19 +274,15 @@ def run_todo_task(
     repo_owner,
     repo_name,
     base_branch,
+    context=None,
 ):
     """Run todo task and create PR."""
+    context = context or TaskContext(task_id, round_number)
     try:
-        db = get_db()
+        db = context.db
 
         # Check if we already have a PR URL for this submission
-        existing_submission = (
-            db.query(Submission)
-            .filter(
-                Submission.task_id == task_id, Submission.round_number == round_number
-            )
-            .first()
-        )
+        existing_submission = context.get_submission()
 
         if existing_submission and existing_submission.pr_url:
             logger.info(
@@ -228,6 +300,7 @@ def run_todo_task(
         if existing_submission:
             db.delete(existing_submission)
             db.commit()
+            context.set_submission(None)
             logger.info(
                 f"Deleted existing incomplete submission for task {task_id}, round {round_number}"
             )
@@ -247,6 +320,7 @@ def run_todo_task(
         )
         db.add(submission)
         db.commit()
+        context.set_submission(submission)
         logger.info(f"Created new submission with uuid={todo_uuid}, node_type=worker")
 
         # Set up client and workflow
@@ -290,14 +364,7 @@ def run_todo_task(
         log_error(e, context="PR creation failed")
         if "db" in locals():
             # Update submission status
-            submission = (
-                db.query(Submission)
-                .filter(
-                    Submission.task_id == task_id,
-                    Submission.round_number == round_number,
-                )
-                .first()
-            )
+            submission = context.get_submission()
             if submission:
                 submission.status = "failed"
                 db.commit()
@@ -307,24 +374,16 @@ def run_todo_task(
         return {"success": False, "status": 500, "error": str(e)}
 
 
-def _check_existing_pr(round_number: int, task_id: str) -> dict:
+def _check_existing_pr(round_number: int, task_id: str, context=None) -> dict:
     """Check if we already have a completed record for this round in local DB.
 
     Returns the PR URL if found, but doesn't prevent remote recording.
     """
     try:
-        db = get_db()
-        submission = (
-            db.query(Submission)
-            .filter(
-                Submission.round_number == round_number,
-                Submission.task_id == task_id,
-                Submission.status == "completed",
-            )
-            .first()
-        )
+        context = context or TaskContext(task_id, round_number)
+        submission = context.get_submission()
 
-        if submission and submission.pr_url:
+        if submission and submission.status == "completed" and submission.pr_url:
             logger.info(
                 f"Local PR record found for task {task_id}, round {round_number}"
             )
@@ -352,6 +411,7 @@ def _store_pr_remotely(
     task_id: str = None,
     round_number: int = None,
     github_username: str = None,
+    context=None,
 ) -> dict:
     """Store PR URL in middle server.
 
@@ -382,15 +442,8 @@ def _store_pr_remotely(
         # Add uuid to the payload (different field name based on node type)
         if not uuid and task_id and round_number is not None:
             try:
-                db = get_db()
-                submission = (
-                    db.query(Submission)
-                    .filter(
-                        Submission.task_id == task_id,
-                        Submission.round_number == round_number,
-                    )
-                    .first()
-                )
+                context = context or TaskContext(task_id, round_number)
+                submission = context.get_submission()
                 if submission and submission.uuid:
                     uuid = submission.uuid
                     logger.info(f"Retrieved uuid={uuid} from database")
@@ -414,18 +467,14 @@ def _store_pr_remotely(
             logger.info(f"Including GitHub username in payload: {github_username}")
 
         logger.info(f"Sending payload to {endpoint}: {payload}")
-        response = requests.post(
-            os.environ["MIDDLE_SERVER_URL"] + endpoint,
-            json=payload,
-            headers={"Content-Type": "application/json"},
-        )
+        response = middle_server.post(endpoint, json=payload)
         response.raise_for_status()
         return {
             "success": True,
             "data": {"message": "PR recorded remotely", "pr_url": pr_url},
         }
     except requests.exceptions.RequestException as e:
-        if not hasattr(e, "response"):
+        if not hasattr(e, "response") or e.response is None:
             return {
                 "success": False,
                 "status": 500,
@@ -445,21 +494,16 @@ def _store_pr_locally(
     uuid: str = None,
     node_type: str = "worker",
     github_username: str = None,
+    context=None,
 ) -> dict:
     """Store PR URL in local database."""
     try:
-        db = get_db()
+        context = context or TaskContext(task_id, round_number)
+        db = context.db
         username = os.environ["GITHUB_USERNAME"]
 
         # Update submission status
-        submission = (
-            db.query(Submission)
-            .filter(
-                Submission.round_number == round_number,
-                Submission.task_id == task_id,
-            )
-            .first()
-        )
+        submission = context.get_submission()
         if submission:
             submission.status = "completed"
             if not submission.pr_url:  # Only update PR URL if not already set
@@ -501,6 +545,7 @@ def record_pr(
     round_number,
     task_id,
     node_type="worker",
+    context=None,
 ):
     """Record PR URL both remotely and locally.
 
@@ -512,9 +557,12 @@ def record_pr(
         round_number: Round number
         task_id: Task ID
         node_type: Type of node ("worker" or "leader") to determine which endpoint to use
+        context: TaskContext of the job, if the PR was created in the same job
     """
+    context = context or TaskContext(task_id, round_number)
+
     # First check if we already have a record locally
-    existing = _check_existing_pr(round_number, task_id)
+    existing = _check_existing_pr(round_number, task_id, context)
     existing_pr_url = None
     if existing["success"]:
         # Even if we have a local record, still attempt to record remotely
@@ -529,15 +577,7 @@ def record_pr(
     uuid = None
     # First, try to get UUID from the database
     try:
-        db = get_db()
-        submission = (
-            db.query(Submission)
-            .filter(
-                Submission.round_number == round_number,
-                Submission.task_id == task_id,
-            )
-            .first()
-        )
+        submission = context.get_submission()
         if submission and submission.uuid:
             uuid = submission.uuid
             logger.info(f"Found uuid={uuid} in database")
@@ -547,7 +587,7 @@ def record_pr(
     # If we couldn't find the UUID in the database and this is a leader task, try getting it from task details
     if not uuid and node_type == "leader":
         # Get task details to retrieve uuid
-        task_details = get_task_details(
+        task_details = context.get_task_details(
             staking_signature, staking_key, pub_key, "leader"
         )
         if task_details.get("success", False) and "data" in task_details:
@@ -558,7 +598,7 @@ def record_pr(
     # If we're processing a worker task and couldn't find the UUID, try to get it from task details
     if not uuid and node_type == "worker":
         # Get task details to retrieve uuid
-        task_details = get_task_details(
+        task_details = context.get_task_details(
             staking_signature, staking_key, pub_key, "worker"
         )
         if task_details.get("success", False) and "data" in task_details:
@@ -576,13 +616,17 @@ def record_pr(
         uuid,
         task_id,
         round_number,
+        context=context,
     )
     if not remote_result["success"]:
         # If the error is because the PR is already recorded, treat it as a success
         if "already" in str(remote_result.get("error", "")).lower():
             logger.info("PR already recorded remotely, continuing")
         else:
-            # For other errors, return the error
+            # For other errors, leave the PR for the reconciler to record
+            _mark_pending_record(
+                context, pr_url, staking_key, staking_signature, pub_key, node_type
+            )
             return remote_result
 
     # Step 2: Record locally if not already recorded
@@ -592,28 +636,22 @@ def record_pr(
         # But we should update the uuid and node_type if we have new information
         if existing_pr_url and (uuid or node_type):
             try:
-                db = get_db()
-                submission = (
-                    db.query(Submission)
-                    .filter(
-                        Submission.round_number == round_number,
-                        Submission.task_id == task_id,
-                    )
-                    .first()
-                )
+                submission = context.get_submission()
                 if submission:
                     if uuid and not submission.uuid:
                         submission.uuid = uuid
                     if node_type:
                         submission.node_type = node_type
-                    db.commit()
+                    context.db.commit()
                     logger.info(
                         f"Updated submission with uuid={uuid}, node_type={node_type}"
                     )
             except Exception as e:
                 logger.warning(f"Failed to update existing submission: {str(e)}")
     else:
-        local_result = _store_pr_locally(round_number, pr_url, task_id, uuid, node_type)
+        local_result = _store_pr_locally(
+            round_number, pr_url, task_id, uuid, node_type, context=context
+        )
         if not local_result["success"]:
             return local_result
 
@@ -623,21 +661,45 @@ def record_pr(
     }
 
 
+def _mark_pending_record(
+    context, pr_url, staking_key, staking_signature, pub_key, node_type
+):
+    """Keep a PR that failed to record remotely, with what is needed to retry it."""
+    try:
+        submission = context.get_submission()
+        if not submission or submission.status == "completed":
+            return
+        submission.status = "pending_record"
+        submission.pr_url = submission.pr_url or pr_url
+        submission.node_type = node_type
+        submission.staking_key = staking_key
+        submission.pub_key = pub_key
+        submission.pr_signature = staking_signature
+        context.db.commit()
+        logger.info(
+            f"Marked task {context.task_id}, round {context.round_number} "
+            "as pending_record for the reconciler"
+        )
+    except Exception as e:
+        logger.warning(f"Failed to mark submission as pending_record: {str(e)}")
+
+
 def consolidate_prs(
-    task_id, round_number, staking_key, pub_key, staking_signature, public_signature
+    task_id,
+    round_number,
+    staking_key,
+    pub_key,
+    staking_signature,
+    public_signature,
+    context=None,
 ):
     """Consolidate PRs from workers."""
+    context = context or TaskContext(task_id, round_number)
     try:
-        db = get_db()
+        db = context.db
 
         # Check if we already have a PR URL for this submission
-        existing_submission = (
-            db.query(Submission)
-            .filter(
-                Submission.task_id == task_id, Submission.round_number == round_number
-            )
-            .first()
-        )
+        existing_submission = context.get_submission()
 
         # If we have an existing PR, we'll use it
         pr_url = None
@@ -649,7 +711,7 @@ def consolidate_prs(
             # We'll use the existing PR URL
         else:
             # Get task details which includes issue_uuid
-            issue_result = get_task_details(
+            issue_result = context.get_task_details(
                 staking_signature, staking_key, pub_key, "leader"
             )
 
@@ -671,6 +733,7 @@ def consolidate_prs(
             if existing_submission:
                 db.delete(existing_submission)
                 db.commit()
+                context.set_submission(None)
                 logger.info(
                     f"Deleted existing incomplete submission for task {task_id}, round {round_number}"
                 )
@@ -687,13 +750,13 @@ def consolidate_prs(
             )
             db.add(submission)
             db.commit()
+            context.set_submission(submission)
             logger.info(
                 f"Created new submission with uuid={issue_uuid}, node_type=leader"
             )
 
             # Get source fork
-            github = Github(os.environ["GITHUB_TOKEN"])
-            source_fork = github.get_repo(f"{repo_owner}/{repo_name}")
+            source_fork = get_repo(f"{repo_owner}/{repo_name}")
 
             # Verify this is a fork
             if not source_fork.fork:
@@ -750,14 +813,7 @@ def consolidate_prs(
         log_error(e, context="PR consolidation failed")
         if "db" in locals():
             # Update submission status
-            submission = (
-                db.query(Submission)
-                .filter(
-                    Submission.task_id == task_id,
-                    Submission.round_number == round_number,
-                )
-                .first()
-            )
+            submission = context.get_submission()
             if submission:
                 submission.status = "failed"
                 db.commit()
@@ -781,8 +837,6 @@ def create_aggregator_repo(task_id):
             - status (int): HTTP status code
     """
     try:
-        # Initialize GitHub client with token
-        github = Github(os.environ["GITHUB_TOKEN"])
         username = os.environ["GITHUB_USERNAME"]
 
         # Get issue UUID and repo info from assign_issue response
@@ -819,7 +873,7 @@ def create_aggregator_repo(task_id):
 
         # Get source repo from the repo information obtained from the middle server
         try:
-            source_repo = github.get_repo(f"{repo_owner}/{repo_name}")
+            source_repo = get_repo(f"{repo_owner}/{repo_name}")
             logger.info(f"Found source repo: {source_repo.html_url}")
         except Exception as e:
             logger.error(
@@ -834,11 +888,11 @@ def create_aggregator_repo(task_id):
 
         # Check if fork already exists
         try:
-            fork = github.get_repo(f"{username}/{repo_name}")
+            fork = get_repo(f"{username}/{repo_name}")
             logger.info(f"Using existing fork: {fork.html_url}")
         except Exception:
             # Create new fork if it doesn't exist
-            fork = github.get_user().create_fork(source_repo)
+            fork = get_user().create_fork(source_repo)
             logger.info(f"Created new fork: {fork.html_url}")
 
         branch_name = issue_uuid
@@ -938,10 +992,9 @@ def assign_issue(task_id):
             f"Request payload: {{'taskId': {task_id}, 'githubUsername': {os.environ['GITHUB_USERNAME']}}}"
         )
 
-        response = requests.post(
-            os.environ["MIDDLE_SERVER_URL"] + "/api/builder/assign-issue",
+        response = middle_server.post(
+            "/api/builder/assign-issue",
             json={"taskId": task_id, "githubUsername": os.environ["GITHUB_USERNAME"]},
-            headers={"Content-Type": "application/json"},
         )
         logger.info(f"Response status code: {response.status_code}")
         logger.info(f"Response headers: {response.headers}")
@@ -1009,11 +1062,7 @@ def add_aggregator_info(task_id, staking_key, pub_key, signature):
         }
 
         # Send the request to the middle server
-        response = requests.post(
-            os.environ["MIDDLE_SERVER_URL"] + "/api/builder/add-aggregator-info",
-            json=payload,
-            headers={"Content-Type": "application/json"},
-        )
+        response = middle_server.post("/api/builder/add-aggregator-info", json=payload)
         response.raise_for_status()
         result = response.json()
 
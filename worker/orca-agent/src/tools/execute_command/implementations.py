@@ -1,12 +1,13 @@
 import subprocess
 import os
 from src.types import ToolOutput
+from src.tools.file_operations import file_index
 
 
-def execute_command(command: str, **kwargs) -> ToolOutput:
-    """Execute a shell command in the current working directory."""
+def execute_command(command: str, repo_path: str = None, **kwargs) -> ToolOutput:
+    """Execute a shell command in the workspace (repo_path or the current directory)."""
     try:
-        cwd = os.getcwd()
+        cwd = repo_path or os.getcwd()
         print(f"Executing command in {cwd}: {command}")
 
         result = subprocess.run(
@@ -17,6 +18,8 @@ def execute_command(command: str, **kwargs) -> ToolOutput:
             text=True,
             timeout=300,  # Add a 5-minute timeout to prevent hanging
         )
+        # Commands can create or remove any file
+        file_index.invalidate(cwd)
 
         # For command execution, success means the command was executed without exceptions
         # The return code is provided separately and can be interpreted by the caller
@@ -35,6 +38,7 @@ def execute_command(command: str, **kwargs) -> ToolOutput:
             },
         }
     except subprocess.TimeoutExpired as e:
+        file_index.invalidate(cwd)
         return {
             "success": False,
             "message": f"Command timed out after 300 seconds: {str(e)}",
@@ -58,7 +62,10 @@ def execute_command(command: str, **kwargs) -> ToolOutput:
 
 
 def run_tests(
-    path: str, framework: str, **kwargs  # Default but can be overridden
+    path: str,
+    framework: str,
+    repo_path: str = None,
+    **kwargs,  # Default but can be overridden
 ) -> ToolOutput:
     """Run tests using the specified framework and command.
 
@@ -82,7 +89,7 @@ def run_tests(
             "data": None,
         }
 
-    result = execute_command(command)
+    result = execute_command(command, repo_path=repo_path)
 
     # Check if the command execution failed (not the tests)
     if not result["success"]:
@@ -144,6 +151,7 @@ def install_dependency(
     package_manager: str,
     is_dev_dependency: bool = False,
     version: str = None,
+    repo_path: str = None,
     **kwargs,
 ) -> ToolOutput:
     """Install a dependency using the specified package manager.
@@ -196,7 +204,7 @@ def install_dependency(
     dep_type = "dev" if is_dev_dependency else "prod"
     command = commands[package_manager][dep_type]
 
-    result = execute_command(command)
+    result = execute_command(command, repo_path=repo_path)
 
     # Check if the command execution failed
     if not result["success"]:
@@ -261,7 +269,8 @@ def setup_dependencies(
                 }
 
             result = execute_command(
-                f"pip install --no-cache-dir -r {requirements_path}"
+                f"pip install --no-cache-dir -r {requirements_path}",
+                repo_path=working_dir,
             )
         elif package_manager == "npm":
             package_json_path = os.path.join(working_dir, "package.json")
@@ -272,7 +281,8 @@ def setup_dependencies(
                     "data": None,
                 }
             result = execute_command(
-                f"npm install --no-fund --no-audit -r {requirements_path}"
+                f"npm install --no-fund --no-audit -r {requirements_path}",
+                repo_path=working_dir,
             )
         elif package_manager == "yarn":
             package_json_path = os.path.join(working_dir, "package.json")
@@ -283,7 +293,8 @@ def setup_dependencies(
                     "data": None,
                 }
             result = execute_command(
-                f"yarn add --non-interactive -r {requirements_path}"
+                f"yarn add --non-interactive -r {requirements_path}",
+                repo_path=working_dir,
             )
         elif package_manager == "pnpm":
             package_json_path = os.path.join(working_dir, "package.json")
@@ -293,7 +304,9 @@ def setup_dependencies(
                     "message": "package.json not found",
                     "data": None,
                 }
-            result = execute_command(f"pnpm add --no-fund -r {requirements_path}")
+            result = execute_command(
+                f"pnpm add --no-fund -r {requirements_path}", repo_path=working_dir
+            )
 
         success = result["data"]["command_succeeded"]
         stdout = result["data"]["stdout"]
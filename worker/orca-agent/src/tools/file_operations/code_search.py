@@ -0,0 +1,301 @@
+"""Trigram index for searching the contents of a workspace checkout.
+
+Every file is indexed by the set of three-byte sequences (trigrams) of its
+lowercased contents. A query is answered by intersecting the posting lists of
+the trigrams of the literal text it requires, then matching only the candidate
+files line by line. The index is built on first search and then updated from
+the file tools' change notifications: changed paths are reindexed, and after
+commands or git operations, which may change any file, files are rechecked by
+size and modification time.
+"""
+
+import os
+import re
+import threading
+from array import array
+from fnmatch import fnmatch
+from typing import Dict, List, Optional, Tuple
+
+from src.tools.file_operations import file_index
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Larger files are not indexed or searched
+MAX_FILE_BYTES = int(os.getenv("CODE_SEARCH_MAX_FILE_BYTES", "500000"))
+# Matches collected before ranking, to bound the work of very common queries
+MAX_SCANNED_MATCHES = int(os.getenv("CODE_SEARCH_MAX_SCANNED_MATCHES", "2000"))
+MAX_SNIPPET_CHARS = 200
+
+# Lines that define something, ranked above other matches
+_DEFINITION = re.compile(
+    r"^\s*(export\s+)?(default\s+)?(async\s+)?"
+    r"(def|class|function|interface|type|enum|struct|func|fn|const|let|var)\b"
+)
+
+_lock = threading.Lock()
+# Resolved workspace root -> index
+_indexes: Dict[str, dict] = {}
+
+
+def _new_index() -> dict:
+    return {
+        "lock": threading.Lock(),
+        "ids": {},  # path -> file id
+        "paths": [],  # file id -> path, None once the file is removed
+        "stamps": {},  # path -> (size, mtime_ns)
+        "postings": {},  # trigram -> array of file ids
+        "removed": 0,
+        # Paths changed by the tools, and whether any file may have changed
+        "dirty": set(),
+        "stale": False,
+    }
+
+
+def _on_change(key: Optional[str], paths: Optional[List[str]]):
+    with _lock:
+        indexes = list(_indexes.values()) if key is None else [_indexes.get(key)]
+    for index in indexes:
+        if index is None:
+            continue
+        with index["lock"]:
+            if paths is None:
+                index["stale"] = True
+            else:
+                index["dirty"].update(p.rstrip("/") for p in paths)
+
+
+file_index.add_change_listener(_on_change)
+
+
+def _stamp(full_path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _trigrams(content: bytes) -> set:
+    content = content.lower()
+    return {content[i : i + 3] for i in range(len(content) - 2)}
+
+
+def _remove(index: dict, path: str):
+    file_id = index["ids"].pop(path, None)
+    if file_id is not None:
+        index["paths"][file_id] = None
+        index["stamps"].pop(path, None)
+        index["removed"] += 1
+
+
+def _add(index: dict, root: str, path: str):
+    """Index the file at path, replacing its earlier version."""
+    _remove(index, path)
+    full_path = os.path.join(root, path)
+    stamp = _stamp(full_path)
+    if stamp is None or not os.path.isfile(full_path):
+        return
+    file_id = len(index["paths"])
+    index["paths"].append(path)
+    index["ids"][path] = file_id
+    index["stamps"][path] = stamp
+    if stamp[0] > MAX_FILE_BYTES:
+        return
+    try:
+        with open(full_path, "rb") as f:
+            content = f.read()
+    except OSError:
+        return
+    # Binary files are listed but have no trigrams, so they never match
+    if b"\0" in content[:8000]:
+        return
+    postings = index["postings"]
+    for trigram in _trigrams(content):
+        ids = postings.get(trigram)
+        if ids is None:
+            postings[trigram] = array("I", (file_id,))
+        else:
+            ids.append(file_id)
+
+
+def _rebuild(index: dict, root: str, files: List[str]):
+    fresh = _new_index()
+    for field in ("ids", "paths", "stamps", "postings", "removed", "dirty", "stale"):
+        index[field] = fresh[field]
+    for path in files:
+        _add(index, root, path)
+
+
+def _refresh(index: dict, root: str, files: List[str]):
+    """Bring the index up to date with the listed files. Caller holds its lock."""
+    # Compact once most postings point at removed files
+    if not index["paths"] or index["removed"] > max(1000, len(index["ids"])):
+        _rebuild(index, root, files)
+        return
+
+    listed = set(files)
+    for path in [p for p in index["ids"] if p not in listed]:
+        _remove(index, path)
+    changed = [p for p in files if p not in index["ids"]]
+    if index["stale"]:
+        changed += [
+            p
+            for p, stamp in index["stamps"].items()
+            if _stamp(os.path.join(root, p)) != stamp
+        ]
+    for dirty in index["dirty"]:
+        prefix = dirty + "/"
+        changed += [p for p in index["ids"] if p == dirty or p.startswith(prefix)]
+        changed += [p for p in (dirty,) if p in listed]
+    for path in set(changed):
+        _add(index, root, path)
+    index["dirty"].clear()
+    index["stale"] = False
+
+
+def _required_literals(pattern: str, flags: int) -> List[str]:
+    """Literal strings every match of a regex must contain."""
+    literals = []
+
+    def walk(parsed):
+        run = []
+        for op, value in parsed:
+            name = str(op)
+            if name == "LITERAL":
+                run.append(chr(value))
+                continue
+            if run:
+                literals.append("".join(run))
+                run = []
+            if name == "SUBPATTERN":
+                walk(value[-1])
+            elif name in ("MAX_REPEAT", "MIN_REPEAT") and value[0] >= 1:
+                walk(value[2])
+        if run:
+            literals.append("".join(run))
+
+    walk(sre_parse.parse(pattern, flags))
+    return literals
+
+
+def _candidates(index: dict, literals: List[str]) -> List[str]:
+    """Paths of the indexed files that contain every literal. Caller holds its lock."""
+    trigrams = set()
+    for literal in literals:
+        trigrams |= _trigrams(literal.encode("utf-8"))
+    if not trigrams:
+        return [p for p in index["paths"] if p is not None]
+
+    postings = [index["postings"].get(trigram) for trigram in trigrams]
+    if any(ids is None for ids in postings):
+        return []
+    postings.sort(key=len)
+    ids = set(postings[0])
+    for other in postings[1:]:
+        ids.intersection_update(other)
+        if not ids:
+            return []
+    paths = index["paths"]
+    return sorted(paths[i] for i in ids if paths[i] is not None)
+
+
+def _snippet(line: str, start: int) -> str:
+    start -= len(line) - len(line.lstrip())
+    line = line.strip()
+    if len(line) <= MAX_SNIPPET_CHARS:
+        return line
+    offset = max(0, min(start - MAX_SNIPPET_CHARS // 4, len(line) - MAX_SNIPPET_CHARS))
+    return line[offset : offset + MAX_SNIPPET_CHARS]
+
+
+def in_scope(path: str, scope: Optional[str]) -> bool:
+    """Whether a path is under a directory, or matches a glob. No scope matches all."""
+    if not scope:
+        return True
+    if any(c in scope for c in "*?["):
+        return fnmatch(path, scope)
+    scope = scope.strip("/")
+    return path == scope or path.startswith(scope + "/")
+
+
+def search(
+    root,
+    files: List[str],
+    query: str,
+    regex: bool = False,
+    case_sensitive: bool = False,
+    path: Optional[str] = None,
+    max_results: int = 50,
+) -> dict:
+    """Search the contents of a checkout's files.
+
+    Args:
+        root: Root of the checkout
+        files: The checkout's files, relative to root
+        query: Text or regular expression to find
+        regex: Whether query is a regular expression
+        case_sensitive: Whether matching is case sensitive
+        path: Only search files under this directory, or matching this glob
+        max_results: Most matches returned
+
+    Returns:
+        dict: "matches" of {"file", "line", "snippet"}, best first,
+            "total_matches", "files_searched" and "truncated"
+
+    Raises:
+        re.error: If query is not a valid regular expression
+    """
+    flags = 0 if case_sensitive else re.IGNORECASE
+    pattern = re.compile(query if regex else re.escape(query), flags)
+    literals = _required_literals(query, flags) if regex else [query]
+    if not case_sensitive:
+        # The index only lowercases ASCII, so other letters can match any case
+        literals = [literal for literal in literals if literal.isascii()]
+
+    key = str(os.path.realpath(root))
+    with _lock:
+        index = _indexes.setdefault(key, _new_index())
+    with index["lock"]:
+        _refresh(index, key, files)
+        candidates = [p for p in _candidates(index, literals) if in_scope(p, path)]
+
+    matches = []
+    for candidate in candidates:
+        try:
+            with open(os.path.join(key, candidate), errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            continue
+        for number, line in enumerate(lines, 1):
+            match = pattern.search(line)
+            if match is None:
+                continue
+            score = 2 if _DEFINITION.match(line) else 0
+            if "test" not in candidate.lower():
+                score += 1
+            matches.append((-score, candidate, number, _snippet(line, match.start())))
+        if len(matches) >= MAX_SCANNED_MATCHES:
+            break
+
+    matches.sort()
+    return {
+        "matches": [
+            {"file": file, "line": line, "snippet": snippet}
+            for _, file, line, snippet in matches[:max_results]
+        ],
+        "total_matches": len(matches),
+        "files_searched": len(candidates),
+        "truncated": len(matches) > max_results or len(matches) >= MAX_SCANNED_MATCHES,
+    }
+
+
+def forget(root=None):
+    """Drop a checkout's search index, or every index if root is None."""
+    with _lock:
+        if root is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(str(os.path.realpath(root)), None)
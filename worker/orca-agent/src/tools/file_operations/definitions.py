@@ -7,6 +7,9 @@ from src.tools.file_operations.implementations import (
     delete_file,
     list_files,
     create_directory,
+    search_code,
+    find_symbol,
+    find_references,
 )
 
 DEFINITIONS = {
@@ -154,4 +157,107 @@ DEFINITIONS = {
         },
         "function": list_files,
     },
+    "search_code": {
+        "name": "search_code",
+        "description": (
+            "Search the contents of the repository's files for text or a regular "
+            "expression, line by line. Returns the best matches as file, line and "
+            "snippet, with definitions first. Prefer this to reading whole files "
+            "or running grep."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Text or regular expression to find",
+                },
+                "regex": {
+                    "type": "boolean",
+                    "description": "Whether query is a regular expression",
+                },
+                "case_sensitive": {
+                    "type": "boolean",
+                    "description": "Whether matching is case sensitive",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Only search under this directory, or files matching this glob",
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Most matches to return (default 50, at most 200)",
+                },
+            },
+            "required": ["query"],
+        },
+        "function": search_code,
+    },
+    "find_symbol": {
+        "name": "find_symbol",
+        "description": (
+            "Find where a Python, JavaScript or TypeScript class, function, method, "
+            "variable or type is defined. Returns file, line, kind and the "
+            "definition line."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Symbol name, optionally qualified by its class, e.g. Client.send",
+                },
+                "kind": {
+                    "type": "string",
+                    "enum": [
+                        "class",
+                        "function",
+                        "method",
+                        "variable",
+                        "interface",
+                        "type",
+                        "enum",
+                    ],
+                    "description": "Only return definitions of this kind",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Only search under this directory, or files matching this glob",
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Most definitions to return (default 20, at most 100)",
+                },
+            },
+            "required": ["name"],
+        },
+        "function": find_symbol,
+    },
+    "find_references": {
+        "name": "find_references",
+        "description": (
+            "Find where a Python, JavaScript or TypeScript symbol is imported and "
+            "used, e.g. the callers of a function. Returns file, line, kind "
+            "(import, definition or reference) and the source line."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "name": {
+                    "type": "string",
+                    "description": "Symbol name",
+                },
+                "path": {
+                    "type": "string",
+                    "description": "Only search under this directory, or files matching this glob",
+                },
+                "max_results": {
+                    "type": "integer",
+                    "description": "Most references to return (default 50, at most 200)",
+                },
+            },
+            "required": ["name"],
+        },
+        "function": find_references,
+    },
 }
@@ -0,0 +1,245 @@
+"""Cached index of the files in a workspace checkout.
+
+Listing a checkout with git takes two ``git ls-files`` calls. The index runs
+them once per checkout, then the file tools keep it up to date as they write,
+copy, move and delete files. Git operations run outside the tools (checkout,
+merge, pull, commit, ...) rewrite the git index or HEAD, which invalidates the
+cached listing so it is rebuilt on next use.
+
+Other per-checkout indexes (code search, symbols) register a change listener to
+be told which paths the tools changed, or that anything may have changed.
+"""
+
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
+from git import Repo
+
+_lock = threading.Lock()
+# Resolved workspace root -> index
+_indexes: Dict[str, dict] = {}
+# Resolved workspace root -> paths read with read_file, while reads are tracked
+_reads: Dict[str, Set[str]] = {}
+# Called with (root, paths) after files change; paths is None if any file may
+# have changed, root is None for every checkout
+_listeners: List[Callable[[Optional[str], Optional[List[str]]], None]] = []
+
+
+def _key(root) -> str:
+    return str(Path(root).resolve())
+
+
+def _git_stamp(git_dir: Path) -> tuple:
+    """Fingerprint the git state that changes whenever git touches the worktree."""
+    paths = [git_dir / "index", git_dir / "HEAD"]
+    try:
+        head = (git_dir / "HEAD").read_text().strip()
+        if head.startswith("ref: "):
+            paths.append(git_dir / head[5:])
+    except OSError:
+        pass
+    stamp = []
+    for path in paths:
+        try:
+            stamp.append(path.stat().st_mtime_ns)
+        except OSError:
+            stamp.append(None)
+    return tuple(stamp)
+
+
+def _build(root: str) -> dict:
+    repo = Repo(root)
+    tracked = repo.git.ls_files().splitlines()
+    untracked = repo.git.ls_files("--others", "--exclude-standard").splitlines()
+    git_dir = Path(repo.git_dir)
+    return {
+        "files": {f for f in tracked + untracked if not f.startswith(".git/")},
+        "sorted": None,
+        # Files added by the tools that may match .gitignore
+        "unchecked": set(),
+        "git_dir": git_dir,
+        "stamp": _git_stamp(git_dir),
+    }
+
+
+def _drop_ignored(root: str, index: dict):
+    paths = sorted(index["unchecked"] & index["files"])
+    index["unchecked"] = set()
+    if not paths:
+        return
+    result = subprocess.run(
+        ["git", "check-ignore", "--stdin"],
+        cwd=root,
+        input="\n".join(paths),
+        capture_output=True,
+        text=True,
+    )
+    # Exit code 1 means none of the paths are ignored
+    if result.returncode == 0:
+        index["files"] -= set(result.stdout.splitlines())
+        index["sorted"] = None
+
+
+def add_change_listener(listener: Callable[[Optional[str], Optional[List[str]]], None]):
+    """Register a function called with (root, paths) after files change.
+
+    root is the resolved checkout root, or None for every checkout. paths are
+    the changed files or directories relative to root, or None if any file may
+    have changed. Listeners run on the tool's thread and must be quick.
+    """
+    _listeners.append(listener)
+
+
+def _notify(key: Optional[str], paths: Optional[List[str]]):
+    for listener in _listeners:
+        listener(key, paths)
+
+
+def list_indexed_files(root) -> List[str]:
+    """List the files of a git checkout, respecting .gitignore.
+
+    Args:
+        root: Root of the checkout
+
+    Returns:
+        List[str]: Sorted paths relative to root
+
+    Raises:
+        git.exc.InvalidGitRepositoryError: If root is not the root of a checkout
+    """
+    key = _key(root)
+    with _lock:
+        index = _indexes.get(key)
+        stale = index is not None and index["stamp"] != _git_stamp(index["git_dir"])
+        if index is None or stale:
+            index = _build(key)
+            _indexes[key] = index
+        if index["unchecked"]:
+            _drop_ignored(key, index)
+        if index["sorted"] is None:
+            index["sorted"] = sorted(index["files"])
+        files = list(index["sorted"])
+    if stale:
+        # Git changed the worktree behind the tools' back
+        _notify(key, None)
+    return files
+
+
+def _relative(path: str) -> Optional[str]:
+    """Normalize a tool path the way git lists it, or None if it leaves the root."""
+    path = os.path.normpath(path).replace(os.sep, "/")
+    if os.path.isabs(path) or path == "." or path == ".." or path.startswith("../"):
+        return None
+    return path
+
+
+def _get(root) -> Optional[dict]:
+    """Get a checkout's index if it is cached. Caller holds the lock."""
+    return _indexes.get(_key(root)) if root else None
+
+
+def _add(index: dict, path: str):
+    if Path(path).name == ".gitignore":
+        # Which files are ignored may have changed, rebuild on next use
+        index["stamp"] = None
+        return
+    if path not in index["files"]:
+        index["files"].add(path)
+        index["unchecked"].add(path)
+        index["sorted"] = None
+
+
+def _matching(index: dict, path: str) -> List[str]:
+    """Indexed files at path, or under it if path is a directory."""
+    prefix = path.rstrip("/") + "/"
+    return [f for f in index["files"] if f == path or f.startswith(prefix)]
+
+
+def record_write(root, path: str):
+    """Record that a file was written or copied to path."""
+    path = _relative(path)
+    if path is None:
+        return
+    with _lock:
+        index = _get(root)
+        if index is not None:
+            _add(index, path)
+    if root:
+        _notify(_key(root), [path])
+
+
+def record_delete(root, path: str):
+    """Record that the file or directory at path was deleted."""
+    path = _relative(path)
+    if path is None:
+        # e.g. the root itself, rebuild on next use
+        if root:
+            invalidate(root)
+        return
+    with _lock:
+        index = _get(root)
+        if index is not None:
+            for existing in _matching(index, path):
+                index["files"].discard(existing)
+            index["sorted"] = None
+            if Path(path).name == ".gitignore":
+                index["stamp"] = None
+    if root:
+        _notify(_key(root), [path])
+
+
+def record_move(root, source: str, destination: str):
+    """Record that the file or directory at source was moved to destination."""
+    source, destination = _relative(source), _relative(destination)
+    if source is None or destination is None:
+        # The index can't follow moves into, out of or of the root, rebuild it
+        if root:
+            invalidate(root)
+        return
+    with _lock:
+        index = _get(root)
+        if index is not None:
+            for existing in _matching(index, source):
+                index["files"].discard(existing)
+                _add(index, destination + existing[len(source) :])
+            index["sorted"] = None
+            if Path(source).name == ".gitignore":
+                index["stamp"] = None
+    if root:
+        _notify(_key(root), [source, destination])
+
+
+def invalidate(root=None):
+    """Forget a checkout's index, or every index if root is None."""
+    key = None if root is None else _key(root)
+    with _lock:
+        if key is None:
+            _indexes.clear()
+        else:
+            _indexes.pop(key, None)
+    _notify(key, None)
+
+
+def track_reads(root):
+    """Start recording the files read in a checkout, forgetting earlier reads."""
+    with _lock:
+        _reads[_key(root)] = set()
+
+
+def record_read(root, path: str):
+    """Record that the file at path was read, if reads are tracked."""
+    path = _relative(path)
+    if path is None:
+        return
+    with _lock:
+        reads = _reads.get(_key(root)) if root else None
+        if reads is not None:
+            reads.add(path)
+
+
+def stop_tracking_reads(root) -> Set[str]:
+    """Stop recording reads in a checkout and get the paths read since tracking started."""
+    with _lock:
+        return _reads.pop(_key(root), set())
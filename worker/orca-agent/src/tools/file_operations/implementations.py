@@ -1,10 +1,11 @@
 """Module for file operations."""
 
 import os
+import re
 import shutil
 from pathlib import Path
 from src.tools.git_operations.implementations import commit_and_push
-from git import Repo
+from src.tools.file_operations import code_search, file_index, symbol_index
 from src.types import ToolOutput
 
 
@@ -13,7 +14,16 @@ def _normalize_path(path: str) -> str:
     return path.lstrip("/")
 
 
-def read_file(file_path: str, **kwargs) -> ToolOutput:
+def _workspace_root(repo_path: str = None) -> Path:
+    """Get the workspace root tool paths are relative to.
+
+    Workflows pass their clone as repo_path; the working directory is only a
+    fallback for callers outside a workflow.
+    """
+    return Path(repo_path or os.getcwd())
+
+
+def read_file(file_path: str, repo_path: str = None, **kwargs) -> ToolOutput:
     """
     Read the contents of a file.
 
@@ -28,9 +38,10 @@ def read_file(file_path: str, **kwargs) -> ToolOutput:
     """
     try:
         file_path = _normalize_path(file_path)
-        full_path = Path(os.getcwd()) / file_path
+        full_path = _workspace_root(repo_path) / file_path
         with open(full_path, "r") as f:
             content = f.read()
+            file_index.record_read(repo_path, file_path)
             return {
                 "success": True,
                 "message": f"Successfully read file {file_path}",
@@ -51,20 +62,25 @@ def read_file(file_path: str, **kwargs) -> ToolOutput:
 
 
 def write_file(
-    file_path: str, content: str, commit_message: str = None, **kwargs
+    file_path: str,
+    content: str,
+    commit_message: str = None,
+    repo_path: str = None,
+    **kwargs,
 ) -> ToolOutput:
     """Write file with directory creation and optional commit"""
     try:
         file_path = _normalize_path(file_path)
-        full_path = Path(os.getcwd()) / file_path
+        full_path = _workspace_root(repo_path) / file_path
         full_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(full_path, "w") as f:
             f.write(content)
+        file_index.record_write(_workspace_root(repo_path), file_path)
 
         # If commit message provided, commit and push changes
         if commit_message:
-            commit_result = commit_and_push(commit_message)
+            commit_result = commit_and_push(commit_message, repo_path=repo_path)
             if not commit_result["success"]:
                 return commit_result
 
@@ -82,14 +98,18 @@ def write_file(
 
 
 def copy_file(
-    source: str, destination: str, commit_message: str = None, **kwargs
+    source: str,
+    destination: str,
+    commit_message: str = None,
+    repo_path: str = None,
+    **kwargs,
 ) -> ToolOutput:
     """Copy a file and optionally commit the change."""
     try:
         source = _normalize_path(source)
         destination = _normalize_path(destination)
-        source_path = Path(os.getcwd()) / source
-        dest_path = Path(os.getcwd()) / destination
+        source_path = _workspace_root(repo_path) / source
+        dest_path = _workspace_root(repo_path) / destination
 
         if not source_path.exists():
             return {
@@ -101,11 +121,15 @@ def copy_file(
         # Create destination directory if it doesn't exist
         dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-        shutil.copy2(source_path, dest_path)
+        copied = shutil.copy2(source_path, dest_path)
+        file_index.record_write(
+            _workspace_root(repo_path),
+            os.path.relpath(copied, _workspace_root(repo_path)),
+        )
 
         # If commit message provided, commit and push changes
         if commit_message:
-            commit_result = commit_and_push(commit_message)
+            commit_result = commit_and_push(commit_message, repo_path=repo_path)
             if not commit_result["success"]:
                 return commit_result
 
@@ -123,14 +147,18 @@ def copy_file(
 
 
 def move_file(
-    source: str, destination: str, commit_message: str = None, **kwargs
+    source: str,
+    destination: str,
+    commit_message: str = None,
+    repo_path: str = None,
+    **kwargs,
 ) -> ToolOutput:
     """Move a file and optionally commit the change."""
     try:
         source = _normalize_path(source)
         destination = _normalize_path(destination)
-        source_path = Path(os.getcwd()) / source
-        dest_path = Path(os.getcwd()) / destination
+        source_path = _workspace_root(repo_path) / source
+        dest_path = _workspace_root(repo_path) / destination
 
         if not source_path.exists():
             return {
@@ -142,11 +170,16 @@ def move_file(
         # Create destination directory if it doesn't exist
         dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-        shutil.move(str(source_path), str(dest_path))
+        moved = shutil.move(str(source_path), str(dest_path))
+        file_index.record_move(
+            _workspace_root(repo_path),
+            source,
+            os.path.relpath(moved, _workspace_root(repo_path)),
+        )
 
         # If commit message provided, commit and push changes
         if commit_message:
-            commit_result = commit_and_push(commit_message)
+            commit_result = commit_and_push(commit_message, repo_path=repo_path)
             if not commit_result["success"]:
                 return commit_result
 
@@ -164,14 +197,18 @@ def move_file(
 
 
 def rename_file(
-    source: str, destination: str, commit_message: str = None
+    source: str,
+    destination: str,
+    commit_message: str = None,
+    repo_path: str = None,
+    **kwargs,
 ) -> ToolOutput:
     """Rename a file and optionally commit the change."""
     try:
         source = _normalize_path(source)
         destination = _normalize_path(destination)
-        source_path = Path(os.getcwd()) / source
-        dest_path = Path(os.getcwd()) / destination
+        source_path = _workspace_root(repo_path) / source
+        dest_path = _workspace_root(repo_path) / destination
 
         if not source_path.exists():
             return {
@@ -182,10 +219,11 @@ def rename_file(
 
         dest_path.parent.mkdir(parents=True, exist_ok=True)
         os.rename(source_path, dest_path)
+        file_index.record_move(_workspace_root(repo_path), source, destination)
 
         # If commit message provided, commit and push changes
         if commit_message:
-            commit_result = commit_and_push(commit_message)
+            commit_result = commit_and_push(commit_message, repo_path=repo_path)
             if not commit_result["success"]:
                 return commit_result
 
@@ -202,11 +240,13 @@ def rename_file(
         }
 
 
-def delete_file(file_path: str, commit_message: str = None, **kwargs) -> ToolOutput:
+def delete_file(
+    file_path: str, commit_message: str = None, repo_path: str = None, **kwargs
+) -> ToolOutput:
     """Delete a file and optionally commit the change."""
     try:
         file_path = _normalize_path(file_path)
-        full_path = Path(os.getcwd()) / file_path
+        full_path = _workspace_root(repo_path) / file_path
 
         if not full_path.exists():
             return {
@@ -216,10 +256,11 @@ def delete_file(file_path: str, commit_message: str = None, **kwargs) -> ToolOut
             }
 
         os.remove(full_path)
+        file_index.record_delete(_workspace_root(repo_path), file_path)
 
         # If commit message provided, commit and push changes
         if commit_message:
-            commit_result = commit_and_push(commit_message)
+            commit_result = commit_and_push(commit_message, repo_path=repo_path)
             if not commit_result["success"]:
                 return commit_result
 
@@ -236,7 +277,25 @@ def delete_file(file_path: str, commit_message: str = None, **kwargs) -> ToolOut
         }
 
 
-def list_files(directory: str, **kwargs) -> ToolOutput:
+def _list_workspace_files(directory: Path) -> list:
+    """List the files under a directory, sorted and relative to it."""
+    # Use git to list all tracked and untracked files, respecting .gitignore
+    try:
+        return file_index.list_indexed_files(directory)
+    except Exception:
+        # If not a git repo, just list files normally
+        files = []
+        for root, _, filenames in os.walk(directory):
+            rel_root = os.path.relpath(root, directory)
+            for filename in filenames:
+                if rel_root == ".":
+                    files.append(filename)
+                else:
+                    files.append(os.path.join(rel_root, filename))
+        return sorted(files)
+
+
+def list_files(directory: str, repo_path: str = None, **kwargs) -> ToolOutput:
     """
     Return a list of all files in the specified directory and its subdirectories,
     excluding .git directory and respecting .gitignore.
@@ -252,7 +311,7 @@ def list_files(directory: str, **kwargs) -> ToolOutput:
     """
     try:
         directory = _normalize_path(directory)
-        directory = Path(os.getcwd()) / directory
+        directory = _workspace_root(repo_path) / directory
 
         if not directory.exists():
             return {
@@ -268,37 +327,7 @@ def list_files(directory: str, **kwargs) -> ToolOutput:
                 "data": None,
             }
 
-        # Use git to list all tracked and untracked files, respecting .gitignore
-        try:
-            repo = Repo(directory)
-        except Exception as e:
-            # If not a git repo, just list files normally
-            files = []
-            for root, _, filenames in os.walk(directory):
-                rel_root = os.path.relpath(root, directory)
-                for filename in filenames:
-                    if rel_root == ".":
-                        files.append(filename)
-                    else:
-                        files.append(os.path.join(rel_root, filename))
-            return {
-                "success": True,
-                "message": f"Found {len(files)} files in {directory}",
-                "data": {"files": sorted(files)},
-            }
-
-        # Get tracked files
-        tracked_files = set(repo.git.ls_files().splitlines())
-
-        # Get untracked files (excluding .gitignored)
-        untracked_files = set(
-            repo.git.ls_files("--others", "--exclude-standard").splitlines()
-        )
-
-        # Combine and filter out .git directory
-        all_files = tracked_files.union(untracked_files)
-        files = sorted([f for f in all_files if not f.startswith(".git/")])
-
+        files = _list_workspace_files(directory)
         return {
             "success": True,
             "message": f"Found {len(files)} files in {directory}",
@@ -313,7 +342,7 @@ def list_files(directory: str, **kwargs) -> ToolOutput:
         }
 
 
-def create_directory(path: str, **kwargs) -> ToolOutput:
+def create_directory(path: str, repo_path: str = None, **kwargs) -> ToolOutput:
     """Create a directory and any necessary parent directories.
 
     Args:
@@ -327,7 +356,7 @@ def create_directory(path: str, **kwargs) -> ToolOutput:
     """
     try:
         path = _normalize_path(path)
-        full_path = Path(os.getcwd()) / path
+        full_path = _workspace_root(repo_path) / path
         full_path.mkdir(parents=True, exist_ok=True)
         return {
             "success": True,
@@ -340,3 +369,179 @@ def create_directory(path: str, **kwargs) -> ToolOutput:
             "message": f"Failed to create directory: {str(e)}",
             "data": None,
         }
+
+
+def search_code(
+    query: str,
+    regex: bool = False,
+    case_sensitive: bool = False,
+    path: str = None,
+    max_results: int = 50,
+    repo_path: str = None,
+    **kwargs,
+) -> ToolOutput:
+    """Search the contents of the workspace's files.
+
+    Args:
+        query (str): Text or regular expression to find
+        regex (bool): Whether query is a regular expression
+        case_sensitive (bool): Whether matching is case sensitive
+        path (str): Only search files under this directory, or matching this glob
+        max_results (int): Most matches to return, at most 200
+
+    Returns:
+        ToolOutput: A dictionary containing:
+            - success (bool): Whether the operation succeeded
+            - message (str): A human readable message
+            - data (dict): The matches, as file, line and snippet, best first
+    """
+    try:
+        root = _workspace_root(repo_path)
+        max_results = max(1, min(int(max_results or 50), 200))
+        results = code_search.search(
+            root,
+            _list_workspace_files(root),
+            query,
+            regex=regex,
+            case_sensitive=case_sensitive,
+            path=path,
+            max_results=max_results,
+        )
+        shown = len(results["matches"])
+        total = results["total_matches"]
+        if total >= code_search.MAX_SCANNED_MATCHES:
+            total = f"{total}+"
+        message = (
+            f"Found {total} matches in {results['files_searched']} candidate files"
+        )
+        if results["truncated"]:
+            message += f", showing the best {shown}; narrow the query or path"
+        return {"success": True, "message": message, "data": results}
+    except re.error as e:
+        return {
+            "success": False,
+            "message": f"Invalid regular expression: {str(e)}",
+            "data": None,
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error searching code: {str(e)}",
+            "data": None,
+        }
+
+
+def _with_snippets(root: Path, results: list) -> list:
+    """Add the source line of each {"file", "line"} result as its snippet."""
+    lines = {}
+    for result in results:
+        if result["file"] not in lines:
+            try:
+                with open(root / result["file"], errors="replace") as f:
+                    lines[result["file"]] = f.read().splitlines()
+            except OSError:
+                lines[result["file"]] = []
+        file_lines = lines[result["file"]]
+        if 0 < result["line"] <= len(file_lines):
+            snippet = file_lines[result["line"] - 1].strip()
+            result["snippet"] = snippet[: code_search.MAX_SNIPPET_CHARS]
+    return results
+
+
+def _indexed_files(root: Path, path: str = None) -> list:
+    return [
+        f
+        for f in _list_workspace_files(root)
+        if symbol_index.is_indexed(f) and code_search.in_scope(f, path)
+    ]
+
+
+def find_symbol(
+    name: str,
+    kind: str = None,
+    path: str = None,
+    max_results: int = 20,
+    repo_path: str = None,
+    **kwargs,
+) -> ToolOutput:
+    """Find where a Python, JavaScript or TypeScript symbol is defined.
+
+    Args:
+        name (str): Symbol name, optionally qualified, e.g. "Client.send"
+        kind (str): Only definitions of this kind, e.g. "class" or "function"
+        path (str): Only search files under this directory, or matching this glob
+        max_results (int): Most definitions to return, at most 100
+
+    Returns:
+        ToolOutput: A dictionary containing:
+            - success (bool): Whether the operation succeeded
+            - message (str): A human readable message
+            - data (dict): The definitions, as file, line, kind and snippet
+    """
+    try:
+        root = _workspace_root(repo_path)
+        max_results = max(1, min(int(max_results or 20), 100))
+        definitions = symbol_index.find_definitions(
+            root, _indexed_files(root, path), name, kind
+        )
+        shown = _with_snippets(root, definitions[:max_results])
+        return {
+            "success": True,
+            "message": f"Found {len(definitions)} definitions of {name}",
+            "data": {
+                "definitions": shown,
+                "total": len(definitions),
+                "truncated": len(definitions) > max_results,
+            },
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error finding symbol: {str(e)}",
+            "data": None,
+        }
+
+
+def find_references(
+    name: str,
+    path: str = None,
+    max_results: int = 50,
+    repo_path: str = None,
+    **kwargs,
+) -> ToolOutput:
+    """Find where a Python, JavaScript or TypeScript symbol is imported and used.
+
+    Args:
+        name (str): Symbol name
+        path (str): Only search files under this directory, or matching this glob
+        max_results (int): Most references to return, at most 200
+
+    Returns:
+        ToolOutput: A dictionary containing:
+            - success (bool): Whether the operation succeeded
+            - message (str): A human readable message
+            - data (dict): The references, as file, line, kind and snippet
+    """
+    try:
+        root = _workspace_root(repo_path)
+        max_results = max(1, min(int(max_results or 50), 200))
+        references = symbol_index.find_references(
+            root, _indexed_files(root, path), name
+        )
+        files = len({reference["file"] for reference in references})
+        shown = _with_snippets(root, references[:max_results])
+        return {
+            "success": True,
+            "message": f"Found {len(references)} references to {name} in {files} files",
+            "data": {
+                "references": shown,
+                "total": len(references),
+                "truncated": len(references) > max_results,
+            },
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "message": f"Error finding references: {str(e)}",
+            "data": None,
+        }
@@ -0,0 +1,439 @@
+"""Index of the symbols defined, imported and referenced in a checkout.
+
+Python files are parsed with ``ast``; JavaScript and TypeScript files are read
+with a lightweight tokenizer that recognizes common declaration and import
+forms. The symbols of a file are cached by its git blob SHA, so a file that is
+the same in several checkouts on this host is only parsed once. Each checkout
+keeps the blob SHA of its files and only rereads the files whose size or
+modification time changed.
+"""
+
+import ast
+import bisect
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+PYTHON_EXTENSIONS = {".py", ".pyi"}
+SCRIPT_EXTENSIONS = {".js", ".jsx", ".mjs", ".cjs", ".ts", ".tsx", ".mts", ".cts"}
+# Larger files are not indexed
+MAX_FILE_BYTES = int(os.getenv("SYMBOL_INDEX_MAX_FILE_BYTES", "500000"))
+# Files whose symbols are kept in memory, shared by every checkout
+SYMBOL_CACHE_MAX_FILES = int(os.getenv("SYMBOL_CACHE_MAX_FILES", "20000"))
+
+_lock = threading.Lock()
+# Blob SHA -> symbols of the file
+_symbols: "OrderedDict[str, dict]" = OrderedDict()
+# Resolved workspace root -> {"lock", "files": {path: (stamp, blob SHA)}}
+_checkouts: Dict[str, dict] = {}
+_stats = {"parsed": 0, "cache_hits": 0}
+
+
+def _new_symbols() -> dict:
+    return {
+        # {"name", "kind", "line", "container"}
+        "definitions": [],
+        # {"name", "line", "module"}; name is the name bound in the file
+        "imports": [],
+        # name -> lines where the name is used
+        "references": {},
+    }
+
+
+class _PythonVisitor(ast.NodeVisitor):
+    def __init__(self):
+        self.symbols = _new_symbols()
+        # (name, kind) of the enclosing classes and functions
+        self.stack = []
+
+    def _define(self, name: str, kind: str, line: int):
+        container = ".".join(name for name, _ in self.stack) or None
+        self.symbols["definitions"].append(
+            {"name": name, "kind": kind, "line": line, "container": container}
+        )
+
+    def _reference(self, name: str, line: int):
+        self.symbols["references"].setdefault(name, []).append(line)
+
+    def visit_ClassDef(self, node):
+        self._define(node.name, "class", node.lineno)
+        self.stack.append((node.name, "class"))
+        self.generic_visit(node)
+        self.stack.pop()
+
+    def visit_FunctionDef(self, node):
+        in_class = bool(self.stack) and self.stack[-1][1] == "class"
+        self._define(node.name, "method" if in_class else "function", node.lineno)
+        self.stack.append((node.name, "function"))
+        self.generic_visit(node)
+        self.stack.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def _define_targets(self, targets):
+        # Only module and class attributes, not function locals
+        if any(kind == "function" for _, kind in self.stack):
+            return
+        for target in targets:
+            for node in ast.walk(target):
+                if isinstance(node, ast.Name):
+                    self._define(node.id, "variable", node.lineno)
+
+    def visit_Assign(self, node):
+        self._define_targets(node.targets)
+        self.generic_visit(node)
+
+    def visit_AnnAssign(self, node):
+        self._define_targets([node.target])
+        self.generic_visit(node)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            name = alias.asname or alias.name.split(".")[0]
+            self.symbols["imports"].append(
+                {"name": name, "line": node.lineno, "module": alias.name}
+            )
+
+    def visit_ImportFrom(self, node):
+        module = "." * node.level + (node.module or "")
+        for alias in node.names:
+            self.symbols["imports"].append(
+                {
+                    "name": alias.asname or alias.name,
+                    "line": node.lineno,
+                    "module": module,
+                }
+            )
+            if alias.asname:
+                self._reference(alias.name, node.lineno)
+
+    def visit_Name(self, node):
+        self._reference(node.id, node.lineno)
+
+    def visit_Attribute(self, node):
+        self._reference(node.attr, node.lineno)
+        self.generic_visit(node)
+
+
+_PYTHON_DEFINITION = re.compile(r"^\s*(?:async\s+)?(def|class)\s+([A-Za-z_]\w*)", re.M)
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+
+
+def _line_numbers(content: str):
+    starts = [0] + [m.end() for m in re.finditer("\n", content)]
+    return lambda offset: bisect.bisect_right(starts, offset)
+
+
+def _python_symbols(content: str) -> dict:
+    try:
+        visitor = _PythonVisitor()
+        visitor.visit(ast.parse(content))
+        return visitor.symbols
+    except (SyntaxError, ValueError, RecursionError):
+        # Files that don't parse still get their definitions and names found
+        symbols = _new_symbols()
+        line_of = _line_numbers(content)
+        for match in _PYTHON_DEFINITION.finditer(content):
+            symbols["definitions"].append(
+                {
+                    "name": match.group(2),
+                    "kind": "class" if match.group(1) == "class" else "function",
+                    "line": line_of(match.start(2)),
+                    "container": None,
+                }
+            )
+        for match in _IDENTIFIER.finditer(content):
+            symbols["references"].setdefault(match.group(), []).append(
+                line_of(match.start())
+            )
+        return symbols
+
+
+# Comments, strings and template literals, blanked out before reading names
+_SCRIPT_NOISE = re.compile(
+    r"//[^\n]*|/\*.*?\*/|'(?:\\.|[^'\\\n])*'|\"(?:\\.|[^\"\\\n])*\"|`(?:\\.|[^`\\])*`",
+    re.S,
+)
+_SCRIPT_DEFINITIONS = [
+    (
+        "function",
+        re.compile(
+            r"^[ \t]*(?:export\s+)?(?:default\s+)?(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)",
+            re.M,
+        ),
+    ),
+    (
+        "class",
+        re.compile(
+            r"^[ \t]*(?:export\s+)?(?:default\s+)?(?:abstract\s+)?class\s+([A-Za-z_$][\w$]*)",
+            re.M,
+        ),
+    ),
+    (
+        "variable",
+        re.compile(
+            r"^[ \t]*(?:export\s+)?(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*(?::[^=\n]+)?=",
+            re.M,
+        ),
+    ),
+    (
+        "interface",
+        re.compile(r"^[ \t]*(?:export\s+)?interface\s+([A-Za-z_$][\w$]*)", re.M),
+    ),
+    (
+        "type",
+        re.compile(r"^[ \t]*(?:export\s+)?type\s+([A-Za-z_$][\w$]*)[^=\n]*=", re.M),
+    ),
+    (
+        "enum",
+        re.compile(
+            r"^[ \t]*(?:export\s+)?(?:const\s+)?enum\s+([A-Za-z_$][\w$]*)", re.M
+        ),
+    ),
+    (
+        "method",
+        re.compile(
+            r"^[ \t]+(?:(?:public|private|protected|static|async|readonly|override|get|set)\s+)*"
+            r"([A-Za-z_$][\w$]*)\s*(?:<[^>\n]*>)?\([^)\n]*\)\s*(?::[^{\n]+)?\{",
+            re.M,
+        ),
+    ),
+]
+_SCRIPT_IMPORT = re.compile(
+    r"\bimport\s+(?:type\s+)?([^'\";]+?)\s+from\s+['\"]([^'\"]+)['\"]", re.S
+)
+_SCRIPT_REQUIRE = re.compile(
+    r"\b(?:const|let|var)\s+(\{[^}]*\}|[A-Za-z_$][\w$]*)\s*=\s*require\(\s*['\"]([^'\"]+)['\"]\s*\)"
+)
+_SCRIPT_KEYWORDS = set(
+    "abstract as async await break case catch class const continue debugger default "
+    "delete do else enum export extends false finally for from function get if "
+    "implements import in instanceof interface let new null of package private "
+    "protected public readonly return set static super switch this throw true try "
+    "type typeof undefined var void while with yield".split()
+)
+
+
+def _imported_names(clause: str) -> List[str]:
+    """Names bound by an import clause, e.g. ``React, { useState as useS }``."""
+    names = []
+    for part in re.split(r",(?![^{]*\})", clause):
+        part = part.strip()
+        if part.startswith("{"):
+            for item in part.strip("{}").split(","):
+                item = item.strip()
+                if item:
+                    names.append(re.split(r"\s+as\s+|\s*:\s*", item)[-1].strip())
+        elif part.startswith("*"):
+            names.append(part.split()[-1])
+        elif part:
+            names.append(part)
+    return [name for name in names if _IDENTIFIER.fullmatch(name)]
+
+
+def _script_symbols(content: str) -> dict:
+    symbols = _new_symbols()
+    line_of = _line_numbers(content)
+    for pattern in (_SCRIPT_IMPORT, _SCRIPT_REQUIRE):
+        for match in pattern.finditer(content):
+            line = line_of(match.start())
+            for name in _imported_names(match.group(1)):
+                symbols["imports"].append(
+                    {"name": name, "line": line, "module": match.group(2)}
+                )
+
+    # Keep line breaks so offsets still map to the same lines
+    code = _SCRIPT_NOISE.sub(lambda m: re.sub(r"[^\n]", " ", m.group()), content)
+    for kind, pattern in _SCRIPT_DEFINITIONS:
+        for match in pattern.finditer(code):
+            name = match.group(1)
+            if name in _SCRIPT_KEYWORDS:
+                continue
+            symbols["definitions"].append(
+                {
+                    "name": name,
+                    "kind": kind,
+                    "line": line_of(match.start(1)),
+                    "container": None,
+                }
+            )
+    for match in _IDENTIFIER.finditer(code):
+        name = match.group()
+        if name not in _SCRIPT_KEYWORDS:
+            symbols["references"].setdefault(name, []).append(line_of(match.start()))
+    return symbols
+
+
+def is_indexed(path: str) -> bool:
+    """Whether the symbols of a file are indexed, judging by its extension."""
+    extension = os.path.splitext(path)[1].lower()
+    return extension in PYTHON_EXTENSIONS or extension in SCRIPT_EXTENSIONS
+
+
+def _blob_sha(content: bytes) -> str:
+    """The SHA git gives a file with this content."""
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+def _parse(path: str, content: bytes) -> dict:
+    text = content.decode("utf-8", errors="replace")
+    if os.path.splitext(path)[1].lower() in PYTHON_EXTENSIONS:
+        return _python_symbols(text)
+    return _script_symbols(text)
+
+
+def _symbols_of(root: str, path: str, checkout: dict) -> Optional[dict]:
+    """Symbols of a checkout's file, reading it only if it changed. Caller holds the checkout lock."""
+    full_path = os.path.join(root, path)
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        checkout["files"].pop(path, None)
+        return None
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    if stat.st_size > MAX_FILE_BYTES:
+        return None
+
+    known = checkout["files"].get(path)
+    if known is not None and known[0] == stamp:
+        with _lock:
+            symbols = _symbols.get(known[1])
+            if symbols is not None:
+                _symbols.move_to_end(known[1])
+                _stats["cache_hits"] += 1
+                return symbols
+
+    try:
+        with open(full_path, "rb") as f:
+            content = f.read()
+    except OSError:
+        return None
+    sha = _blob_sha(content)
+    checkout["files"][path] = (stamp, sha)
+    with _lock:
+        symbols = _symbols.get(sha)
+        if symbols is not None:
+            _symbols.move_to_end(sha)
+            _stats["cache_hits"] += 1
+            return symbols
+
+    symbols = _parse(path, content)
+    with _lock:
+        _symbols[sha] = symbols
+        while len(_symbols) > SYMBOL_CACHE_MAX_FILES:
+            _symbols.popitem(last=False)
+        _stats["parsed"] += 1
+    return symbols
+
+
+def _collect(root, files: List[str]) -> List[Tuple[str, dict]]:
+    """Get (path, symbols) of a checkout's indexed files."""
+    key = os.path.realpath(root)
+    with _lock:
+        checkout = _checkouts.setdefault(key, {"lock": threading.Lock(), "files": {}})
+    with checkout["lock"]:
+        results = []
+        for path in files:
+            if is_indexed(path):
+                symbols = _symbols_of(key, path, checkout)
+                if symbols is not None:
+                    results.append((path, symbols))
+    return results
+
+
+_KIND_RANK = {"class": 0, "interface": 0, "type": 0, "enum": 0, "function": 0}
+
+
+def _is_test(path: str) -> bool:
+    return "test" in path.lower()
+
+
+def find_definitions(
+    root, files: List[str], name: str, kind: Optional[str] = None
+) -> List[dict]:
+    """Find where a symbol is defined.
+
+    Args:
+        root: Root of the checkout
+        files: Files to search, relative to root
+        name: Symbol name, optionally qualified by its container, e.g. "Client.send"
+        kind: Only definitions of this kind (class, function, method, variable,
+            interface, type, enum)
+
+    Returns:
+        List of {"file", "line", "kind", "name", "container"}, best first:
+        non-test files, then classes and functions, then shallower paths
+    """
+    container, _, name = name.rpartition(".")
+    definitions = []
+    for path, symbols in _collect(root, files):
+        for definition in symbols["definitions"]:
+            if definition["name"] != name or (kind and definition["kind"] != kind):
+                continue
+            if container and not (definition["container"] or "").endswith(container):
+                continue
+            definitions.append({"file": path, **definition})
+    definitions.sort(
+        key=lambda d: (
+            _is_test(d["file"]),
+            _KIND_RANK.get(d["kind"], 1),
+            d["file"].count("/"),
+            d["file"],
+            d["line"],
+        )
+    )
+    return definitions
+
+
+def find_references(root, files: List[str], name: str) -> List[dict]:
+    """Find where a symbol is imported and used.
+
+    Args:
+        root: Root of the checkout
+        files: Files to search, relative to root
+        name: Symbol name
+
+    Returns:
+        List of {"file", "line", "kind"}, kind being "import", "definition" or
+        "reference", with non-test files first
+    """
+    name = name.rpartition(".")[2]
+    references = []
+    for path, symbols in _collect(root, files):
+        imports = {i["line"] for i in symbols["imports"] if i["name"] == name}
+        definitions = {d["line"] for d in symbols["definitions"] if d["name"] == name}
+        lines = imports | definitions | set(symbols["references"].get(name, ()))
+        for line in sorted(lines):
+            if line in imports:
+                kind = "import"
+            elif line in definitions:
+                kind = "definition"
+            else:
+                kind = "reference"
+            references.append({"file": path, "line": line, "kind": kind})
+    references.sort(key=lambda r: (_is_test(r["file"]), r["file"], r["line"]))
+    return references
+
+
+def forget(root=None):
+    """Drop a checkout's file SHAs, or every checkout's if root is None.
+
+    The symbols cached by blob SHA are kept for other checkouts.
+    """
+    with _lock:
+        if root is None:
+            _checkouts.clear()
+        else:
+            _checkouts.pop(os.path.realpath(root), None)
+
+
+def get_symbol_index_stats() -> dict:
+    """Get counts of parsed and cached files for this process."""
+    with _lock:
+        stats = dict(_stats)
+        stats["cached_files"] = len(_symbols)
+        stats["checkouts"] = len(_checkouts)
+    return stats
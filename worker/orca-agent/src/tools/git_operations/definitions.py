@@ -62,6 +62,22 @@ DEFINITIONS = {
                     "type": "string",
                     "description": "Git user email to configure",
                 },
+                "clone_strategy": {
+                    "type": "string",
+                    "enum": ["full", "shallow", "blobless", "sparse"],
+                    "description": "How much of the repository to clone: full history, "
+                    "shallow (recent commits only), blobless (file contents fetched on "
+                    "demand) or sparse (only sparse_paths checked out). Defaults to full.",
+                },
+                "depth": {
+                    "type": "integer",
+                    "description": "Number of commits to fetch for a shallow clone",
+                },
+                "sparse_paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Directories to check out for a sparse clone",
+                },
             },
             "required": ["url", "path"],
         },
@@ -6,6 +6,8 @@ from pathlib import Path
 from git import Repo, GitCommandError
 from prometheus_swarm.utils.logging import log_key_value, log_error
 from src.types import ToolOutput
+from src.utils.repo_cache import clone_options, apply_sparse_checkout
+from typing import List
 
 import time
 
@@ -70,6 +72,9 @@ def clone_repository(
     user_email: str = None,
     github_token: str = None,
     github_username: str = None,
+    clone_strategy: str = "full",
+    depth: int = None,
+    sparse_paths: List[str] = None,
     **kwargs,
 ) -> ToolOutput:
     """
@@ -82,6 +87,9 @@ def clone_repository(
         user_email (str, optional): Git user email to configure
         github_token (str, optional): GitHub token for authentication
         github_username (str, optional): GitHub username for commit config
+        clone_strategy (str, optional): "full", "shallow", "blobless" or "sparse"
+        depth (int, optional): History depth for shallow clones
+        sparse_paths (List[str], optional): Paths to check out for sparse clones
 
     Returns:
         ToolOutput: Result of the operation
@@ -114,8 +122,10 @@ def clone_repository(
             log_key_value("Modified URL", url)
 
         # Clone repository
-        log_key_value("Starting clone operation", "Cloning repository...")
-        repo = Repo.clone_from(url, path)
+        log_key_value("Starting clone operation", f"{clone_strategy} clone")
+        repo = Repo.clone_from(url, path, **clone_options(clone_strategy, depth))
+        if clone_strategy == "sparse":
+            apply_sparse_checkout(repo, sparse_paths)
         log_key_value("Clone completed", "successfully")
 
         # Configure user information
@@ -209,10 +219,10 @@ def create_branch(branch_base: str, repo_path: str, **kwargs) -> ToolOutput:
         }
 
 
-def checkout_branch(branch_name: str, **kwargs) -> ToolOutput:
+def checkout_branch(branch_name: str, repo_path: str = None, **kwargs) -> ToolOutput:
     """Check out an existing branch in the current repository."""
     try:
-        repo_path = os.getcwd()
+        repo_path = repo_path or os.getcwd()
         repo = _get_repo(repo_path)
         log_key_value("Checking out branch", branch_name)
         branch = repo.heads[branch_name]
@@ -232,10 +242,10 @@ def checkout_branch(branch_name: str, **kwargs) -> ToolOutput:
         }
 
 
-def commit_and_push(message: str, **kwargs) -> ToolOutput:
+def commit_and_push(message: str, repo_path: str = None, **kwargs) -> ToolOutput:
     """Commit all changes and push to remote."""
     try:
-        repo = Repo(os.getcwd())
+        repo = Repo(repo_path or os.getcwd())
         log_key_value("Committing changes", message)
 
         # Stage all changes
@@ -267,10 +277,10 @@ def commit_and_push(message: str, **kwargs) -> ToolOutput:
         }
 
 
-def get_current_branch(**kwargs) -> ToolOutput:
+def get_current_branch(repo_path: str = None, **kwargs) -> ToolOutput:
     """Get the current branch name in the working directory"""
     try:
-        repo = Repo(os.getcwd())
+        repo = Repo(repo_path or os.getcwd())
         branch = repo.active_branch.name
         log_key_value("Current branch", branch)
         return {
@@ -288,10 +298,10 @@ def get_current_branch(**kwargs) -> ToolOutput:
         }
 
 
-def list_branches(**kwargs) -> ToolOutput:
+def list_branches(repo_path: str = None, **kwargs) -> ToolOutput:
     """List all branches in the current repository."""
     try:
-        repo_path = os.getcwd()
+        repo_path = repo_path or os.getcwd()
         repo = _get_repo(repo_path)
         branches = [head.name for head in repo.heads]
         log_key_value("Branches", ", ".join(branches))
@@ -310,10 +320,10 @@ def list_branches(**kwargs) -> ToolOutput:
         }
 
 
-def add_remote(name: str, url: str, **kwargs) -> ToolOutput:
+def add_remote(name: str, url: str, repo_path: str = None, **kwargs) -> ToolOutput:
     """Add a remote to the current repository."""
     try:
-        repo_path = os.getcwd()
+        repo_path = repo_path or os.getcwd()
         # Insert GitHub token authentication logic
         repo = _get_repo(repo_path)
         log_key_value("Adding remote", f"{name} -> {url}")
@@ -363,11 +373,11 @@ def fetch_remote(repo_path: str, remote_name: str, **kwargs) -> ToolOutput:
 
 
 def pull_remote(
-    remote_name: str = "origin", branch: str = None, **kwargs
+    remote_name: str = "origin", branch: str = None, repo_path: str = None, **kwargs
 ) -> ToolOutput:
     """Pull changes with explicit branch specification."""
     try:
-        repo_path = os.getcwd()
+        repo_path = repo_path or os.getcwd()
         repo = _get_repo(repo_path)
         branch = branch or repo.active_branch.name
         log_key_value("Pulling from remote", f"{remote_name}/{branch}")
@@ -375,7 +385,7 @@ def pull_remote(
         repo.git.pull(remote_name, branch, "--allow-unrelated-histories")
 
         # Check for conflicts after pull
-        if check_for_conflicts(**kwargs)["has_conflicts"]:
+        if check_for_conflicts(repo_path=repo_path, **kwargs)["has_conflicts"]:
             return {
                 "success": False,
                 "message": "Merge conflict detected after pull",
@@ -397,12 +407,12 @@ def pull_remote(
         }
 
 
-def can_access_repository(repo_url: str, **kwargs) -> ToolOutput:
+def can_access_repository(repo_url: str, repo_path: str = None, **kwargs) -> ToolOutput:
     """Check if a git repository is accessible."""
     try:
         log_key_value("Checking access to", repo_url)
         # Use GitPython to check remote URLs
-        repo = Repo(os.getcwd())
+        repo = Repo(repo_path or os.getcwd())
         for remote in repo.remotes:
             if any(repo_url in url for url in remote.urls):
                 return {
@@ -423,10 +433,10 @@ def can_access_repository(repo_url: str, **kwargs) -> ToolOutput:
         }
 
 
-def check_for_conflicts(**kwargs) -> ToolOutput:
+def check_for_conflicts(repo_path: str = None, **kwargs) -> ToolOutput:
     """Check for merge conflicts in the current repository."""
     try:
-        repo_path = os.getcwd()
+        repo_path = repo_path or os.getcwd()
         repo = _get_repo(repo_path)
         unmerged = repo.index.unmerged_blobs()
         conflicting_files = sorted(list(unmerged.keys()))
@@ -452,10 +462,10 @@ def check_for_conflicts(**kwargs) -> ToolOutput:
         }
 
 
-def get_conflict_info(**kwargs) -> ToolOutput:
+def get_conflict_info(repo_path: str = None, **kwargs) -> ToolOutput:
     """Get details about current conflicts from Git's index in the current repository."""
     try:
-        repo_path = os.getcwd()
+        repo_path = repo_path or os.getcwd()
         repo = _get_repo(repo_path)
         conflicts = {}
         unmerged = repo.index.unmerged_blobs()
@@ -487,10 +497,12 @@ def get_conflict_info(**kwargs) -> ToolOutput:
         }
 
 
-def resolve_conflict(file_path: str, resolution: str, **kwargs) -> ToolOutput:
+def resolve_conflict(
+    file_path: str, resolution: str, repo_path: str = None, **kwargs
+) -> ToolOutput:
     """Resolve a conflict in a specific file and commit the resolution in the current repository."""
     try:
-        repo_path = os.getcwd()
+        repo_path = repo_path or os.getcwd()
         repo = _get_repo(repo_path)
         log_key_value("Resolving conflict in", file_path)
         full_path = Path(repo.working_dir) / file_path
@@ -511,13 +523,13 @@ def resolve_conflict(file_path: str, resolution: str, **kwargs) -> ToolOutput:
         }
 
 
-def create_merge_commit(message: str, **kwargs) -> ToolOutput:
+def create_merge_commit(message: str, repo_path: str = None, **kwargs) -> ToolOutput:
     """Create a merge commit after resolving conflicts in the current repository."""
     try:
-        repo_path = os.getcwd()
+        repo_path = repo_path or os.getcwd()
         repo = _get_repo(repo_path)
         log_key_value("Creating merge commit", message)
-        if check_for_conflicts(**kwargs)["has_conflicts"]:
+        if check_for_conflicts(repo_path=repo_path, **kwargs)["has_conflicts"]:
             return {
                 "success": False,
                 "message": "Cannot create merge commit with unresolved conflicts",
@@ -2,7 +2,7 @@
 
 import os
 from typing import Dict, List, Any
-from github import Github, Auth, GithubException
+from github import Github, GithubException
 from dotenv import load_dotenv
 from src.tools.git_operations.implementations import (
     fetch_remote,
@@ -11,6 +11,7 @@ from src.tools.git_operations.implementations import (
 from prometheus_swarm.utils.logging import log_key_value, log_error
 from src.types import ToolOutput
 from src.workflows.utils import get_fork_name
+from src.utils.github_client import get_github_client, invalidate
 
 from git import Repo, GitCommandError
 from src.tools.github_operations.templates import TEMPLATES
@@ -39,7 +40,7 @@ def _get_github_client(github_token: str) -> Github:
     """
     if not github_token:
         raise ValueError("GitHub token is required")
-    return Github(auth=Auth.Token(github_token))
+    return get_github_client(github_token)
 
 
 def create_pull_request(
@@ -270,7 +271,7 @@ def sync_fork(repo_path: str, branch: str = "main", **kwargs) -> ToolOutput:
             }
 
         # Pull from upstream
-        pull_result = pull_remote(repo_path, "upstream", branch)
+        pull_result = pull_remote("upstream", branch, repo_path=repo_path)
         if not pull_result["success"]:
             return {
                 "success": False,
@@ -691,6 +692,7 @@ def merge_pull_request(
 
         # Merge the PR
         merge_result = pr.merge(merge_method=merge_method)
+        invalidate(repo_full_name)
 
         return {
             "success": True,
@@ -1,12 +1,18 @@
 """Distribution list filtering utilities."""
 
-import re
-from typing import Dict, Tuple
-from github import Github
 import os
-from src.workflows.utils import verify_pr_signatures
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+from src.workflows.utils import verify_many_pr_signatures
+from src.utils.github_client import get_repo, get_pull, get_github_stats
 from src.tools.github_operations.parser import extract_section
 
+MAX_VALIDATION_WORKERS = int(os.getenv("DISTRIBUTION_VALIDATION_WORKERS", "8"))
+# Below this many remaining GitHub API calls, stop validating in parallel
+RATE_LIMIT_FLOOR = int(os.getenv("DISTRIBUTION_RATE_LIMIT_FLOOR", "100"))
+
 
 def remove_leaders(
     distribution_list: Dict[str, Dict[str, str]],
@@ -20,8 +26,7 @@ def remove_leaders(
     filtered_distribution_list = {}
 
     # Get source repo and its upstream
-    gh = Github(os.environ.get("GITHUB_TOKEN"))
-    target_repo = gh.get_repo(f"{repo_owner}/{repo_name}")
+    target_repo = get_repo(f"{repo_owner}/{repo_name}")
     # Get parent's owner if it exists (repo is a fork), otherwise use repo's owner
     upstream_owner = getattr(target_repo.parent, "owner", target_repo.owner).login
     print(f"Upstream repo owner: {upstream_owner}")
@@ -68,17 +73,109 @@ def remove_leaders(
     return filtered_distribution_list
 
 
+def _fetch_node_pr(node_data: Dict[str, str]) -> Optional[str]:
+    """Fetch a worker PR and check it names the node's staking key.
+
+    Returns:
+        The PR description, or None if the PR can't be used
+    """
+    pr_url = node_data["prUrl"]
+    staking_key = node_data["stakingKey"]
+
+    print(f"\nValidating PR: {pr_url}")
+    print(f"Expected staking key: {staking_key}")
+
+    # Parse PR URL and get PR
+    match = re.match(r"https://github\.com/([^/]+)/([^/]+)/pull/(\d+)", pr_url)
+    if not match:
+        print(f"Invalid PR URL format: {pr_url}")
+        return None
+
+    pr_owner, pr_repo, pr_number = match.groups()
+    pr = get_pull(f"{pr_owner}/{pr_repo}", int(pr_number))
+
+    # First extract the actual staking key from the PR
+    staking_section = extract_section(pr.body, "STAKING_KEY")
+    if not staking_section:
+        print(f"No staking key section found in PR #{pr_number}")
+        return None
+
+    try:
+        pr_staking_key = staking_section.split(":")[0].strip()
+        print(f"Found staking key in PR: {pr_staking_key}")
+    except Exception as e:
+        print(f"Error parsing staking key section: {str(e)}")
+        return None
+
+    # Verify the PR's staking key matches the one in distribution list
+    if pr_staking_key != staking_key:
+        print(f"Staking key mismatch - PR: {pr_staking_key}, Expected: {staking_key}")
+        return None
+    return pr.body
+
+
+def _timed_fetch_node_pr(
+    node_key: str, node_data: Dict[str, str]
+) -> Tuple[Optional[str], float]:
+    start = time.monotonic()
+    try:
+        pr_body = _fetch_node_pr(node_data)
+    except Exception as e:
+        print(f"Error fetching PR for {node_key}: {str(e)}")
+        pr_body = None
+    return pr_body, time.monotonic() - start
+
+
+def _prefetch_repos(filtered_list: Dict[str, Dict[str, str]]):
+    """Look up each distinct PR repository once before fanning out.
+
+    Concurrent PR fetches for the same repository would otherwise all miss the
+    client cache at the same time and each look the repository up again.
+    """
+    repos = set()
+    for node_data in filtered_list.values():
+        match = re.match(
+            r"https://github\.com/([^/]+)/([^/]+)/pull/(\d+)",
+            node_data.get("prUrl", ""),
+        )
+        if match:
+            repos.add(f"{match.group(1)}/{match.group(2)}")
+
+    for full_name in repos:
+        try:
+            get_repo(full_name)
+        except Exception as e:
+            print(f"Error fetching repository {full_name}: {str(e)}")
+    return len(repos)
+
+
+def _validation_workers(node_count: int) -> int:
+    """Pick the pool size, backing off when the GitHub rate limit runs low."""
+    workers = max(1, min(MAX_VALIDATION_WORKERS, node_count))
+    remaining = get_github_stats()["rate_limit_remaining"]
+    if remaining is not None and remaining < RATE_LIMIT_FLOOR:
+        print(f"GitHub rate limit low ({remaining} remaining), validating sequentially")
+        return 1
+    return workers
+
+
 def validate_distribution_list(
     distribution_list: Dict[str, Dict[str, str]],
     repo_owner: str,
     repo_name: str,
+    timings: Optional[Dict[str, float]] = None,
 ) -> Tuple[Dict[str, Dict[str, str]], str]:
     """Validate and filter distribution list.
 
+    PRs are fetched concurrently, up to DISTRIBUTION_VALIDATION_WORKERS at a
+    time, then their signatures are verified in one batch.
+
     Args:
         distribution_list: Raw distribution list from request
         repo_owner: Owner of the repository
         repo_name: Name of the repository
+        timings: Optional dict filled with the time taken to fetch and check
+            each node's PR, in seconds
 
     Returns:
         tuple: (filtered_list, error_message)
@@ -102,70 +199,55 @@ def validate_distribution_list(
             return None, "No eligible worker PRs after filtering leaders"
 
         # Now validate signatures in each PR
-        gh = Github(os.environ.get("GITHUB_TOKEN"))
-        validated_list = {}
+        start = time.monotonic()
+        repo_count = _prefetch_repos(filtered_list)
+        workers = _validation_workers(len(filtered_list))
+        print(
+            f"Validating {len(filtered_list)} PRs from {repo_count} repositories "
+            f"with {workers} workers"
+        )
 
-        for node_key, node_data in filtered_list.items():
-            try:
-                pr_url = node_data["prUrl"]
-                task_id = node_data["taskId"]
-                round_number = node_data["roundNumber"]
-                staking_key = node_data["stakingKey"]
-
-                print(f"\nValidating PR: {pr_url}")
-                print(f"Expected staking key: {staking_key}")
-
-                # Parse PR URL and get PR
-                match = re.match(
-                    r"https://github\.com/([^/]+)/([^/]+)/pull/(\d+)", pr_url
-                )
-                if not match:
-                    print(f"Invalid PR URL format: {pr_url}")
-                    continue
-
-                pr_owner, pr_repo, pr_number = match.groups()
-                repo = gh.get_repo(f"{pr_owner}/{pr_repo}")
-                pr = repo.get_pull(int(pr_number))
-
-                # First extract the actual staking key from the PR
-                staking_section = extract_section(pr.body, "STAKING_KEY")
-                if not staking_section:
-                    print(f"No staking key section found in PR #{pr_number}")
-                    continue
-
-                try:
-                    pr_staking_key = staking_section.split(":")[0].strip()
-                    print(f"Found staking key in PR: {pr_staking_key}")
-                except Exception as e:
-                    print(f"Error parsing staking key section: {str(e)}")
-                    continue
-
-                # Verify the PR's staking key matches the one in distribution list
-                if pr_staking_key != staking_key:
-                    print(
-                        f"Staking key mismatch - PR: {pr_staking_key}, Expected: {staking_key}"
-                    )
-                    continue
-
-                # Now verify the signature
-                print(f"Verifying signature for key: {staking_key}")
-                is_valid = verify_pr_signatures(
-                    pr.body,
-                    task_id,
-                    round_number,
-                    expected_staking_key=staking_key,
-                    expected_action="task",
-                )
-
-                if is_valid:
-                    print(f"✓ Valid signature found for {staking_key}")
-                    validated_list[staking_key] = node_data
-                else:
-                    print(f"✗ Invalid signature for {staking_key}")
-
-            except Exception as e:
-                print(f"Error validating PR for {node_key}: {str(e)}")
-                continue
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                node_key: executor.submit(_timed_fetch_node_pr, node_key, node_data)
+                for node_key, node_data in filtered_list.items()
+            }
+
+        # Collect in distribution list order so the result does not depend on
+        # which fetch finished first
+        pr_bodies = {}
+        for node_key in filtered_list:
+            pr_body, elapsed = futures[node_key].result()
+            print(f"Fetched PR of {node_key} in {elapsed:.2f}s")
+            if timings is not None:
+                timings[node_key] = elapsed
+            if pr_body is not None:
+                pr_bodies[node_key] = pr_body
+
+        # Then verify every signature in one batch
+        print(f"Verifying {len(pr_bodies)} PR signatures")
+        results = verify_many_pr_signatures(
+            [
+                {
+                    "pr_body": pr_body,
+                    "task_id": filtered_list[node_key]["taskId"],
+                    "round_number": filtered_list[node_key]["roundNumber"],
+                    "expected_staking_key": filtered_list[node_key]["stakingKey"],
+                    "expected_action": "task",
+                }
+                for node_key, pr_body in pr_bodies.items()
+            ]
+        )
+        validated_list = {}
+        for node_key, is_valid in zip(pr_bodies, results):
+            staking_key = filtered_list[node_key]["stakingKey"]
+            if is_valid:
+                print(f"✓ Valid signature found for {staking_key}")
+                validated_list[staking_key] = filtered_list[node_key]
+            else:
+                print(f"✗ Invalid signature for {staking_key}")
+
+        print(f"Validation took {time.monotonic() - start:.2f}s")
 
         if not validated_list:
             return None, "No PRs with valid signatures found"
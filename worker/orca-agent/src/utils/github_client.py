@@ -0,0 +1,191 @@
+"""Shared GitHub API client with cached lookups.
+
+One ``Github`` client is kept per token for the whole process, so every caller
+shares the same pooled HTTP connections. Repository, pull request and user
+lookups are cached for ``GITHUB_CACHE_TTL`` seconds; once an entry expires it
+is revalidated with a conditional request (If-None-Match / If-Modified-Since),
+and an unchanged object costs a 304 that does not count against the rate limit.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+from github import Auth, Github
+from github.AuthenticatedUser import AuthenticatedUser
+from github.NamedUser import NamedUser
+from github.PullRequest import PullRequest
+from github.Repository import Repository
+
+CACHE_TTL = float(os.getenv("GITHUB_CACHE_TTL", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("GITHUB_CACHE_MAX_ENTRIES", "1024"))
+POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "10"))
+
+_lock = threading.Lock()
+_clients: Dict[str, Github] = {}
+# Maps (kind, token, *key) -> (fetched_at, object)
+_cache: Dict[tuple, Tuple[float, Any]] = {}
+_stats = {
+    "api_calls": 0,
+    "cache_hits": 0,
+    "not_modified": 0,
+}
+
+
+def _resolve_token(github_token: Optional[str]) -> str:
+    token = github_token or os.environ.get("GITHUB_TOKEN")
+    if not token:
+        raise ValueError("GitHub token is required")
+    return token
+
+
+def get_github_client(github_token: Optional[str] = None) -> Github:
+    """Get the shared GitHub client for a token.
+
+    Args:
+        github_token: GitHub token to authenticate with. Defaults to GITHUB_TOKEN.
+
+    Returns:
+        Github: Authenticated client reused across the process
+    """
+    token = _resolve_token(github_token)
+    with _lock:
+        client = _clients.get(token)
+        if client is None:
+            client = Github(auth=Auth.Token(token), pool_size=POOL_SIZE)
+            _clients[token] = client
+        return client
+
+
+def _count(stat: str):
+    with _lock:
+        _stats[stat] += 1
+
+
+def _cached(key: tuple, fetch: Callable[[], Any]) -> Any:
+    """Return a cached GitHub object, fetching or revalidating it as needed."""
+    with _lock:
+        entry = _cache.get(key)
+
+    if entry:
+        fetched_at, obj = entry
+        if time.time() - fetched_at < CACHE_TTL:
+            _count("cache_hits")
+            return obj
+
+        # Revalidate with a conditional request; update() is False on a 304
+        _count("api_calls")
+        if not obj.update():
+            _count("not_modified")
+    else:
+        _count("api_calls")
+        obj = fetch()
+
+    with _lock:
+        _cache[key] = (time.time(), obj)
+        if len(_cache) > CACHE_MAX_ENTRIES:
+            oldest = min(_cache, key=lambda k: _cache[k][0])
+            del _cache[oldest]
+    return obj
+
+
+def get_repo(full_name: str, github_token: Optional[str] = None) -> Repository:
+    """Get a repository by its full name (owner/repo).
+
+    Args:
+        full_name: Repository full name
+        github_token: Optional GitHub token. Defaults to GITHUB_TOKEN.
+
+    Returns:
+        Repository: Cached repository object
+    """
+    token = _resolve_token(github_token)
+    return _cached(
+        ("repo", token, full_name.lower()),
+        lambda: get_github_client(token).get_repo(full_name),
+    )
+
+
+def get_pull(
+    full_name: str, pr_number: int, github_token: Optional[str] = None
+) -> PullRequest:
+    """Get a pull request of a repository.
+
+    Args:
+        full_name: Repository full name (owner/repo)
+        pr_number: Pull request number
+        github_token: Optional GitHub token. Defaults to GITHUB_TOKEN.
+
+    Returns:
+        PullRequest: Cached pull request object
+    """
+    token = _resolve_token(github_token)
+    return _cached(
+        ("pull", token, full_name.lower(), int(pr_number)),
+        lambda: get_repo(full_name, token).get_pull(int(pr_number)),
+    )
+
+
+def get_user(
+    login: Optional[str] = None, github_token: Optional[str] = None
+) -> NamedUser | AuthenticatedUser:
+    """Get a user, or the authenticated user if no login is given.
+
+    Args:
+        login: GitHub username to look up
+        github_token: Optional GitHub token. Defaults to GITHUB_TOKEN.
+
+    Returns:
+        NamedUser | AuthenticatedUser: Cached user object
+    """
+    token = _resolve_token(github_token)
+
+    def fetch():
+        client = get_github_client(token)
+        if login:
+            return client.get_user(login)
+        # The authenticated user is lazy; load it so the cached copy is complete
+        user = client.get_user()
+        user.login
+        return user
+
+    return _cached(("user", token, (login or "").lower()), fetch)
+
+
+def invalidate(full_name: Optional[str] = None):
+    """Drop cached objects, e.g. after changing a repository or merging a PR.
+
+    Args:
+        full_name: Repository full name whose repo and PR entries to drop.
+            Clears the whole cache if not given.
+    """
+    with _lock:
+        if full_name is None:
+            _cache.clear()
+            return
+        name = full_name.lower()
+        for key in [k for k in _cache if k[0] != "user" and k[2] == name]:
+            del _cache[key]
+
+
+def get_github_stats() -> dict:
+    """Get API call counters and the remaining rate limit of each client."""
+    with _lock:
+        stats = dict(_stats)
+        clients = list(_clients.values())
+
+    rate_limits = []
+    for client in clients:
+        # Read from the last response headers; only clients that already made
+        # a request have them, so this never spends a call
+        requester = client.requester
+        remaining, limit = requester.rate_limiting
+        if limit >= 0:
+            rate_limits.append({"remaining": remaining, "limit": limit})
+
+    stats["cached_objects"] = len(_cache)
+    stats["rate_limits"] = rate_limits
+    stats["rate_limit_remaining"] = (
+        min(r["remaining"] for r in rate_limits) if rate_limits else None
+    )
+    return stats
@@ -0,0 +1,189 @@
+"""Pooled HTTP client for the middle server.
+
+All calls share one keep-alive session, so repeated calls reuse connections
+instead of opening a new one each time. Every call is bounded by a connect and
+read timeout. Idempotent GETs are retried on gateway errors, and connection
+failures are retried for every method since the request never reached the
+server. After repeated failures a circuit breaker fails calls fast for a cooldown
+period instead of letting every caller wait for its own timeout.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+POOL_SIZE = int(os.getenv("MIDDLE_SERVER_POOL_SIZE", "10"))
+CONNECT_TIMEOUT = float(os.getenv("MIDDLE_SERVER_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("MIDDLE_SERVER_READ_TIMEOUT", "15"))
+MAX_RETRIES = int(os.getenv("MIDDLE_SERVER_MAX_RETRIES", "2"))
+# Consecutive failures that open the breaker, and seconds it stays open
+BREAKER_THRESHOLD = int(os.getenv("MIDDLE_SERVER_BREAKER_THRESHOLD", "5"))
+BREAKER_COOLDOWN = float(os.getenv("MIDDLE_SERVER_BREAKER_COOLDOWN", "30"))
+
+# Read timeouts of endpoints that do more than a lookup on the server side
+READ_TIMEOUTS = {
+    "/api/builder/fetch-to-do": 30.0,
+    "/api/builder/fetch-issue": 30.0,
+    "/api/builder/check-to-do": 30.0,
+    "/api/builder/check-issue": 30.0,
+}
+
+
+class MiddleServerUnavailable(requests.exceptions.ConnectionError):
+    """Raised without calling the middle server while the circuit breaker is open."""
+
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_breaker = {"consecutive_failures": 0, "opened_at": None, "trial_in_flight": False}
+_metrics = {
+    "requests": 0,
+    "failures": 0,
+    "rejected": 0,
+    "breaker_opened": 0,
+    "total_seconds": 0.0,
+}
+
+
+def _get_session() -> requests.Session:
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                retry = Retry(
+                    total=MAX_RETRIES,
+                    connect=MAX_RETRIES,
+                    read=MAX_RETRIES,
+                    status=MAX_RETRIES,
+                    backoff_factor=0.5,
+                    status_forcelist=(502, 503, 504),
+                    allowed_methods=frozenset({"GET"}),
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(
+                    pool_connections=POOL_SIZE,
+                    pool_maxsize=POOL_SIZE,
+                    max_retries=retry,
+                )
+                session = requests.Session()
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({"Content-Type": "application/json"})
+                _session = session
+    return _session
+
+
+def get_timeout(path: str) -> Tuple[float, float]:
+    """Get the (connect, read) timeout of a middle server endpoint."""
+    for prefix, read_timeout in READ_TIMEOUTS.items():
+        if path.startswith(prefix):
+            return CONNECT_TIMEOUT, read_timeout
+    return CONNECT_TIMEOUT, READ_TIMEOUT
+
+
+def _before_request(path: str) -> bool:
+    """Check the breaker. Returns True if the call is the half-open trial."""
+    with _lock:
+        opened_at = _breaker["opened_at"]
+        if opened_at is None:
+            return False
+        if (
+            time.time() - opened_at >= BREAKER_COOLDOWN
+            and not _breaker["trial_in_flight"]
+        ):
+            _breaker["trial_in_flight"] = True
+            return True
+        _metrics["rejected"] += 1
+    raise MiddleServerUnavailable(
+        f"Middle server circuit breaker is open, skipped {path}"
+    )
+
+
+def _after_request(failed: bool, trial: bool, elapsed: float):
+    with _lock:
+        _metrics["requests"] += 1
+        _metrics["total_seconds"] += elapsed
+        if trial:
+            _breaker["trial_in_flight"] = False
+        if not failed:
+            _breaker["consecutive_failures"] = 0
+            _breaker["opened_at"] = None
+            return
+        _metrics["failures"] += 1
+        _breaker["consecutive_failures"] += 1
+        if trial or (
+            _breaker["opened_at"] is None
+            and _breaker["consecutive_failures"] >= BREAKER_THRESHOLD
+        ):
+            if _breaker["opened_at"] is None:
+                _metrics["breaker_opened"] += 1
+            _breaker["opened_at"] = time.time()
+
+
+def request(method: str, path: str, **kwargs) -> requests.Response:
+    """Send a request to the middle server.
+
+    Args:
+        method: HTTP method
+        path: Endpoint path, e.g. "/api/builder/assign-issue"
+        **kwargs: Passed to requests, e.g. json. A timeout overrides the default
+
+    Returns:
+        requests.Response: The response, whatever its status code
+
+    Raises:
+        requests.exceptions.RequestException: If the server could not be reached,
+            timed out, or the circuit breaker is open
+    """
+    trial = _before_request(path)
+    kwargs.setdefault("timeout", get_timeout(path))
+    started = time.time()
+    failed = True
+    try:
+        response = _get_session().request(
+            method, os.environ["MIDDLE_SERVER_URL"] + path, **kwargs
+        )
+        failed = response.status_code >= 500
+        return response
+    finally:
+        _after_request(failed, trial, time.time() - started)
+
+
+def get(path: str, **kwargs) -> requests.Response:
+    """Send a GET request to the middle server. See request()."""
+    return request("GET", path, **kwargs)
+
+
+def post(path: str, json: Any = None, **kwargs) -> requests.Response:
+    """Send a POST request to the middle server. See request()."""
+    return request("POST", path, json=json, **kwargs)
+
+
+def get_middle_server_stats() -> Dict[str, Any]:
+    """Get request counts, latency and circuit breaker state for this process."""
+    with _lock:
+        metrics = dict(_metrics)
+        opened_at = _breaker["opened_at"]
+        consecutive_failures = _breaker["consecutive_failures"]
+    if opened_at is None:
+        state = "closed"
+    elif time.time() - opened_at >= BREAKER_COOLDOWN:
+        state = "half_open"
+    else:
+        state = "open"
+    requests_made = metrics.pop("requests")
+    total_seconds = metrics.pop("total_seconds")
+    return {
+        "breaker_state": state,
+        "consecutive_failures": consecutive_failures,
+        "requests": requests_made,
+        **metrics,
+        "avg_latency_seconds": (
+            round(total_seconds / requests_made, 3) if requests_made else 0.0
+        ),
+    }
@@ -0,0 +1,340 @@
+"""Host-wide token bucket rate limiting for LLM and tool calls.
+
+Bucket state lives in a small SQLite database, so every workflow thread and
+every process on the host draws from the same budget. Provider retry-after and
+rate-limit headers block a bucket for everyone until the provider's window
+resets, instead of each caller backing off on its own.
+"""
+
+import functools
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Mapping, Optional
+
+DB_PATH = os.getenv(
+    "RATE_LIMIT_DB_PATH", os.path.join(tempfile.gettempdir(), "orca_rate_limit.db")
+)
+# Fraction of each wait added as random jitter, so waiters don't wake together
+JITTER = float(os.getenv("RATE_LIMIT_JITTER", "0.2"))
+
+# Requests per minute and burst size of each bucket
+BUCKETS = {
+    "llm": {
+        "rate": float(os.getenv("LLM_RATE_LIMIT_RPM", "50")) / 60,
+        "burst": float(os.getenv("LLM_RATE_LIMIT_BURST", "10")),
+    },
+    "tools": {
+        "rate": float(os.getenv("TOOL_RATE_LIMIT_RPM", "300")) / 60,
+        "burst": float(os.getenv("TOOL_RATE_LIMIT_BURST", "30")),
+    },
+}
+
+_lock = threading.Lock()
+_local = threading.local()
+_initialized = False
+_metrics: Dict[str, Dict[str, float]] = {}
+
+
+def _connect() -> sqlite3.Connection:
+    global _initialized
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    if not _initialized:
+        with _lock:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "name TEXT PRIMARY KEY, tokens REAL NOT NULL, "
+                "updated_at REAL NOT NULL, blocked_until REAL NOT NULL DEFAULT 0)"
+            )
+            _initialized = True
+    return conn
+
+
+def _bucket_metrics(bucket: str) -> Dict[str, float]:
+    return _metrics.setdefault(
+        bucket,
+        {
+            "acquired": 0,
+            "waiting": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "throttled": 0,
+        },
+    )
+
+
+def _load(conn: sqlite3.Connection, bucket: str, now: float):
+    """Read a bucket's state, refilled up to now. Must run inside a transaction."""
+    config = BUCKETS[bucket]
+    row = conn.execute(
+        "SELECT tokens, updated_at, blocked_until FROM buckets WHERE name = ?",
+        (bucket,),
+    ).fetchone()
+    if row is None:
+        return config["burst"], 0.0
+    tokens, updated_at, blocked_until = row
+    tokens = min(config["burst"], tokens + max(0.0, now - updated_at) * config["rate"])
+    return tokens, blocked_until
+
+
+def _save(conn, bucket: str, tokens: float, now: float, blocked_until: float):
+    conn.execute(
+        "INSERT INTO buckets (name, tokens, updated_at, blocked_until) "
+        "VALUES (?, ?, ?, ?) ON CONFLICT(name) DO UPDATE SET "
+        "tokens = excluded.tokens, updated_at = excluded.updated_at, "
+        "blocked_until = excluded.blocked_until",
+        (bucket, tokens, now, blocked_until),
+    )
+
+
+def acquire(bucket: str = "llm", cost: float = 1.0) -> float:
+    """Wait until the bucket has budget for a call, then spend it.
+
+    Args:
+        bucket: Name of the bucket in BUCKETS
+        cost: Tokens the call uses
+
+    Returns:
+        float: Seconds spent waiting
+    """
+    config = BUCKETS[bucket]
+    started = time.time()
+    with _lock:
+        _bucket_metrics(bucket)["waiting"] += 1
+
+    conn = _connect()
+    try:
+        while True:
+            now = time.time()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                tokens, blocked_until = _load(conn, bucket, now)
+                if now < blocked_until:
+                    wait = blocked_until - now
+                elif tokens >= cost:
+                    _save(conn, bucket, tokens - cost, now, blocked_until)
+                    conn.execute("COMMIT")
+                    break
+                else:
+                    wait = (cost - tokens) / config["rate"]
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            time.sleep(wait + random.uniform(0, wait * JITTER))
+    finally:
+        conn.close()
+
+    waited = time.time() - started
+    with _lock:
+        metrics = _bucket_metrics(bucket)
+        metrics["waiting"] -= 1
+        metrics["acquired"] += 1
+        metrics["total_wait_seconds"] += waited
+        metrics["max_wait_seconds"] = max(metrics["max_wait_seconds"], waited)
+    return waited
+
+
+def block(bucket: str, seconds: float):
+    """Stop every caller from using a bucket for the given number of seconds."""
+    if seconds <= 0:
+        return
+    conn = _connect()
+    try:
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        tokens, blocked_until = _load(conn, bucket, now)
+        _save(conn, bucket, tokens, now, max(blocked_until, now + seconds))
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+    with _lock:
+        _bucket_metrics(bucket)["throttled"] += 1
+
+
+def _parse_seconds(value: str, now: float) -> Optional[float]:
+    """Parse a header value given as seconds, a duration, or a timestamp."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    # OpenAI style durations, e.g. "1m30s" or "250ms"
+    match = re.fullmatch(
+        r"(?:(\d+)h)?(?:(\d+)m(?!s))?(?:([\d.]+)s)?(?:(\d+)ms)?", value
+    )
+    if match and any(match.groups()):
+        hours, minutes, seconds, millis = (
+            float(g) if g else 0.0 for g in match.groups()
+        )
+        return hours * 3600 + minutes * 60 + seconds + millis / 1000
+
+    # RFC 3339 (Anthropic reset headers) or HTTP dates (retry-after)
+    for parse in (
+        lambda v: datetime.fromisoformat(v.replace("Z", "+00:00")),
+        parsedate_to_datetime,
+    ):
+        try:
+            moment = parse(value)
+        except (TypeError, ValueError):
+            continue
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return moment.timestamp() - now
+    return None
+
+
+def observe_headers(bucket: str, headers: Optional[Mapping[str, str]]) -> float:
+    """Block a bucket according to a provider's rate-limit response headers.
+
+    Honors retry-after / retry-after-ms, and blocks until the reset time when
+    the remaining request or token budget reported by the provider is zero.
+
+    Returns:
+        float: Seconds the bucket was blocked for, 0 if not blocked
+    """
+    if not headers:
+        return 0.0
+    headers = {k.lower(): v for k, v in headers.items()}
+    now = time.time()
+    delay = 0.0
+
+    if "retry-after-ms" in headers:
+        delay = max(delay, (_parse_seconds(headers["retry-after-ms"], now) or 0) / 1000)
+    elif "retry-after" in headers:
+        delay = max(delay, _parse_seconds(headers["retry-after"], now) or 0)
+
+    for kind in ("requests", "tokens", "input-tokens", "output-tokens"):
+        for remaining_key, reset_key in (
+            (
+                f"anthropic-ratelimit-{kind}-remaining",
+                f"anthropic-ratelimit-{kind}-reset",
+            ),
+            (f"x-ratelimit-remaining-{kind}", f"x-ratelimit-reset-{kind}"),
+        ):
+            remaining = headers.get(remaining_key)
+            if remaining is None or reset_key not in headers:
+                continue
+            try:
+                exhausted = float(remaining) <= 0
+            except ValueError:
+                continue
+            if exhausted:
+                delay = max(delay, _parse_seconds(headers[reset_key], now) or 0)
+
+    block(bucket, delay)
+    return delay
+
+
+def get_response_headers(error: Exception) -> Optional[Mapping[str, str]]:
+    """Get the HTTP response headers of a provider SDK error, if it has any.
+
+    The framework clients raise their own errors from the SDK's, so the errors
+    they wrap (original_error, __cause__ and __context__) are searched too.
+    """
+    pending, seen = [error], set()
+    while pending:
+        candidate = pending.pop(0)
+        if candidate is None or id(candidate) in seen:
+            continue
+        seen.add(id(candidate))
+        response = getattr(candidate, "response", None)
+        headers = getattr(response, "headers", None)
+        if headers is not None:
+            return headers
+        pending += [
+            getattr(candidate, "original_error", None),
+            getattr(candidate, "__cause__", None),
+            getattr(candidate, "__context__", None),
+        ]
+    return None
+
+
+def observe_responses(http_client: Any, bucket: str) -> bool:
+    """Observe the rate-limit headers of an httpx client's successful responses.
+
+    Successful responses report the remaining budget as well, so the bucket is
+    blocked as soon as the provider says it is used up, before any call fails.
+    Error responses are left to governed, which sees the raised error.
+
+    Returns:
+        bool: Whether the client supports response hooks
+    """
+    hooks = getattr(http_client, "event_hooks", None)
+    if hooks is None:
+        return False
+
+    def observe(response):
+        if response.is_success:
+            observe_headers(bucket, response.headers)
+
+    hooks["response"].append(observe)
+    http_client.event_hooks = hooks
+    return True
+
+
+def governed(bucket: str) -> Callable:
+    """Decorator spending bucket budget before each call.
+
+    Nested governed calls on the same thread and bucket only spend once.
+    Rate-limit headers on errors raised by the call block the bucket.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            active = getattr(_local, "active", set())
+            _local.active = active
+            if bucket in active:
+                return func(*args, **kwargs)
+
+            acquire(bucket)
+            active.add(bucket)
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                observe_headers(bucket, get_response_headers(e))
+                raise
+            finally:
+                active.discard(bucket)
+
+        return wrapper
+
+    return decorator
+
+
+def get_rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Get each bucket's current budget and this process's queue wait times."""
+    stats = {}
+    conn = _connect()
+    try:
+        now = time.time()
+        for bucket in BUCKETS:
+            tokens, blocked_until = _load(conn, bucket, now)
+            with _lock:
+                metrics = dict(_bucket_metrics(bucket))
+            acquired = metrics["acquired"]
+            stats[bucket] = {
+                "available_tokens": round(tokens, 2),
+                "blocked_for_seconds": round(max(0.0, blocked_until - now), 2),
+                "acquired": acquired,
+                "waiting": metrics["waiting"],
+                "throttled": metrics["throttled"],
+                "avg_wait_seconds": (
+                    round(metrics["total_wait_seconds"] / acquired, 3)
+                    if acquired
+                    else 0.0
+                ),
+                "max_wait_seconds": round(metrics["max_wait_seconds"], 3),
+            }
+    finally:
+        conn.close()
+    return stats
@@ -0,0 +1,279 @@
+"""Local bare-mirror cache for repository clones.
+
+Every workflow used to run a full network clone of the same repository. Instead,
+we keep one bare mirror per upstream repository on disk, refresh it with an
+incremental fetch, and create working clones with ``--reference`` so only
+objects missing from the mirror (e.g. fork-only branches) go over the network.
+
+Mirrors are evicted least-recently-used first once the cache grows past
+``REPO_CACHE_MAX_MB``. Mirrors referenced by a live working clone are never
+evicted, since the clone borrows their objects through git alternates.
+
+Workflows that do not need the full history can ask for a partial clone
+(shallow, blobless or sparse) instead; see ``clone_options``. Partial clones
+reference the mirror too.
+"""
+
+import os
+import shutil
+import threading
+import time
+from typing import Dict, List, Optional
+from git import Repo
+from prometheus_swarm.utils.logging import log_key_value, log_error
+
+CACHE_DIR = os.path.abspath(
+    os.getenv("REPO_CACHE_DIR", os.path.join("./repos", ".mirrors"))
+)
+MAX_CACHE_MB = int(os.getenv("REPO_CACHE_MAX_MB", "5120"))
+
+# Refspecs fetched into each mirror; pull request refs are fetched on demand
+MIRROR_REFSPECS = ["+refs/heads/*:refs/heads/*", "+refs/tags/*:refs/tags/*"]
+
+# Clone strategies:
+#   full     - complete history and file contents
+#   shallow  - only the last few commits of every branch
+#   blobless - complete commit graph, file contents fetched on demand
+#   sparse   - blobless, with only the requested paths checked out
+CLONE_STRATEGIES = ("full", "shallow", "blobless", "sparse")
+DEFAULT_SHALLOW_DEPTH = int(os.getenv("SHALLOW_CLONE_DEPTH", "50"))
+
+_cache_lock = threading.Lock()
+_mirror_locks: Dict[str, threading.Lock] = {}
+# Maps working clone path -> mirror path it borrows objects from
+_active_clones: Dict[str, str] = {}
+
+
+def _mirror_key(repo_url: str) -> str:
+    """Build the cache key (directory name) for a repository URL."""
+    parts = repo_url.strip("/").removesuffix(".git").split("/")
+    repo_owner, repo_name = parts[-2:]
+    return f"{repo_owner}__{repo_name}.git".lower()
+
+
+def _auth_url(repo_url: str, github_token: Optional[str]) -> str:
+    """Add GitHub token authentication to a URL if available."""
+    if github_token and "github.com" in repo_url and "@" not in repo_url:
+        return repo_url.replace("https://", f"https://{github_token}@")
+    return repo_url
+
+
+def _get_mirror_lock(mirror_path: str) -> threading.Lock:
+    with _cache_lock:
+        return _mirror_locks.setdefault(mirror_path, threading.Lock())
+
+
+def _touch(mirror_path: str):
+    """Record a use of the mirror for LRU ordering."""
+    os.utime(mirror_path, None)
+
+
+def _dir_size(path: str) -> int:
+    """Get the total size in bytes of all files under a directory."""
+    total = 0
+    for root, _, filenames in os.walk(path):
+        for filename in filenames:
+            try:
+                total += os.path.getsize(os.path.join(root, filename))
+            except OSError:
+                continue
+    return total
+
+
+def refresh_mirror(repo_url: str, github_token: Optional[str] = None) -> str:
+    """Create or incrementally update the bare mirror for a repository.
+
+    Args:
+        repo_url: URL of the upstream repository (e.g., https://github.com/owner/repo)
+        github_token: Optional GitHub token for authentication
+
+    Returns:
+        str: Path to the bare mirror
+    """
+    mirror_path = os.path.join(CACHE_DIR, _mirror_key(repo_url))
+    auth_url = _auth_url(repo_url, github_token)
+
+    with _get_mirror_lock(mirror_path):
+        if os.path.exists(mirror_path):
+            log_key_value("Refreshing repository mirror", mirror_path)
+            mirror = Repo(mirror_path)
+        else:
+            log_key_value("Creating repository mirror", mirror_path)
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            mirror = Repo.init(mirror_path, bare=True)
+            # Store the URL without the token; auth is passed per fetch
+            mirror.create_remote("origin", repo_url)
+
+        # Fetch through the authenticated URL so the token never lands in config
+        mirror.git.fetch("--prune", "--quiet", auth_url, *MIRROR_REFSPECS)
+        _touch(mirror_path)
+
+    return mirror_path
+
+
+def clone_options(strategy: str = "full", depth: Optional[int] = None) -> dict:
+    """Get the git clone options for a clone strategy.
+
+    Args:
+        strategy: One of CLONE_STRATEGIES
+        depth: History depth for shallow clones (defaults to SHALLOW_CLONE_DEPTH)
+
+    Returns:
+        dict: Keyword options for Repo.clone_from
+    """
+    if strategy not in CLONE_STRATEGIES:
+        raise ValueError(
+            f"Unknown clone strategy: {strategy} (expected one of {CLONE_STRATEGIES})"
+        )
+
+    if strategy == "shallow":
+        # Keep every branch tip so workflows can still check out non-default branches
+        return {"depth": depth or DEFAULT_SHALLOW_DEPTH, "no_single_branch": True}
+    if strategy == "blobless":
+        return {"filter": "blob:none"}
+    if strategy == "sparse":
+        return {"filter": "blob:none", "sparse": True}
+    return {}
+
+
+def apply_sparse_checkout(repo: Repo, sparse_paths: Optional[List[str]]):
+    """Limit the working tree of a sparse clone to the given paths.
+
+    Args:
+        repo: GitPython Repo instance cloned with the sparse strategy
+        sparse_paths: Directories to check out; the repository root files are
+            always included
+    """
+    if sparse_paths:
+        log_key_value("Sparse checkout paths", ", ".join(sparse_paths))
+        repo.git.sparse_checkout("set", *sparse_paths)
+
+
+def clone_from_cache(
+    repo_url: str,
+    clone_url: str,
+    clone_path: str,
+    github_token: Optional[str] = None,
+    strategy: str = "full",
+    depth: Optional[int] = None,
+    sparse_paths: Optional[List[str]] = None,
+) -> Repo:
+    """Clone a repository using the mirror of its upstream as an object reference.
+
+    Every strategy borrows objects from the mirror, so partial clones (shallow,
+    blobless, sparse) only limit what the working clone itself records; objects
+    they later fetch on demand are found in the mirror first.
+
+    Falls back to a plain clone with the same strategy if the mirror cannot be
+    prepared.
+
+    Args:
+        repo_url: URL of the upstream repository the mirror is keyed on
+        clone_url: URL to clone from (the fork or the upstream itself)
+        clone_path: Destination path of the working clone
+        github_token: Optional GitHub token for authentication
+        strategy: One of CLONE_STRATEGIES
+        depth: History depth for shallow clones
+        sparse_paths: Paths to check out for sparse clones
+
+    Returns:
+        Repo: GitPython Repo instance for the working clone
+    """
+    auth_url = _auth_url(clone_url, github_token)
+    options = clone_options(strategy, depth)
+    log_key_value("Clone strategy", strategy)
+
+    # Register the clone before refreshing so the mirror can't be evicted in between
+    mirror_path = os.path.join(CACHE_DIR, _mirror_key(repo_url))
+    with _cache_lock:
+        _active_clones[os.path.abspath(clone_path)] = mirror_path
+
+    try:
+        refresh_mirror(repo_url, github_token)
+    except Exception as e:
+        release_clone(clone_path)
+        log_error(e, "Repository mirror unavailable, falling back to plain clone")
+        repo = Repo.clone_from(auth_url, clone_path, **options)
+    else:
+        try:
+            repo = Repo.clone_from(
+                auth_url, clone_path, reference=mirror_path, **options
+            )
+        except Exception:
+            release_clone(clone_path)
+            raise
+        enforce_cache_limit()
+
+    if strategy == "sparse":
+        apply_sparse_checkout(repo, sparse_paths)
+    return repo
+
+
+def release_clone(clone_path: str):
+    """Mark a working clone as removed so its mirror becomes evictable."""
+    with _cache_lock:
+        _active_clones.pop(os.path.abspath(clone_path), None)
+
+
+def enforce_cache_limit(max_mb: int = MAX_CACHE_MB):
+    """Evict least recently used mirrors until the cache fits the size limit.
+
+    Args:
+        max_mb: Maximum total size of the cache in megabytes
+    """
+    if not os.path.isdir(CACHE_DIR):
+        return
+
+    mirrors = []
+    for entry in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, entry)
+        if os.path.isdir(path):
+            mirrors.append((os.path.getmtime(path), path, _dir_size(path)))
+
+    total_bytes = sum(size for _, _, size in mirrors)
+    limit_bytes = max_mb * 1024 * 1024
+    if total_bytes <= limit_bytes:
+        return
+
+    with _cache_lock:
+        in_use = set(_active_clones.values())
+
+    # Oldest first
+    for _, path, size in sorted(mirrors):
+        if total_bytes <= limit_bytes:
+            break
+        if path in in_use:
+            continue
+        lock = _get_mirror_lock(path)
+        if not lock.acquire(blocking=False):
+            continue
+        try:
+            # A clone may have registered the mirror since the snapshot above
+            with _cache_lock:
+                if path in _active_clones.values():
+                    continue
+            log_key_value("Evicting repository mirror", path)
+            shutil.rmtree(path, ignore_errors=True)
+            total_bytes -= size
+        finally:
+            lock.release()
+
+    log_key_value(
+        "Repository cache size", f"{total_bytes / (1024 * 1024):.1f} MB / {max_mb} MB"
+    )
+
+
+def get_cache_stats() -> dict:
+    """Get the current state of the mirror cache."""
+    mirrors = {}
+    if os.path.isdir(CACHE_DIR):
+        for entry in os.listdir(CACHE_DIR):
+            path = os.path.join(CACHE_DIR, entry)
+            if os.path.isdir(path):
+                mirrors[entry] = {
+                    "size_bytes": _dir_size(path),
+                    "last_used": time.ctime(os.path.getmtime(path)),
+                }
+    with _cache_lock:
+        active = len(_active_clones)
+    return {"cache_dir": CACHE_DIR, "mirrors": mirrors, "active_clones": active}
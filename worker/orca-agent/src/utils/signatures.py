@@ -1,27 +1,32 @@
 """Utilities for signature verification."""
 
 import base58
+import hashlib
 import nacl.signing
 import json
-from typing import Dict, Optional, Any, Union
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple, Union
 from prometheus_swarm.utils.logging import log_error
 
+CACHE_MAX_ENTRIES = int(os.getenv("SIGNATURE_CACHE_MAX_ENTRIES", "4096"))
 
-def verify_signature(signed_message: str, staking_key: str) -> Dict[str, Any]:
-    """Verify a signature locally using PyNaCl.
+# Verification results keyed by (staking_key, sha256 of the signed message).
+# A signature's outcome never changes, so entries only leave the cache when
+# it is full.
+_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
 
-    This function verifies signatures created by the Koii task node using nacl.sign().
-    The signatures are base58 encoded before being sent.
 
-    Args:
-        signed_message (str): Base58 encoded signed message
-        staking_key (str): Base58 encoded public key
+def _cache_key(signed_message: str, staking_key: str) -> Tuple[str, str]:
+    digest = hashlib.sha256(signed_message.encode("utf-8")).hexdigest()
+    return staking_key, digest
 
-    Returns:
-        dict: Contains either:
-            - data (str): The decoded message if verification succeeds
-            - error (str): Error message if verification fails
-    """
+
+def _verify(signed_message: str, staking_key: str) -> Dict[str, Any]:
+    """Verify a signature without the cache."""
     try:
         # Decode base58 signature and public key
         signed_bytes = base58.b58decode(signed_message)
@@ -40,6 +45,93 @@ def verify_signature(signed_message: str, staking_key: str) -> Dict[str, Any]:
         return {"error": f"Verification failed: {str(e)}"}
 
 
+def verify_signature(signed_message: str, staking_key: str) -> Dict[str, Any]:
+    """Verify a signature locally using PyNaCl.
+
+    This function verifies signatures created by the Koii task node using nacl.sign().
+    The signatures are base58 encoded before being sent. Results are cached, so
+    verifying the same signature again costs a dictionary lookup.
+
+    Args:
+        signed_message (str): Base58 encoded signed message
+        staking_key (str): Base58 encoded public key
+
+    Returns:
+        dict: Contains either:
+            - data (str): The decoded message if verification succeeds
+            - error (str): Error message if verification fails
+    """
+    return verify_signatures([(signed_message, staking_key)])[0]
+
+
+def verify_signatures(items: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+    """Verify many signatures in one call.
+
+    Pairs are de-duplicated by cache key, and only the ones missing from the
+    cache are verified; their results are added to the cache.
+
+    Args:
+        items: List of (signed_message, staking_key) pairs
+
+    Returns:
+        list: One verify_signature result per pair, in the same order
+    """
+    keys = [
+        (
+            _cache_key(signed_message, staking_key)
+            if isinstance(signed_message, str) and isinstance(staking_key, str)
+            else None
+        )
+        for signed_message, staking_key in items
+    ]
+
+    resolved = {}
+    misses = {}
+    with _cache_lock:
+        for key, item in zip(keys, items):
+            if key is None or key in misses:
+                continue
+            result = resolved.get(key) or _cache.get(key)
+            if result is not None:
+                _cache.move_to_end(key)
+                _cache_stats["hits"] += 1
+                resolved[key] = result
+            else:
+                _cache_stats["misses"] += 1
+                misses[key] = item
+
+    # Verified outside the lock, a concurrent verification of the same pair is harmless
+    verified = {key: _verify(*item) for key, item in misses.items()}
+
+    with _cache_lock:
+        for key, result in verified.items():
+            _cache[key] = result
+            _cache.move_to_end(key)
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    resolved.update(verified)
+
+    return [
+        dict(resolved[key]) if key is not None else _verify(*item)
+        for key, item in zip(keys, items)
+    ]
+
+
+def get_signature_cache_stats() -> Dict[str, Any]:
+    """Get verification cache hits, misses and hit ratio."""
+    with _cache_lock:
+        hits = _cache_stats["hits"]
+        misses = _cache_stats["misses"]
+        size = len(_cache)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+        "entries": size,
+    }
+
+
 def verify_and_parse_signature(
     signed_message: str,
     staking_key: str,
@@ -62,8 +154,36 @@ def verify_and_parse_signature(
             - data (dict): The decoded and parsed JSON payload if verification succeeds
             - error (str): Error message if verification or validation fails
     """
-    # First verify the signature
-    result = verify_signature(signed_message, staking_key)
+    return verify_and_parse_signatures(
+        [(signed_message, staking_key, expected_values)]
+    )[0]
+
+
+def verify_and_parse_signatures(
+    items: List[Tuple[str, str, Optional[Dict[str, Any]]]],
+) -> List[Dict[str, Union[Dict[str, Any], str]]]:
+    """Verify many signatures in one call and validate their contents.
+
+    Args:
+        items: List of (signed_message, staking_key, expected_values) tuples,
+            as taken by verify_and_parse_signature
+
+    Returns:
+        list: One verify_and_parse_signature result per tuple, in the same order
+    """
+    results = verify_signatures(
+        [(signed_message, staking_key) for signed_message, staking_key, _ in items]
+    )
+    return [
+        _parse_payload(result, expected_values)
+        for result, (_, _, expected_values) in zip(results, items)
+    ]
+
+
+def _parse_payload(
+    result: Dict[str, Any], expected_values: Optional[Dict[str, Any]]
+) -> Dict[str, Union[Dict[str, Any], str]]:
+    """Parse a verified message as JSON and check its expected values."""
     if result.get("error"):
         log_error(
             Exception("Signature verification failed"),
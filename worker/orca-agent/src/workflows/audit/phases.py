@@ -1,6 +1,5 @@
 """Audit phase definitions."""
 
-from typing import List
 from prometheus_swarm.workflows.base import Workflow, WorkflowPhase, requires_context
 
 
@@ -9,7 +8,7 @@ from prometheus_swarm.workflows.base import Workflow, WorkflowPhase, requires_co
         "repo_owner": str,  # Owner of the repository
         "repo_name": str,  # Name of the repository
         "pr_number": int,  # PR number to review
-        "current_files": List[str],  # Current repository structure
+        "current_files": str,  # Current repository structure
     },
     tools={
         "repo_owner": str,  # Owner of the repository
@@ -26,6 +25,7 @@ class AuditPhase(WorkflowPhase):
             available_tools=[
                 "read_file",
                 "list_files",
+                "search_code",
                 "run_tests",
                 "review_pull_request",
             ],
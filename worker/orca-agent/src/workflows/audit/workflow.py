@@ -1,21 +1,26 @@
 """Audit workflow implementation."""
 
 import os
-from github import Github
+import subprocess
 from prometheus_swarm.workflows.base import Workflow
 from prometheus_swarm.utils.logging import log_section, log_key_value, log_error
-from prometheus_swarm.workflows.utils import (
+from src.workflows.utils import (
     check_required_env_vars,
     validate_github_auth,
     setup_repository,
     cleanup_repository,
-    get_current_files,
+    get_repo_context,
 )
+from src.utils.github_client import get_pull
 
 from src.workflows.audit import phases
 
 
 class AuditWorkflow(Workflow):
+    # A blobless clone keeps the full history and fetches file contents lazily,
+    # reviews only read the PR's files
+    clone_strategy = "blobless"
+
     def __init__(
         self,
         client,
@@ -59,11 +64,11 @@ class AuditWorkflow(Workflow):
 
         # Get PR info from GitHub
         try:
-            gh = Github(self.context["github_token"])
-            repo = gh.get_repo(
-                f"{self.context['repo_owner']}/{self.context['repo_name']}"
+            pr = get_pull(
+                f"{self.context['repo_owner']}/{self.context['repo_name']}",
+                self.context["pr_number"],
+                self.context["github_token"],
             )
-            pr = repo.get_pull(self.context["pr_number"])
             self.context["pr"] = pr
             self.context["base_branch"] = pr.base.ref
             log_key_value("Base branch", self.context["base_branch"])
@@ -81,31 +86,31 @@ class AuditWorkflow(Workflow):
             repo_url,
             github_token=self.context["github_token"],
             github_username=self.context["github_username"],
+            clone_strategy=self.clone_strategy,
         )
         if not result["success"]:
             raise Exception(result.get("error", "Repository setup failed"))
 
         # Update context with setup results
         self.context["repo_path"] = result["data"]["clone_path"]
-        self.original_dir = result["data"]["original_dir"]
-
-        # Enter repo directory
-        os.chdir(self.context["repo_path"])
 
         # Add remote for PR's repository and fetch the branch
-        os.system(
-            f"git remote add pr_source https://github.com/{pr.head.repo.full_name}"
-        )
-        os.system(f"git fetch pr_source {pr.head.ref}")
-        os.system("git checkout FETCH_HEAD")
+        for command in [
+            f"git remote add pr_source https://github.com/{pr.head.repo.full_name}",
+            f"git fetch pr_source {pr.head.ref}",
+            "git checkout FETCH_HEAD",
+        ]:
+            subprocess.run(command, shell=True, cwd=self.context["repo_path"])
 
         # Get current files for context
-        self.context["current_files"] = get_current_files()
+        self.context["current_files"] = get_repo_context(
+            self.context["repo_path"], f"{pr.title}\n{pr.body or ''}"
+        )
 
     def cleanup(self):
         """Clean up repository."""
-        if hasattr(self, "original_dir") and "repo_path" in self.context:
-            cleanup_repository(self.original_dir, self.context["repo_path"])
+        if "repo_path" in self.context:
+            cleanup_repository(self.context["repo_path"])
 
     def run(self):
         """Execute the audit workflow."""
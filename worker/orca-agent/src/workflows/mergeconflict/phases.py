@@ -1,12 +1,11 @@
 """Merge conflict resolver workflow phases."""
 
-from typing import List
 from prometheus_swarm.workflows.base import WorkflowPhase, Workflow, requires_context
 
 
 @requires_context(
     templates={
-        "current_files": List[str],  # List of files in the repository
+        "current_files": str,  # Tree of the files in the repository
     },
     tools={
         "repo_path": str,  # Path to the repository for git operations
@@ -20,6 +19,9 @@ class ConflictResolutionPhase(WorkflowPhase):
             available_tools=[
                 "read_file",
                 "list_files",
+                "search_code",
+                "find_symbol",
+                "find_references",
                 "resolve_conflict",
             ],
             conversation_id=conversation_id,
@@ -67,7 +69,7 @@ class CreatePullRequestPhase(WorkflowPhase):
 
 @requires_context(
     templates={
-        "current_files": List[str],
+        "current_files": str,
     }
 )
 class TestVerificationPhase(WorkflowPhase):
@@ -82,6 +84,9 @@ class TestVerificationPhase(WorkflowPhase):
                 "read_file",
                 "write_file",
                 "list_files",
+                "search_code",
+                "find_symbol",
+                "find_references",
             ],
             conversation_id=conversation_id,
             name="Test Verification",
@@ -0,0 +1,163 @@
+"""Merge order planning for the merge conflict workflow.
+
+Every PR is compared with the branch it will be merged into. Two PRs are
+predicted to conflict when they touch overlapping or adjacent lines of the same
+file, which is when git reports a conflict. PRs are grouped into batches that do
+not conflict with each other, and merged batch by batch, so the first batch is
+as large as possible and only PRs in later batches can reach the conflict
+resolution phase.
+"""
+
+import re
+from typing import Callable, Dict, List, Tuple
+
+# A (start, end) range of base lines, inclusive
+Hunk = Tuple[int, int]
+
+# Used for changes without line information, e.g. binary files
+WHOLE_FILE: Hunk = (0, float("inf"))
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+\d+(?:,\d+)? @@")
+
+
+def parse_diff_hunks(diff_output: str) -> Dict[str, List[Hunk]]:
+    """Parse the base line ranges each file's hunks touch from a -U0 diff.
+
+    Args:
+        diff_output: Output of ``git diff -U0``
+
+    Returns:
+        Dict mapping each changed file to the base line ranges it changes
+    """
+    hunks: Dict[str, List[Hunk]] = {}
+    current_file = None
+    for line in diff_output.splitlines():
+        if line.startswith("diff --git "):
+            # "diff --git a/path b/path" - use the base side of renames
+            current_file = line.split(" a/", 1)[-1].rsplit(" b/", 1)[0]
+            hunks.setdefault(current_file, [])
+        elif current_file is None:
+            continue
+        elif line.startswith("Binary files"):
+            hunks[current_file].append(WHOLE_FILE)
+        else:
+            match = HUNK_HEADER.match(line)
+            if match:
+                start = int(match.group(1))
+                count = int(match.group(2)) if match.group(2) is not None else 1
+                # Pure insertions (count 0) sit between two base lines
+                hunks[current_file].append((start, start + max(count, 1) - 1))
+
+    # Renames and mode changes have no hunks but still touch the file
+    return {path: ranges or [WHOLE_FILE] for path, ranges in hunks.items()}
+
+
+def get_changed_hunks(
+    run_git: Callable[[str], str], base_branch: str, pr_branch: str
+) -> Dict[str, List[Hunk]]:
+    """Get the lines a PR branch changes relative to its merge base with base_branch.
+
+    Args:
+        run_git: Function running a git command in the repository and returning
+            its output
+        base_branch: Branch the PR will be merged into
+        pr_branch: Local branch holding the PR
+
+    Returns:
+        Dict mapping each changed file to the base line ranges it changes
+    """
+    diff_output = run_git(
+        f"git diff -U0 --no-color --no-ext-diff {base_branch}...{pr_branch}"
+    )
+    return parse_diff_hunks(diff_output)
+
+
+def _overlaps(a: List[Hunk], b: List[Hunk]) -> bool:
+    # Adjacent hunks conflict in git too, hence the +1
+    return any(
+        a_start <= b_end + 1 and b_start <= a_end + 1
+        for a_start, a_end in a
+        for b_start, b_end in b
+    )
+
+
+def build_conflict_graph(
+    hunks_by_pr: Dict[int, Dict[str, List[Hunk]]],
+) -> Dict[int, set]:
+    """Build a graph linking PRs predicted to conflict.
+
+    Args:
+        hunks_by_pr: Changed hunks of each PR, keyed by PR number
+
+    Returns:
+        Dict mapping each PR number to the PR numbers it conflicts with
+    """
+    graph = {number: set() for number in hunks_by_pr}
+    numbers = list(hunks_by_pr)
+    for i, a in enumerate(numbers):
+        for b in numbers[i + 1 :]:
+            shared_files = hunks_by_pr[a].keys() & hunks_by_pr[b].keys()
+            if any(
+                _overlaps(hunks_by_pr[a][path], hunks_by_pr[b][path])
+                for path in shared_files
+            ):
+                graph[a].add(b)
+                graph[b].add(a)
+    return graph
+
+
+def _count_conflicts(order: List[int], graph: Dict[int, set]) -> int:
+    """Count PRs that conflict with at least one PR merged before them."""
+    merged = set()
+    conflicts = 0
+    for number in order:
+        if graph[number] & merged:
+            conflicts += 1
+        merged.add(number)
+    return conflicts
+
+
+def plan_merge_order(
+    pr_numbers: List[int], hunks_by_pr: Dict[int, Dict[str, List[Hunk]]]
+) -> dict:
+    """Pick a merge order that keeps predicted conflicts low.
+
+    PRs are greedily placed into the first batch none of their conflicting PRs
+    are in, fewest conflicts first, so the first batch is close to the largest
+    conflict-free set. Batches keep the original order of their PRs.
+
+    Args:
+        pr_numbers: PR numbers in their current (chronological) order
+        hunks_by_pr: Changed hunks of each PR, keyed by PR number
+
+    Returns:
+        dict: Plan with keys:
+            - order: PR numbers in the order to merge them
+            - batches: Lists of PR numbers that do not conflict with each other
+            - conflict_graph: PR numbers each PR is predicted to conflict with
+            - predicted_conflicts: PRs expected to conflict in the chosen order
+            - baseline_conflicts: PRs expected to conflict in the original order
+    """
+    graph = build_conflict_graph({n: hunks_by_pr.get(n, {}) for n in pr_numbers})
+    position = {number: i for i, number in enumerate(pr_numbers)}
+
+    batches: List[List[int]] = []
+    for number in sorted(pr_numbers, key=lambda n: (len(graph[n]), position[n])):
+        for batch in batches:
+            if not graph[number] & set(batch):
+                batch.append(number)
+                break
+        else:
+            batches.append([number])
+
+    for batch in batches:
+        batch.sort(key=position.get)
+    order = [number for batch in batches for number in batch]
+
+    return {
+        "order": order,
+        "batches": batches,
+        "conflict_graph": {n: sorted(graph[n], key=position.get) for n in pr_numbers},
+        "predicted_conflicts": _count_conflicts(order, graph),
+        "baseline_conflicts": _count_conflicts(pr_numbers, graph),
+    }
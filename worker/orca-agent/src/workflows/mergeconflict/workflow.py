@@ -1,17 +1,19 @@
 """Merge conflict resolver workflow implementation."""
 
 import os
-from github import Github
+import subprocess
 from prometheus_swarm.workflows.base import Workflow
 from prometheus_swarm.utils.logging import log_section, log_key_value, log_error
 from prometheus_swarm.tools.github_operations.parser import extract_section
-from prometheus_swarm.utils.signatures import verify_and_parse_signature
-from prometheus_swarm.workflows.utils import (
+from src.utils.signatures import verify_and_parse_signature
+from src.workflows.utils import (
     check_required_env_vars,
     setup_repository,
     cleanup_repository,
-    get_current_files,
+    get_repo_context,
 )
+from src.utils.github_client import get_repo, invalidate
+from src.workflows.mergeconflict.planner import get_changed_hunks, plan_merge_order
 from src.workflows.mergeconflict.phases import (
     ConflictResolutionPhase,
     CreatePullRequestPhase,
@@ -20,6 +22,9 @@ from src.workflows.mergeconflict.phases import (
 
 
 class MergeConflictWorkflow(Workflow):
+    # Merging PRs needs their common history with the base branch
+    clone_strategy = "full"
+
     def __init__(
         self,
         client,
@@ -49,6 +54,9 @@ class MergeConflictWorkflow(Workflow):
         # Initialize conversation ID
         self.conversation_id = None
 
+        # Number of PRs that needed the conflict resolution phase
+        self.conflicts_resolved = 0
+
         check_required_env_vars([github_token, github_username])
         self.context["github_token"] = os.getenv(github_token)
         consolidation_username = os.getenv(github_username)
@@ -87,8 +95,9 @@ class MergeConflictWorkflow(Workflow):
         )
 
         # Get upstream repo info and add to context
-        gh = Github(self.context["github_token"])
-        source_fork = gh.get_repo(f"{source_fork_owner}/{source_repo_name}")
+        source_fork = get_repo(
+            f"{source_fork_owner}/{source_repo_name}", self.context["github_token"]
+        )
         upstream = source_fork.parent
 
         self.context["upstream"] = {
@@ -168,6 +177,7 @@ class MergeConflictWorkflow(Workflow):
                     repo_url,
                     github_token=self.context["github_token"],
                     github_username=self.context["github_username"],
+                    clone_strategy=self.clone_strategy,
                     skip_fork=True,  # Don't fork if we own the source
                 )
             else:
@@ -175,6 +185,7 @@ class MergeConflictWorkflow(Workflow):
                     repo_url,
                     github_token=self.context["github_token"],
                     github_username=self.context["github_username"],
+                    clone_strategy=self.clone_strategy,
                 )
 
             if not result["success"]:
@@ -198,25 +209,25 @@ class MergeConflictWorkflow(Workflow):
             self.context["repo_owner"] = self.context["upstream"]["owner"]
             self.context["repo_name"] = self.context["upstream"]["name"]
 
-            # Change to repo directory
+            # Work in the cloned repository
             self.context["repo_path"] = result["data"]["clone_path"]
-            os.chdir(self.context["repo_path"])
 
             # Configure source remote if we don't own the source fork
             if not self.is_source_fork_owner:
-                os.system(f"git remote add source {self.context['source_fork']['url']}")
-                os.system("git fetch source")
+                self._run_git(
+                    f"git remote add source {self.context['source_fork']['url']}"
+                )
+                self._run_git("git fetch source")
 
             # Create merge branch from source branch
             source_branch = self.context["source_fork"]["branch"]
             head_branch = self.context["head_branch"]
 
             # Fetch source branch and create merge branch from it
-            os.system(
+            self._run_git(
                 f"git fetch {'origin' if self.is_source_fork_owner else 'source'} {source_branch}"
             )
-            os.system(f"git checkout -b {head_branch} FETCH_HEAD")
-            os.system(f"git push origin {head_branch}")
+            self._run_git(f"git checkout -b {head_branch} FETCH_HEAD")
 
             return True
 
@@ -224,80 +235,113 @@ class MergeConflictWorkflow(Workflow):
             log_error(e, "Failed to set up repository")
             return False
 
-    def merge_pr(self, pr_url, pr_title):
-        """Merge a single PR into the head branch."""
-        # Extract PR info from URL
+    def _run_git(self, command):
+        """Run a shell command in the workflow's clone and return its output."""
+        result = subprocess.run(
+            command,
+            shell=True,
+            cwd=self.context["repo_path"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        return result.stdout
+
+    def _pr_branch(self, pr_url):
+        """Name of the local branch holding a PR's contents."""
+        parts = pr_url.strip("/").split("/")
+        return f"pr-{parts[-1]}-{parts[-4]}-{parts[-3]}"
+
+    def fetch_pr_branches(self, prs):
+        """Fetch the head of every PR into its own local branch in one git fetch."""
+        remote = "origin" if self.is_source_fork_owner else "source"
+        refspecs = " ".join(
+            f"+pull/{pr.number}/head:{self._pr_branch(pr.html_url)}" for pr in prs
+        )
+        print(f"Fetching {len(prs)} PRs from {remote}")
+        fetch_output = self._run_git(f"git fetch {remote} {refspecs} 2>&1")
+        print(f"Fetch output: {fetch_output}")
+
+        # One missing ref fails the whole fetch, so fall back to fetching PRs singly
+        if "fatal:" in fetch_output or "error:" in fetch_output:
+            for pr in prs:
+                pr_branch = self._pr_branch(pr.html_url)
+                fetch_output = self._run_git(
+                    f"git fetch {remote} +pull/{pr.number}/head:{pr_branch} 2>&1"
+                )
+                print(f"Fetch output for PR #{pr.number}: {fetch_output}")
+
+    def plan_merge_order(self, prs):
+        """Order fetched PRs so that as few as possible conflict when merged.
+
+        Args:
+            prs: PRs in chronological order
+
+        Returns:
+            list: The same PRs in the order to merge them
+        """
+        hunks_by_pr = {
+            pr.number: get_changed_hunks(
+                self._run_git,
+                self.context["head_branch"],
+                self._pr_branch(pr.html_url),
+            )
+            for pr in prs
+        }
+        plan = plan_merge_order([pr.number for pr in prs], hunks_by_pr)
+        self.context["merge_plan"] = plan
+
+        for number, conflicts in plan["conflict_graph"].items():
+            if conflicts:
+                print(f"PR #{number} may conflict with: {conflicts}")
+        log_key_value("Merge batches", plan["batches"])
+        log_key_value("Merge order", plan["order"])
+        log_key_value(
+            "Predicted conflicts",
+            f"{plan['predicted_conflicts']} (chronological order: "
+            f"{plan['baseline_conflicts']})",
+        )
+
+        prs_by_number = {pr.number: pr for pr in prs}
+        return [prs_by_number[number] for number in plan["order"]]
+
+    def merge_pr(self, pr):
+        """Merge a fetched PR branch into the head branch locally."""
+        pr_url = pr.html_url
         parts = pr_url.strip("/").split("/")
         pr_number = int(parts[-1])
         pr_repo_owner = parts[-4]
         pr_repo_name = parts[-3]
 
         try:
-            # Get the actual PR author from the GitHub API
-            gh = Github(self.context["github_token"])
-            repo = gh.get_repo(f"{pr_repo_owner}/{pr_repo_name}")
-            pr = repo.get_pull(pr_number)
             pr_author = pr.user.login  # Get the actual author's GitHub username
-
             print(f"PR #{pr_number} created by GitHub user: {pr_author}")
 
-            # Create unique branch name for PR content
-            pr_branch = f"pr-{pr_number}-{pr_repo_owner}-{pr_repo_name}"
+            pr_branch = self._pr_branch(pr_url)
             print(
                 f"Attempting to merge PR #{pr_number} from {pr_repo_owner}/{pr_repo_name}"
             )
-            print(f"Creating branch: {pr_branch}")
-            print(f"Current directory: {os.getcwd()}")
-            print("Git remotes:")
-            remotes_output = os.popen("git remote -v 2>&1").read()
-            print(remotes_output)
-
-            # Always create a new branch with PR contents, regardless of fork ownership
-            if self.is_source_fork_owner:
-                # Even though we own the fork, create a new branch from the PR's HEAD
-                print("Fetching PR from origin (we own the fork)")
-                fetch_output = os.popen(
-                    f"git fetch origin pull/{pr_number}/head 2>&1"
-                ).read()
-                print(f"Fetch output: {fetch_output}")
-                checkout_output = os.popen(
-                    f"git checkout -b {pr_branch} FETCH_HEAD 2>&1"
-                ).read()
-                print(f"Checkout output: {checkout_output}")
-            else:
-                # Fetch PR from source fork into new branch
-                print("Fetching PR from source remote")
-                fetch_output = os.popen(
-                    f"git fetch source pull/{pr_number}/head 2>&1"
-                ).read()
-                print(f"Fetch output: {fetch_output}")
-                checkout_output = os.popen(
-                    f"git checkout -b {pr_branch} FETCH_HEAD 2>&1"
-                ).read()
-                print(f"Checkout output: {checkout_output}")
-
-            # Push PR branch to our fork for auditing
-            print(f"Pushing branch {pr_branch} to origin")
-            push_output = os.popen(f"git push origin {pr_branch} 2>&1").read()
-            print(f"Push output: {push_output}")
-
-            # Try to merge into head branch
-            print(f"Checking out head branch: {self.context['head_branch']}")
-            checkout_output = os.popen(
-                f"git checkout {self.context['head_branch']} 2>&1"
-            ).read()
-            print(f"Checkout output: {checkout_output}")
+            if not self._run_git(
+                f"git rev-parse --verify --quiet refs/heads/{pr_branch}"
+            ).strip():
+                raise Exception(f"Branch {pr_branch} was not fetched")
 
             print(f"Attempting to merge {pr_branch}")
-            merge_output = os.popen(
+            merge_output = self._run_git(
                 f"git merge --no-commit --no-ff {pr_branch} 2>&1"
-            ).read()
+            )
             print(f"Merge output: {merge_output}")
 
-            # Handle conflicts through the ConflictResolutionPhase
+            # Only PRs that actually conflict go through the ConflictResolutionPhase
             if "CONFLICT" in merge_output:
                 print("Merge conflicts detected, attempting resolution")
-                self.context["current_files"] = get_current_files()
+                self.conflicts_resolved += 1
+                conflicted_files = self._run_git(
+                    "git diff --name-only --diff-filter=U"
+                ).splitlines()
+                self.context["current_files"] = get_repo_context(
+                    self.context["repo_path"], pr.title, conflicted_files
+                )
                 resolution_phase = ConflictResolutionPhase(
                     workflow=self,
                     conversation_id=getattr(
@@ -315,23 +359,17 @@ class MergeConflictWorkflow(Workflow):
 
             # Commit the merge with branch name and PR URL
             print("Committing merge")
-            commit_output = os.popen(
+            commit_output = self._run_git(
                 f'git commit -m "Merged branch {pr_branch} for PR {pr_url}" 2>&1'
-            ).read()
+            )
             print(f"Commit output: {commit_output}")
 
-            print(f"Pushing merged changes to {self.context['head_branch']}")
-            push_output = os.popen(
-                f"git push origin {self.context['head_branch']} 2>&1"
-            ).read()
-            print(f"Push output: {push_output}")
-
             # Only track successfully merged PRs
             self.context["merged_prs"].append(pr_number)
             self.context["pr_details"].append(
                 {
                     "number": pr_number,
-                    "title": pr_title,
+                    "title": pr.title,
                     "url": pr_url,
                     "source_owner": pr_author,  # Use the actual PR author instead of repo owner
                 }
@@ -341,18 +379,36 @@ class MergeConflictWorkflow(Workflow):
 
         except Exception as e:
             log_error(e, f"Failed to merge PR #{pr_number}")
-            print(f"Current directory: {os.getcwd()}")
+            print(f"Repository path: {self.context['repo_path']}")
             print("Git status:")
-            status_output = os.popen("git status 2>&1").read()
+            status_output = self._run_git("git status 2>&1")
             print(status_output)
             print("Git branch:")
-            branch_output = os.popen("git branch 2>&1").read()
+            branch_output = self._run_git("git branch 2>&1")
             print(branch_output)
             print("Git log:")
-            log_output = os.popen("git log --oneline -n 5 2>&1").read()
+            log_output = self._run_git("git log --oneline -n 5 2>&1")
             print(log_output)
             return {"success": False, "message": str(e)}
 
+    def push_merged_branches(self):
+        """Push the head branch and every merged PR branch in a single push.
+
+        The PR branches are pushed so auditors can inspect each PR's contents.
+        """
+        branches = [self.context["head_branch"]] + [
+            self._pr_branch(pr["url"]) for pr in self.context["pr_details"]
+        ]
+        print(f"Pushing {len(branches)} branches to origin")
+        push_output = self._run_git(f"git push origin {' '.join(branches)} 2>&1")
+        print(f"Push output: {push_output}")
+        if "fatal:" in push_output or "error:" in push_output:
+            return {"success": False, "message": push_output}
+        # The cached fork and its PRs are out of date after the push
+        fork = self.context["working_fork"]
+        invalidate(f"{fork['owner']}/{fork['name']}")
+        return {"success": True, "message": f"Pushed {len(branches)} branches"}
+
     def run(self):
         """Execute the merge conflict workflow."""
         try:
@@ -361,9 +417,9 @@ class MergeConflictWorkflow(Workflow):
                 return None
 
             # Get list of PRs to process
-            gh = Github(self.context["github_token"])
-            source_fork = gh.get_repo(
-                f"{self.source_fork_owner}/{self.context['source_fork']['name']}"
+            source_fork = get_repo(
+                f"{self.source_fork_owner}/{self.context['source_fork']['name']}",
+                self.context["github_token"],
             )
             open_prs = list(
                 source_fork.get_pulls(
@@ -381,10 +437,9 @@ class MergeConflictWorkflow(Workflow):
                 log_error(Exception("No open PRs found"), "No PRs to process")
                 return None
 
-            # Process each PR in chronological order
+            # Validate every PR before touching the repository
+            prs_to_merge = []
             for pr in open_prs:
-                log_section(f"Processing PR #{pr.number}")
-
                 try:
                     # Validate PR and check if we should merge it
                     should_merge = self.validate_pr_for_merge(pr)
@@ -393,29 +448,48 @@ class MergeConflictWorkflow(Workflow):
                             f"Skipping PR #{pr.number} - not in PR list or wrong staking key"
                         )
                         continue
-
-                    # If we get here, validation passed and we should merge
-                    result = self.merge_pr(pr_url=pr.html_url, pr_title=pr.title)
-                    if not result["success"]:
-                        log_error(
-                            Exception(result.get("message", "Unknown error")),
-                            f"Failed to merge PR #{pr.number}",
-                        )
-                        return None
+                    prs_to_merge.append(pr)
 
                 except ValueError as e:
                     log_error(e, f"Validation failed for PR #{pr.number}")
                     return None
 
+            # Fetch all PRs at once, then merge them locally in planned order
+            if prs_to_merge:
+                self.fetch_pr_branches(prs_to_merge)
+                prs_to_merge = self.plan_merge_order(prs_to_merge)
+
+            for pr in prs_to_merge:
+                log_section(f"Processing PR #{pr.number}")
+                result = self.merge_pr(pr)
+                if not result["success"]:
+                    log_error(
+                        Exception(result.get("message", "Unknown error")),
+                        f"Failed to merge PR #{pr.number}",
+                    )
+                    return None
+
+            log_key_value("Conflicts resolved", self.conflicts_resolved)
+
             if not self.context["merged_prs"]:
                 log_error(
                     Exception("No PRs were merged"), "No PRs were successfully merged"
                 )
                 return None
 
+            push_result = self.push_merged_branches()
+            if not push_result["success"]:
+                log_error(
+                    Exception(push_result["message"]), "Failed to push merged branches"
+                )
+                return None
+
             # Run tests and fix any issues
             print("\nRunning test verification phase")
-            self.context["current_files"] = get_current_files()
+            self.context["current_files"] = get_repo_context(
+                self.context["repo_path"],
+                "\n".join(pr["title"] for pr in self.context["pr_details"]),
+            )
             test_phase = TestVerificationPhase(
                 workflow=self, conversation_id=self.conversation_id
             )
@@ -453,6 +527,9 @@ class MergeConflictWorkflow(Workflow):
                         )
                         return None
                     log_key_value("PR created successfully", pr_url)
+                    invalidate(
+                        f"{self.context['repo_owner']}/{self.context['repo_name']}"
+                    )
                     return pr_url
                 else:
                     error = pr_result.get("error", "Unknown error")
@@ -473,5 +550,5 @@ class MergeConflictWorkflow(Workflow):
 
     def cleanup(self):
         """Clean up repository."""
-        if hasattr(self, "original_dir") and "repo_path" in self.context:
-            cleanup_repository(self.original_dir, self.context["repo_path"])
+        if "repo_path" in self.context:
+            cleanup_repository(self.context["repo_path"])
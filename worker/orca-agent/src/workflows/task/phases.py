@@ -6,7 +6,7 @@ from prometheus_swarm.workflows.base import WorkflowPhase, Workflow, requires_co
 
 @requires_context(
     templates={
-        "current_files": List[str],  # List of files in the repository
+        "current_files": str,  # Tree of the files in the repository
         "repo_path": str,  # Path to the repository
         "repo_owner": str,  # Leader's username
         "repo_name": str,  # Repository name
@@ -36,10 +36,11 @@ class BranchCreationPhase(WorkflowPhase):
 
 @requires_context(
     templates={
-        "current_files": List[str],  # List of files in the repository
+        "current_files": str,  # Tree of the files in the repository
         "repo_path": str,  # Path to the repository
         "todo": str,  # Todo task description
         "acceptance_criteria": List[str],  # List of acceptance criteria
+        "relevant_files": str,  # Excerpts of the files relevant to the todo
     },
     tools={
         "repo_path": str,  # Path to the repository for git operations
@@ -53,6 +54,9 @@ class ImplementationPhase(WorkflowPhase):
             available_tools=[
                 "read_file",
                 "list_files",
+                "search_code",
+                "find_symbol",
+                "find_references",
                 "write_file",
                 "delete_file",
                 "run_tests",
@@ -67,10 +71,11 @@ class ImplementationPhase(WorkflowPhase):
 
 @requires_context(
     templates={
-        "current_files": List[str],  # List of files in the repository
+        "current_files": str,  # Tree of the files in the repository
         "repo_path": str,  # Path to the repository
         "todo": str,  # Todo task description
         "acceptance_criteria": List[str],  # List of acceptance criteria
+        "relevant_files": str,  # Excerpts of the files relevant to the todo
         "previous_issues": str,  # Issues from previous validation
     },
     tools={
@@ -85,6 +90,9 @@ class FixImplementationPhase(WorkflowPhase):
             available_tools=[
                 "read_file",
                 "list_files",
+                "search_code",
+                "find_symbol",
+                "find_references",
                 "edit_file",
                 "delete_file",
                 "run_tests",
@@ -97,7 +105,7 @@ class FixImplementationPhase(WorkflowPhase):
 
 @requires_context(
     templates={
-        "current_files": List[str],  # List of files in the repository
+        "current_files": str,  # Tree of the files in the repository
         "repo_path": str,  # Path to the repository
         "todo": str,  # Todo task description
         "acceptance_criteria": List[str],  # List of acceptance criteria
@@ -114,6 +122,7 @@ class ValidationPhase(WorkflowPhase):
             available_tools=[
                 "read_file",
                 "list_files",
+                "search_code",
                 "run_tests",
                 "validate_implementation",
             ],
@@ -124,7 +133,7 @@ class ValidationPhase(WorkflowPhase):
 
 @requires_context(
     templates={
-        "current_files": List[str],  # List of files in the repository
+        "current_files": str,  # Tree of the files in the repository
         "repo_path": str,  # Path to the repository
         "repo_owner": str,  # Leader's username for PR target
         "repo_name": str,  # Repository name for PR target
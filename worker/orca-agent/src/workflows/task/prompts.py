@@ -26,7 +26,9 @@ PROMPTS = {
     "implement_todo": (
         "You are working on implementing the following task:\n"
         "{todo}\n\n"
-        "All available files: {current_files}\n\n"
+        "All available files:\n{current_files}\n\n"
+        "Excerpts of the files most likely relevant to the task "
+        "(read a file in full only if you need more of it):\n{relevant_files}\n\n"
         "IMPORTANT: ALWAYS use relative paths (e.g., 'src/file.py' not '/src/file.py')\n\n"
         "Use the available tools to:\n"
         "Create necessary files using relative paths\n"
@@ -45,7 +47,9 @@ PROMPTS = {
         "{previous_issues}\n\n"
         "Continuing in the same conversation, you are working on fixing the implementation for:\n"
         "{todo}\n\n"
-        "Available files: {current_files}\n\n"
+        "Available files:\n{current_files}\n\n"
+        "Excerpts of the files most likely relevant to the task "
+        "(read a file in full only if you need more of it):\n{relevant_files}\n\n"
         "IMPORTANT: Always use relative paths (e.g., 'src/file.py' not '/src/file.py')\n\n"
         "Use the available tools to:\n"
         "1. Review and understand the reported problems\n"
@@ -58,7 +62,7 @@ PROMPTS = {
     "validate_criteria": (
         "You are validating the implementation of the following task:\n"
         "{todo}\n\n"
-        "Available files: {current_files}\n\n"
+        "Available files:\n{current_files}\n\n"
         "Acceptance Criteria:\n"
         "{acceptance_criteria}\n\n"
         "IMPORTANT: Always use relative paths (e.g., 'src/file.py' not '/src/file.py')\n\n"
@@ -97,7 +101,7 @@ PROMPTS = {
         "You are creating a pull request for the following task:\n"
         "Task Description:\n"
         "{todo}\n\n"
-        "Available files: {current_files}\n\n"
+        "Available files:\n{current_files}\n\n"
         "IMPORTANT: Always use relative paths (e.g., 'src/file.py' not '/src/file.py')\n\n"
         "Steps to create the pull request:\n"
         "1. First examine the available files to understand the implementation\n"
@@ -0,0 +1,312 @@
+"""Lexical retrieval of the files relevant to a todo.
+
+Files are ranked with BM25 over the words of their paths and contents,
+identifiers split on camelCase and snake_case. The index of a commit is built
+from the git objects of its tree and cached by tree SHA, so checkouts of the
+same commit share it. Files changed in the working tree are indexed again on
+every query, on top of the cached commit index.
+
+The implementation phases get excerpts of the top ranked files in their first
+prompt, instead of having to find them with read_file and list_files calls.
+"""
+
+import math
+import os
+import re
+import subprocess
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "5"))
+# Lines of each file shown, around its most relevant part
+RETRIEVAL_EXCERPT_LINES = int(os.getenv("RETRIEVAL_EXCERPT_LINES", "40"))
+# Larger files are not indexed
+RETRIEVAL_MAX_FILE_BYTES = int(os.getenv("RETRIEVAL_MAX_FILE_BYTES", "200000"))
+# Commit indexes kept in memory
+RETRIEVAL_CACHE_SIZE = int(os.getenv("RETRIEVAL_CACHE_SIZE", "4"))
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+# Path words count as this many occurrences in the file
+PATH_WEIGHT = 3
+MAX_LINE_CHARS = 300
+
+_IDENTIFIER = re.compile(r"[A-Za-z][A-Za-z0-9_]*")
+_PART = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+_STOPWORDS = set(
+    "a an and are as at be by can for from has have in into is it its of on or "
+    "should so that the this to was were when which will with must all any each "
+    "use using new add make ensure test tests".split()
+)
+
+_lock = threading.Lock()
+# Tree SHA -> commit index
+_indexes: "OrderedDict[str, dict]" = OrderedDict()
+_stats = {
+    "queries": 0,
+    "index_builds": 0,
+    "index_cache_hits": 0,
+    "files_preloaded": 0,
+    "preloaded_files_read": 0,
+    "turns_saved": 0,
+}
+
+
+def _terms(text: str) -> List[str]:
+    """Words of a text: identifiers, lowercased, and the parts of compound ones."""
+    terms = []
+    for identifier in _IDENTIFIER.findall(text):
+        parts = [part.lower() for part in _PART.findall(identifier)]
+        if len(parts) > 1:
+            terms.append(identifier.lower())
+        terms.extend(part for part in parts if len(part) > 1)
+    return terms
+
+
+def _document(path: str, content: bytes) -> Optional[Counter]:
+    """Term frequencies of a file, or None if it is binary."""
+    if b"\0" in content[:8000]:
+        return None
+    terms = Counter(_terms(content.decode("utf-8", errors="ignore")))
+    for term in _terms(path):
+        terms[term] += PATH_WEIGHT
+    return terms
+
+
+def _git(repo_path: str, *args: str, input: bytes = None) -> bytes:
+    return subprocess.run(
+        ["git", *args], cwd=repo_path, input=input, capture_output=True, check=True
+    ).stdout
+
+
+def _tree_sha(repo_path: str) -> str:
+    return _git(repo_path, "rev-parse", "HEAD^{tree}").decode().strip()
+
+
+def _read_blobs(repo_path: str, shas: List[str]) -> List[bytes]:
+    """Read blobs with one ``git cat-file --batch`` call, in order."""
+    if not shas:
+        return []
+    output = _git(repo_path, "cat-file", "--batch", input="\n".join(shas).encode())
+    blobs, offset = [], 0
+    for _ in shas:
+        header_end = output.index(b"\n", offset)
+        size = int(output[offset:header_end].split()[2])
+        start = header_end + 1
+        blobs.append(output[start : start + size])
+        # Each blob is followed by a newline
+        offset = start + size + 1
+    return blobs
+
+
+def _build_index(repo_path: str, tree_sha: str) -> dict:
+    """Index the files of a commit's tree."""
+    paths, shas = [], []
+    for entry in _git(repo_path, "ls-tree", "-r", "-z", "-l", tree_sha).split(b"\0"):
+        if not entry:
+            continue
+        info, path = entry.split(b"\t", 1)
+        mode, kind, sha, size = info.split()
+        # Skip submodules, symlinks and large files
+        if kind != b"blob" or mode == b"120000":
+            continue
+        if int(size) > RETRIEVAL_MAX_FILE_BYTES:
+            continue
+        paths.append(path.decode("utf-8", errors="replace"))
+        shas.append(sha.decode())
+
+    index = {"postings": {}, "lengths": {}}
+    for path, content in zip(paths, _read_blobs(repo_path, shas)):
+        terms = _document(path, content)
+        if terms is not None:
+            _add_document(index, path, terms)
+    return index
+
+
+def _add_document(index: dict, path: str, terms: Counter):
+    for term, frequency in terms.items():
+        index["postings"].setdefault(term, {})[path] = frequency
+    index["lengths"][path] = sum(terms.values())
+
+
+def _get_index(repo_path: str) -> dict:
+    tree_sha = _tree_sha(repo_path)
+    with _lock:
+        index = _indexes.get(tree_sha)
+        if index is not None:
+            _indexes.move_to_end(tree_sha)
+            _stats["index_cache_hits"] += 1
+            return index
+
+    # Built outside the lock, a concurrent build of the same tree is harmless
+    index = _build_index(repo_path, tree_sha)
+    with _lock:
+        _indexes[tree_sha] = index
+        while len(_indexes) > RETRIEVAL_CACHE_SIZE:
+            _indexes.popitem(last=False)
+        _stats["index_builds"] += 1
+    return index
+
+
+def _changed_paths(repo_path: str) -> Set[str]:
+    """Paths that differ between the working tree and HEAD, including untracked."""
+    output = _git(
+        repo_path, "status", "--porcelain", "-z", "--untracked-files=all"
+    ).decode("utf-8", errors="replace")
+    entries = iter(output.split("\0"))
+    paths = set()
+    for entry in entries:
+        if not entry:
+            continue
+        paths.add(entry[3:])
+        # Renames and copies are followed by their source path
+        if entry[0] in "RC":
+            paths.add(next(entries, ""))
+    paths.discard("")
+    return paths
+
+
+def _working_tree_documents(repo_path: str, paths: Set[str]) -> Dict[str, Counter]:
+    documents = {}
+    for path in paths:
+        full_path = os.path.join(repo_path, path)
+        if not os.path.isfile(full_path) or os.path.islink(full_path):
+            continue
+        if os.path.getsize(full_path) > RETRIEVAL_MAX_FILE_BYTES:
+            continue
+        with open(full_path, "rb") as f:
+            terms = _document(path, f.read())
+        if terms is not None:
+            documents[path] = terms
+    return documents
+
+
+def rank_files(
+    repo_path: str, query: str, top_k: int = RETRIEVAL_TOP_K
+) -> List[Tuple[str, float]]:
+    """Rank a checkout's files by BM25 relevance to a query.
+
+    Args:
+        repo_path: Path to the checkout
+        query: Text to match, e.g. the todo and its acceptance criteria
+        top_k: Number of files to return
+
+    Returns:
+        List of (path, score) pairs, best first
+    """
+    query_terms = {t for t in _terms(query) if t not in _STOPWORDS}
+    if not query_terms:
+        return []
+    index = _get_index(repo_path)
+    changed = _changed_paths(repo_path)
+    overlay = _working_tree_documents(repo_path, changed)
+
+    # Replace the committed version of changed files with the working tree one
+    lengths = {p: n for p, n in index["lengths"].items() if p not in changed}
+    lengths.update({p: sum(terms.values()) for p, terms in overlay.items()})
+    if not lengths:
+        return []
+    average_length = sum(lengths.values()) / len(lengths)
+
+    scores = Counter()
+    for term in query_terms:
+        postings = {
+            p: f for p, f in index["postings"].get(term, {}).items() if p not in changed
+        }
+        postings.update(
+            {p: terms[term] for p, terms in overlay.items() if term in terms}
+        )
+        if not postings:
+            continue
+        idf = math.log(1 + (len(lengths) - len(postings) + 0.5) / (len(postings) + 0.5))
+        for path, frequency in postings.items():
+            norm = K1 * (1 - B + B * lengths[path] / average_length)
+            scores[path] += idf * frequency * (K1 + 1) / (frequency + norm)
+    return scores.most_common(top_k)
+
+
+def _excerpt(lines: List[str], query_terms: Set[str]) -> Tuple[int, int]:
+    """Pick the window of lines with the most query term matches, 0-based [start, end)."""
+    if len(lines) <= RETRIEVAL_EXCERPT_LINES:
+        return 0, len(lines)
+    hits = [len(query_terms.intersection(_terms(line))) for line in lines]
+    window = sum(hits[:RETRIEVAL_EXCERPT_LINES])
+    best, best_start = window, 0
+    for start in range(1, len(lines) - RETRIEVAL_EXCERPT_LINES + 1):
+        window += hits[start + RETRIEVAL_EXCERPT_LINES - 1] - hits[start - 1]
+        if window > best:
+            best, best_start = window, start
+    return best_start, best_start + RETRIEVAL_EXCERPT_LINES
+
+
+def preload_relevant_files(
+    repo_path: str, query: str, top_k: int = RETRIEVAL_TOP_K
+) -> dict:
+    """Render excerpts of the files most relevant to a query for a prompt.
+
+    Args:
+        repo_path: Path to the checkout
+        query: Text to match, e.g. the todo and its acceptance criteria
+        top_k: Number of files to excerpt
+
+    Returns:
+        dict: "text" with the rendered excerpts and "paths" of the excerpted files
+    """
+    with _lock:
+        _stats["queries"] += 1
+    try:
+        ranked = rank_files(repo_path, query, top_k)
+    except (subprocess.CalledProcessError, OSError) as e:
+        return {"text": f"No file excerpts available: {e}", "paths": []}
+    if not ranked:
+        return {"text": "No files matched the task description.", "paths": []}
+
+    query_terms = {t for t in _terms(query) if t not in _STOPWORDS}
+    sections, paths = [], []
+    for path, _ in ranked:
+        try:
+            with open(os.path.join(repo_path, path), errors="replace") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            continue
+        start, end = _excerpt(lines, query_terms)
+        numbered = "\n".join(
+            f"{number:>5}  {line[:MAX_LINE_CHARS]}"
+            for number, line in enumerate(lines[start:end], start + 1)
+        )
+        sections.append(
+            f"{path} (lines {start + 1}-{end} of {len(lines)}):\n{numbered}"
+        )
+        paths.append(path)
+
+    with _lock:
+        _stats["files_preloaded"] += len(paths)
+    return {"text": "\n\n".join(sections), "paths": paths}
+
+
+def record_preload_outcome(preloaded: List[str], read: Set[str]) -> int:
+    """Record which preloaded files the model still read in full.
+
+    Every preloaded file the model didn't read is counted as one read_file turn
+    saved. This is an estimate: it doesn't count list_files calls saved, and a
+    model might not have read every excerpted file without the excerpts.
+
+    Returns:
+        int: Estimated tool turns saved
+    """
+    read_count = len(set(preloaded) & read)
+    saved = len(preloaded) - read_count
+    with _lock:
+        _stats["preloaded_files_read"] += read_count
+        _stats["turns_saved"] += saved
+    return saved
+
+
+def get_retrieval_stats() -> dict:
+    """Get counts of queries, index builds and preloaded files for this process."""
+    with _lock:
+        stats = dict(_stats)
+        stats["cached_indexes"] = len(_indexes)
+    return stats
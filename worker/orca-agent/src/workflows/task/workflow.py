@@ -2,7 +2,6 @@
 
 import os
 import time
-from github import Github
 from git import Repo
 from prometheus_swarm.workflows.base import Workflow
 from prometheus_swarm.utils.logging import (
@@ -11,18 +10,24 @@ from prometheus_swarm.utils.logging import (
     log_error,
     log_value,
 )
-from prometheus_swarm.workflows.utils import (
+from src.workflows.utils import (
     check_required_env_vars,
     validate_github_auth,
     setup_repository,
     cleanup_repository,
-    get_current_files,
+    get_repo_context,
 )
 
-from src.workflows.task import phases
+from src.utils.github_client import get_pull, invalidate
+from src.tools.file_operations import file_index
+from src.workflows.task import phases, retrieval
 
 
 class TaskWorkflow(Workflow):
+    # Implementation only builds on top of recent history
+    clone_strategy = "shallow"
+    # Merging dependency PRs needs their merge base, which a shallow clone may lack
+    dependency_clone_strategy = "blobless"
 
     def __init__(
         self,
@@ -75,16 +80,18 @@ class TaskWorkflow(Workflow):
         # Set up repository
         log_section("SETTING UP REPOSITORY")
 
-        # Initialize GitHub client
-        gh = Github(self.context["github_token"])
-
         # Always fork from the aggregator repo first
         repo_url = f"https://github.com/{self.context['repo_owner']}/{self.context['repo_name']}"
 
+        if self.context["dependency_pr_urls"]:
+            clone_strategy = self.dependency_clone_strategy
+        else:
+            clone_strategy = self.clone_strategy
         result = setup_repository(
             repo_url,
             github_token=self.context["github_token"],
             github_username=self.context["github_username"],
+            clone_strategy=clone_strategy,
         )
 
         if not result["success"]:
@@ -92,10 +99,9 @@ class TaskWorkflow(Workflow):
 
         # Update context with setup results
         self.context["repo_path"] = result["data"]["clone_path"]
-        self.original_dir = result["data"]["original_dir"]
-
-        # Enter repo directory
-        os.chdir(self.context["repo_path"])
+        self.fork_full_name = (
+            f"{result['data']['fork_owner']}/{result['data']['fork_name']}"
+        )
 
         # If we have dependencies, merge them in
         if self.context["dependency_pr_urls"]:
@@ -111,8 +117,9 @@ class TaskWorkflow(Workflow):
                     pr_number = int(parts[-1])
 
                     # Get the PR
-                    source_repo = gh.get_repo(f"{owner}/{repo_name}")
-                    pr = source_repo.get_pull(pr_number)
+                    pr = get_pull(
+                        f"{owner}/{repo_name}", pr_number, self.context["github_token"]
+                    )
 
                     # Log PR details
                     log_key_value("Processing dependency PR", pr_url)
@@ -147,12 +154,43 @@ class TaskWorkflow(Workflow):
                     raise
 
         # Get current files for context
-        self.context["current_files"] = get_current_files()
+        self.context["current_files"] = self._get_repo_context()
+
+    def _todo_text(self):
+        """The todo and its acceptance criteria as one text."""
+        criteria = self.context.get("acceptance_criteria") or []
+        if isinstance(criteria, str):
+            criteria = [criteria]
+        return "\n".join([self.context.get("todo") or "", *criteria])
+
+    def _get_repo_context(self):
+        """Render the repository's files, ranking paths related to the todo first."""
+        return get_repo_context(self.context["repo_path"], self._todo_text())
+
+    def _run_implementation_phase(self, phase_class, conversation_id):
+        """Run an implementation phase with excerpts of the most relevant files.
+
+        The excerpts save the model the read_file turns it would spend finding
+        the files. Preloaded files it didn't read anyway are counted as saved
+        turns.
+        """
+        repo_path = self.context["repo_path"]
+        preload = retrieval.preload_relevant_files(repo_path, self._todo_text())
+        self.context["relevant_files"] = preload["text"]
+        log_key_value("Preloaded files", ", ".join(preload["paths"]) or "none")
+
+        file_index.track_reads(repo_path)
+        try:
+            return phase_class(workflow=self, conversation_id=conversation_id).execute()
+        finally:
+            read = file_index.stop_tracking_reads(repo_path)
+            saved = retrieval.record_preload_outcome(preload["paths"], read)
+            log_key_value("Tool turns saved by preloaded files", saved)
 
     def cleanup(self):
         """Clean up repository."""
-        if hasattr(self, "original_dir") and "repo_path" in self.context:
-            cleanup_repository(self.original_dir, self.context["repo_path"])
+        if "repo_path" in self.context:
+            cleanup_repository(self.context["repo_path"])
 
     def run(self):
         """Execute the task workflow."""
@@ -175,7 +213,7 @@ class TaskWorkflow(Workflow):
                 )
 
                 # Get current files
-                self.context["current_files"] = get_current_files()
+                self.context["current_files"] = self._get_repo_context()
 
                 # Run implementation
                 phase_class = (
@@ -183,10 +221,9 @@ class TaskWorkflow(Workflow):
                     if attempt == 0
                     else phases.FixImplementationPhase
                 )
-                implementation_phase = phase_class(
-                    workflow=self, conversation_id=branch_phase.conversation_id
+                implementation_result = self._run_implementation_phase(
+                    phase_class, branch_phase.conversation_id
                 )
-                implementation_result = implementation_phase.execute()
 
                 if not implementation_result:
                     return None
@@ -225,7 +262,7 @@ class TaskWorkflow(Workflow):
                 time.sleep(5)  # Brief pause before retry
 
             # Create PR
-            self.context["current_files"] = get_current_files()
+            self.context["current_files"] = self._get_repo_context()
 
             # Base was already set in setup()
             log_value(
@@ -240,6 +277,9 @@ class TaskWorkflow(Workflow):
             if pr_result.get("success"):
                 pr_url = pr_result.get("data", {}).get("pr_url")
                 log_key_value("PR created successfully", pr_url)
+                # The branch was pushed to the fork and a PR opened upstream
+                invalidate(self.fork_full_name)
+                invalidate(f"{self.context['repo_owner']}/{self.context['repo_name']}")
                 return pr_url
             else:
                 log_error(Exception(pr_result.get("error")), "PR creation failed")
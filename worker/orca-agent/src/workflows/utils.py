@@ -6,9 +6,13 @@ from github import Github
 from git import Repo
 from prometheus_swarm.utils.logging import log_key_value, log_error
 from src.tools.file_operations.implementations import list_files
+from src.tools.file_operations import code_search, file_index, symbol_index
 from src.tools.github_operations.parser import extract_section
-from src.utils.signatures import verify_and_parse_signature
-from typing import Optional, Tuple
+from src.utils.signatures import verify_and_parse_signatures
+from src.utils.repo_cache import clone_from_cache, release_clone
+from src.utils.github_client import get_repo, get_user
+from src.utils.repo_context import render_repo_context
+from typing import List, Optional, Tuple
 
 
 def get_fork_name(
@@ -24,20 +28,17 @@ def get_fork_name(
     Returns:
         str: The unique fork name in the format {upstream_repo_name}-{source_owner}
     """
-    # Set up GitHub client
-    if isinstance(github_token, str):
-        gh = Github(github_token)
-    elif isinstance(github_token, Github):
-        gh = github_token
-    else:
-        raise ValueError("GitHub token is required")
-
     # Extract owner/repo from URL
     parts = source_repo_url.strip("/").split("/")
     repo_owner, repo_name = parts[-2:]
 
     # Get the source repo
-    source_repo = gh.get_repo(f"{repo_owner}/{repo_name}")
+    if isinstance(github_token, str):
+        source_repo = get_repo(f"{repo_owner}/{repo_name}", github_token)
+    elif isinstance(github_token, Github):
+        source_repo = github_token.get_repo(f"{repo_owner}/{repo_name}")
+    else:
+        raise ValueError("GitHub token is required")
 
     # Get the upstream repo name:
     # If source_repo is a fork, get name from its parent (upstream)
@@ -63,8 +64,7 @@ def check_required_env_vars(env_vars: list[str]):
 def validate_github_auth(github_token: str, github_username: str):
     """Validate GitHub authentication."""
     try:
-        gh = Github(github_token)
-        user = gh.get_user()
+        user = get_user(github_token=github_token)
         username = user.login
         if username != github_username:
             raise ValueError(
@@ -97,6 +97,9 @@ def setup_repository(
     github_token: str = None,
     github_username: str = None,
     skip_fork: bool = False,
+    clone_strategy: str = "full",
+    depth: Optional[int] = None,
+    sparse_paths: Optional[List[str]] = None,
 ) -> dict:
     """Set up a repository by cloning and configuring it.
 
@@ -105,6 +108,10 @@ def setup_repository(
         github_token: Optional GitHub token for authentication
         github_username: Optional GitHub username for Git config
         skip_fork: Optional flag to skip forking and clone directly
+        clone_strategy: How much of the repository to clone ("full", "shallow",
+            "blobless" or "sparse")
+        depth: History depth for shallow clones
+        sparse_paths: Paths to check out for sparse clones
 
     Returns:
         dict: Result with success status, repository details, and paths
@@ -135,32 +142,27 @@ def setup_repository(
         counter = 0
         while True:
             candidate_path = os.path.join(base_dir, f"repo_{counter}")
-            if not os.path.exists(candidate_path):
+            try:
+                # Reserve the path atomically so concurrent workflows never share it
+                os.makedirs(candidate_path)
                 repo_path = candidate_path
                 break
-            counter += 1
-
-        # Clean existing repository
-        if os.path.exists(repo_path):
-            shutil.rmtree(repo_path)
-
-        # Create parent directory
-        os.makedirs(os.path.dirname(repo_path), exist_ok=True)
+            except FileExistsError:
+                counter += 1
 
-        # Save original directory
-        original_dir = os.getcwd()
-
-        # Add GitHub token to URL for authentication
-        if github_token and "github.com" in clone_url:
-            auth_url = clone_url.replace("https://", f"https://{github_token}@")
-        else:
-            auth_url = clone_url
-
-        # Clone the repository
+        # Clone the repository, borrowing objects from the local mirror of the upstream
         log_key_value("Cloning repository", clone_url)
         log_key_value("Clone path", repo_path)
 
-        repo = Repo.clone_from(auth_url, repo_path)
+        repo = clone_from_cache(
+            repo_url,
+            clone_url,
+            repo_path,
+            github_token,
+            strategy=clone_strategy,
+            depth=depth,
+            sparse_paths=sparse_paths,
+        )
 
         # Configure Git user info if username provided
         if github_username:
@@ -175,7 +177,6 @@ def setup_repository(
             "message": "Successfully set up repository",
             "data": {
                 "clone_path": repo_path,
-                "original_dir": original_dir,
                 "repo": repo,
                 "fork_url": clone_url,
                 "fork_owner": fork_owner,
@@ -194,27 +195,48 @@ def setup_repository(
         }
 
 
-def cleanup_repository(original_dir: str, repo_path: str):
-    """Clean up repository directory and return to original directory.
+def cleanup_repository(repo_path: str):
+    """Clean up repository directory.
 
     Args:
-        original_dir: Original directory to return to
         repo_path: Repository path to clean up
     """
-    os.chdir(original_dir)
+    # Drop the checkout's search and symbol indexes while its path still resolves
+    code_search.forget(repo_path)
+    symbol_index.forget(repo_path)
     if os.path.exists(repo_path):
         shutil.rmtree(repo_path)
+    file_index.invalidate(repo_path)
+    release_clone(repo_path)
 
 
-def get_current_files():
+def get_current_files(repo_path: str):
     """Get current files in repository."""
-    files_result = list_files(".")
+    files_result = list_files(".", repo_path=repo_path)
     if not files_result["success"]:
         raise Exception(f"Failed to get file list: {files_result['message']}")
 
     return files_result["data"]["files"]
 
 
+def get_repo_context(
+    repo_path: str, relevant_text: str = "", priority_paths: List[str] = ()
+) -> str:
+    """Get the repository's files as a token-budgeted tree for prompts.
+
+    Args:
+        repo_path: Repository path
+        relevant_text: Task text used to rank the paths to expand
+        priority_paths: Files or directories to expand before any other
+
+    Returns:
+        str: The rendered file tree
+    """
+    return render_repo_context(
+        get_current_files(repo_path), relevant_text, priority_paths
+    )
+
+
 def _fork_repository(
     repo_full_name: str,
     github_token: Optional[str] = None,
@@ -232,11 +254,10 @@ def _fork_repository(
     """
     try:
         token = github_token or os.environ["GITHUB_TOKEN"]
-        gh = Github(token)
-        source_repo = gh.get_repo(repo_full_name)
+        source_repo = get_repo(repo_full_name, token)
 
         # Get authenticated user
-        user = gh.get_user()
+        user = get_user(github_token=token)
         username = user.login
 
         # Use provided fork name or original repo name
@@ -244,7 +265,7 @@ def _fork_repository(
 
         # Check if fork already exists
         try:
-            fork = gh.get_repo(f"{username}/{repo_name}")
+            fork = get_repo(f"{username}/{repo_name}", token)
             log_key_value("Using existing fork", fork.html_url)
         except Exception:
             # Create fork if it doesn't exist
@@ -326,44 +347,72 @@ def verify_pr_signatures(
     Returns:
         bool: True if signatures are valid
     """
-    # Extract signatures using parser
-    staking_signature_section = extract_section(pr_body, "STAKING_KEY")
-
-    if not staking_signature_section:
-        print("Missing staking key signature")
-        return False
-
-    # Parse the signature sections to get the specific staking key's signatures
-    staking_parts = staking_signature_section.strip().split(":")
-
-    if len(staking_parts) != 2:
-        print("Invalid staking signature format")
-        return False
+    return verify_many_pr_signatures(
+        [
+            {
+                "pr_body": pr_body,
+                "task_id": task_id,
+                "round_number": round_number,
+                "expected_staking_key": expected_staking_key,
+                "expected_action": expected_action,
+            }
+        ]
+    )[0]
+
+
+def verify_many_pr_signatures(checks: List[dict]) -> List[bool]:
+    """Verify the signatures in many PR descriptions with one batch verification.
 
-    staking_key = staking_parts[0].strip()
-    staking_signature = staking_parts[1].strip()
-
-    # If expected staking key provided, verify it matches
-    if expected_staking_key and staking_key != expected_staking_key:
-        print(f"Staking key mismatch: {staking_key} != {expected_staking_key}")
-        return False
-
-    # Verify signature and validate payload
-    expected_values = {
-        "taskId": task_id,
-        "roundNumber": round_number,
-        "stakingKey": staking_key,
-    }
-    if expected_action:
-        expected_values["action"] = expected_action
-
-    result = verify_and_parse_signature(staking_signature, staking_key, expected_values)
-
-    if result.get("error"):
-        print(f"Invalid signature: {result['error']}")
-        return False
+    Args:
+        checks: One dict of verify_pr_signatures arguments per PR. task_id and
+            round_number may be left out to accept any task and round.
 
-    return True
+    Returns:
+        list: Whether each PR's signatures are valid, in the same order
+    """
+    valid = [False] * len(checks)
+    pending = []  # (index, staking_signature, staking_key, expected_values)
+    for index, check in enumerate(checks):
+        # Extract signatures using parser
+        staking_signature_section = extract_section(check["pr_body"], "STAKING_KEY")
+
+        if not staking_signature_section:
+            print("Missing staking key signature")
+            continue
+
+        # Parse the signature sections to get the specific staking key's signatures
+        staking_parts = staking_signature_section.strip().split(":")
+
+        if len(staking_parts) != 2:
+            print("Invalid staking signature format")
+            continue
+
+        staking_key = staking_parts[0].strip()
+        staking_signature = staking_parts[1].strip()
+
+        # If expected staking key provided, verify it matches
+        expected_staking_key = check.get("expected_staking_key")
+        if expected_staking_key and staking_key != expected_staking_key:
+            print(f"Staking key mismatch: {staking_key} != {expected_staking_key}")
+            continue
+
+        # Verify signature and validate payload
+        expected_values = {"stakingKey": staking_key}
+        if "task_id" in check:
+            expected_values["taskId"] = check["task_id"]
+        if "round_number" in check:
+            expected_values["roundNumber"] = check["round_number"]
+        if check.get("expected_action"):
+            expected_values["action"] = check["expected_action"]
+        pending.append((index, staking_signature, staking_key, expected_values))
+
+    results = verify_and_parse_signatures([item[1:] for item in pending])
+    for (index, *_), result in zip(pending, results):
+        if result.get("error"):
+            print(f"Invalid signature: {result['error']}")
+        else:
+            valid[index] = True
+    return valid
 
 
 def create_remote_branch(
@@ -387,8 +436,7 @@ def create_remote_branch(
     """
     try:
         token = github_token or os.environ["GITHUB_TOKEN"]
-        gh = Github(token)
-        repo = gh.get_repo(f"{repo_owner}/{repo_name}")
+        repo = get_repo(f"{repo_owner}/{repo_name}", token)
 
         # Get the base branch's latest commit
         base = repo.get_branch(base_branch)
@@ -0,0 +1,210 @@
+"""Local stand-in for the middle server's builder API.
+
+Serves the /api/builder endpoints the worker calls from in-memory data loaded
+from a test data directory, with configurable latency and failure rate, so the
+worker's middle server client (timeouts, retries, circuit breaker) can be
+exercised without the real service.
+
+Run with:
+    python -m tests.middle_server --port 3000 --latency 0.2 --failure-rate 0.1
+
+and point the worker's MIDDLE_SERVER_URL at it.
+"""
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from flask import Flask, jsonify, request
+
+DEFAULT_DATA_DIR = Path(__file__).parent / "data" / "minimal"
+
+
+def _load(data_dir: Path, name: str) -> list:
+    path = data_dir / name
+    if not path.exists():
+        return []
+    with open(path) as f:
+        documents = json.load(f)
+    for document in documents:
+        document.setdefault("uuid", str(uuid.uuid4()))
+    return documents
+
+
+def create_app(data_dir=DEFAULT_DATA_DIR, latency=0.0, failure_rate=0.0):
+    """Create the stand-in app.
+
+    Args:
+        data_dir: Directory with todos.json and issues.json
+        latency: Seconds added to every response
+        failure_rate: Fraction of requests answered with a 503
+
+    Returns:
+        Flask: The app
+    """
+    app = Flask(__name__)
+    lock = threading.Lock()
+    issues = _load(Path(data_dir), "issues.json")
+    todos = _load(Path(data_dir), "todos.json")
+    for todo in todos:
+        todo.setdefault("issueUuid", issues[0]["uuid"] if issues else None)
+    assignments = {}  # staking key -> todo
+    prs = []
+    audits = []
+    aggregators = []
+
+    @app.before_request
+    def simulate_conditions():
+        if latency:
+            time.sleep(latency)
+        if failure_rate and random.random() < failure_rate:
+            return jsonify({"success": False, "message": "Injected failure"}), 503
+
+    def _todo_data(todo):
+        return {
+            "todo_uuid": todo["uuid"],
+            "title": todo.get("title"),
+            "acceptance_criteria": todo.get("acceptanceCriteria", []),
+            "repo_owner": todo.get("repoOwner"),
+            "repo_name": todo.get("repoName"),
+            "issue_uuid": todo.get("issueUuid"),
+            "dependency_pr_urls": todo.get("dependencyPrUrls", []),
+        }
+
+    def _issue_pr_list(issue_uuid):
+        todo_issues = {todo["uuid"]: todo.get("issueUuid") for todo in todos}
+        return {
+            pr["stakingKey"]: pr["prUrl"]
+            for pr in prs
+            if todo_issues.get(pr.get("todo_uuid")) == issue_uuid
+        }
+
+    @app.post("/api/builder/fetch-to-do")
+    def fetch_todo():
+        staking_key = request.json.get("stakingKey")
+        with lock:
+            todo = assignments.get(staking_key)
+            if todo is None:
+                todo = next(
+                    (t for t in todos if t.get("status") == "initialized"), None
+                )
+                if todo is None:
+                    return (
+                        jsonify({"success": False, "message": "No todos available"}),
+                        409,
+                    )
+                todo["status"] = "in_progress"
+                assignments[staking_key] = todo
+        return jsonify({"success": True, "data": _todo_data(todo)})
+
+    @app.post("/api/builder/add-pr-to-to-do")
+    @app.post("/api/builder/add-issue-pr")
+    def add_pr():
+        with lock:
+            prs.append(dict(request.json))
+        return jsonify({"success": True, "message": "PR added"})
+
+    @app.post("/api/builder/assign-issue")
+    def assign_issue():
+        with lock:
+            issue = next((i for i in issues if i.get("status") != "assigned"), None)
+            if issue is None:
+                return jsonify({"success": False, "message": "No issues available"})
+            issue["status"] = "assigned"
+            issue["githubUsername"] = request.json.get("githubUsername")
+        return jsonify(
+            {
+                "success": True,
+                "issueId": issue["uuid"],
+                "repoOwner": issue.get("repoOwner"),
+                "repoName": issue.get("repoName"),
+            }
+        )
+
+    @app.post("/api/builder/fetch-issue")
+    def fetch_issue():
+        with lock:
+            issue = next((i for i in issues if i.get("status") == "assigned"), None)
+            if issue is None:
+                return jsonify({"success": False, "message": "No issues assigned"}), 409
+            data = {
+                "issue_uuid": issue["uuid"],
+                "repo_owner": issue.get("repoOwner"),
+                "repo_name": issue.get("repoName"),
+                "pr_list": _issue_pr_list(issue["uuid"]),
+            }
+        return jsonify({"success": True, "data": data})
+
+    @app.post("/api/builder/check-to-do")
+    @app.post("/api/builder/check-issue")
+    def check():
+        with lock:
+            todo = assignments.get(request.json.get("stakingKey"))
+            issue_uuid = todo.get("issueUuid") if todo else None
+            data = {"pr_list": _issue_pr_list(issue_uuid), "issue_uuid": issue_uuid}
+        return jsonify({"success": True, "data": data})
+
+    @app.get("/api/builder/get-source-repo/<node_type>/<document_uuid>")
+    def get_source_repo(node_type, document_uuid):
+        documents = issues if node_type == "leader" else todos
+        document = next((d for d in documents if d["uuid"] == document_uuid), None)
+        if document is None:
+            return jsonify({"success": False, "message": "Not found"}), 404
+        return jsonify(
+            {
+                "success": True,
+                "data": {
+                    "repoOwner": document.get("repoOwner"),
+                    "repoName": document.get("repoName"),
+                },
+            }
+        )
+
+    @app.post("/api/builder/add-aggregator-info")
+    def add_aggregator_info():
+        with lock:
+            aggregators.append(dict(request.json))
+        return jsonify({"success": True, "data": {}})
+
+    @app.post("/api/builder/update-audit-result")
+    def update_audit_result():
+        with lock:
+            audits.append(dict(request.json))
+        return jsonify({"success": True, "message": "Audit results updated"})
+
+    return app
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run a local middle server stand-in")
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument(
+        "--data-dir",
+        default=os.getenv("MIDDLE_STUB_DATA_DIR", str(DEFAULT_DATA_DIR)),
+        help="Directory with todos.json and issues.json",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=float(os.getenv("MIDDLE_STUB_LATENCY", "0")),
+        help="Seconds added to every response",
+    )
+    parser.add_argument(
+        "--failure-rate",
+        type=float,
+        default=float(os.getenv("MIDDLE_STUB_FAILURE_RATE", "0")),
+        help="Fraction of requests answered with a 503",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    create_app(args.data_dir, args.latency, args.failure_rate).run(
+        port=args.port, threaded=True
+    )
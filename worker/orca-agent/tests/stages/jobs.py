@@ -0,0 +1,19 @@
+"""Helpers for waiting on background task jobs."""
+
+import time
+import requests
+
+POLL_INTERVAL = 10
+JOB_TIMEOUT = 30 * 60
+
+
+def wait_for_job(base_url, job_id, timeout=JOB_TIMEOUT):
+    """Poll /jobs/<job_id> until the job completes or fails."""
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = requests.get(f"{base_url}/jobs/{job_id}")
+        job = response.json()
+        if job.get("status") in ["completed", "failed"]:
+            return job
+        time.sleep(POLL_INTERVAL)
+    raise TimeoutError(f"Job {job_id} did not finish within {timeout} seconds")
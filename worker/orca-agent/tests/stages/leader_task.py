@@ -2,6 +2,7 @@
 
 import requests
 from prometheus_test.utils import create_signature
+from .jobs import wait_for_job
 
 
 def prepare(runner, worker):
@@ -46,9 +47,20 @@ def execute(runner, worker, data):
     url = f"{worker.get('url')}/leader-task/{data['roundNumber']}"
     response = requests.post(url, json=data)
     result = response.json()
+    status_code = response.status_code
+
+    # Tasks run as background jobs; wait for the PR and surface job errors
+    # with the status code the task returned
+    if status_code == 202:
+        job = wait_for_job(worker.get("url"), result["jobId"])
+        if job["status"] == "completed":
+            result = {"success": True, "pr_url": job["prUrl"]}
+        else:
+            result = {"success": False, "message": job["error"]}
+            status_code = job["errorStatus"] or 500
 
     # Handle 409 gracefully - no eligible issues is an expected case
-    if response.status_code == 409:
+    if status_code == 409:
         print(f"✓ {result.get('message', 'No eligible issues')} - continuing")
         return {"success": True, "message": result.get("message")}
 
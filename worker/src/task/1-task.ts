@@ -4,6 +4,9 @@ import { triggerAuditUpdate } from "../utils/auditUpdate";
 import { createAggregatorRepo } from "../utils/aggregatorRepo";
 import "dotenv/config";
 
+const JOB_POLL_INTERVAL_MS = 10_000;
+const JOB_TIMEOUT_MS = 30 * 60 * 1000;
+
 interface PodCallBody {
   taskId: string;
   roundNumber: number;
@@ -126,10 +129,17 @@ async function runTask(
       body: JSON.stringify(podCallBody),
     });
 
-    if (response?.data?.success) {
-      return response.data.pr_url;
+    if (!response?.data?.success) {
+      console.error(`${taskType} task failed:`, response?.data?.message || "Unknown error");
+      return null;
+    }
+
+    // The task runs as a background job on the agent; wait for it to finish
+    const job = await waitForJob(response.data.jobId, orcaClient);
+    if (job?.status === "completed") {
+      return job.prUrl;
     } else {
-      console.error(`${taskType} task failed:`, response?.data?.error || "Unknown error");
+      console.error(`${taskType} task failed:`, job?.error || "Unknown error");
       return null;
     }
   } catch (error) {
@@ -137,3 +147,21 @@ async function runTask(
     return null;
   }
 }
+
+async function waitForJob(jobId: string, orcaClient: any) {
+  const deadline = Date.now() + JOB_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    try {
+      const response = await orcaClient.podCall(`jobs/${jobId}`);
+      const status = response?.data?.status;
+      if (status === "completed" || status === "failed") {
+        return response.data;
+      }
+    } catch (error) {
+      console.error(`Error polling job ${jobId}:`, error);
+    }
+    await new Promise((resolve) => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+  }
+  console.error(`Timed out waiting for job ${jobId}`);
+  return null;
+}